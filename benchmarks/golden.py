@@ -0,0 +1,389 @@
+"""Golden-value corpus for the calculate_* functions.
+
+The corpus is a gzipped JSON-lines file. Each line holds one call: the
+function name, its keyword arguments and the result dict of the original
+single-file calculator (baseline commit ``BASELINE_COMMIT``). That version
+knew only 2024; for the other years its functions run with the year's tax
+parameters put in place of its 2024 constants and inline amounts, their
+arithmetic unchanged. Cases are generated deterministically.
+Boundaries come from the tax parameters of each year (zero income, the bracket
+threshold, the 2M CZK lump-sum limit, expense caps, insurance floors and
+minimum payments, the point where tax covers the credits), together with
+invalid inputs and realistic random incomes.
+
+Any implementation (scalar, batch, cached, ...) must reproduce every rounded
+value exactly. Regenerating needs git and the baseline commit:
+
+    python -m benchmarks.golden --regenerate
+    python -m benchmarks.golden                           # check the scalar functions
+    python -m benchmarks.golden --implementation batch    # or record, cached, arrays
+"""
+
+import argparse
+import functools
+import gzip
+import io
+import json
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from cisko.batch import (
+    calculate_hpp_income_arrays,
+    calculate_hpp_income_batch,
+    calculate_ico_pausalni_dan_income_arrays,
+    calculate_ico_pausalni_dan_income_batch,
+    calculate_ico_pausalni_vydaje_income_arrays,
+    calculate_ico_pausalni_vydaje_income_batch,
+)
+from cisko.cache import (
+    cached_calculate_hpp_income,
+    cached_calculate_ico_pausalni_dan_income,
+    cached_calculate_ico_pausalni_vydaje_income,
+)
+from cisko.engine import (
+    DEFAULT_WORK_DAYS_PER_YEAR,
+    calculate_hpp_income,
+    calculate_hpp_income_record,
+    calculate_ico_pausalni_dan_income,
+    calculate_ico_pausalni_dan_income_record,
+    calculate_ico_pausalni_vydaje_income,
+    calculate_ico_pausalni_vydaje_income_record,
+)
+from cisko.params import available_tax_years, get_tax_params
+
+CORPUS_PATH = Path(__file__).with_name("golden_corpus.jsonl.gz")
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_COMMIT = "53a73f0"
+SEED = 20240101
+RANDOM_CASES_PER_YEAR = 2500
+HALER = 0.01
+
+FUNCTIONS = {
+    "calculate_hpp_income": calculate_hpp_income,
+    "calculate_ico_pausalni_vydaje_income": calculate_ico_pausalni_vydaje_income,
+    "calculate_ico_pausalni_dan_income": calculate_ico_pausalni_dan_income,
+}
+
+RECORD_FUNCTIONS = {
+    "calculate_hpp_income": calculate_hpp_income_record,
+    "calculate_ico_pausalni_vydaje_income": calculate_ico_pausalni_vydaje_income_record,
+    "calculate_ico_pausalni_dan_income": calculate_ico_pausalni_dan_income_record,
+}
+
+CACHED_FUNCTIONS = {
+    "calculate_hpp_income": cached_calculate_hpp_income,
+    "calculate_ico_pausalni_vydaje_income": cached_calculate_ico_pausalni_vydaje_income,
+    "calculate_ico_pausalni_dan_income": cached_calculate_ico_pausalni_dan_income,
+}
+
+BATCH_FUNCTIONS = {
+    "calculate_hpp_income": calculate_hpp_income_batch,
+    "calculate_ico_pausalni_vydaje_income": calculate_ico_pausalni_vydaje_income_batch,
+    "calculate_ico_pausalni_dan_income": calculate_ico_pausalni_dan_income_batch,
+}
+
+ARRAYS_FUNCTIONS = {
+    "calculate_hpp_income": calculate_hpp_income_arrays,
+    "calculate_ico_pausalni_vydaje_income": calculate_ico_pausalni_vydaje_income_arrays,
+    "calculate_ico_pausalni_dan_income": calculate_ico_pausalni_dan_income_arrays,
+}
+
+# Amounts the baseline wrote inline -> the names its functions read them from here
+BASELINE_INLINE_AMOUNTS = {
+    "max_revenue_for_lump_sum_application = 2000000.0": "max_revenue_for_lump_sum_application = MAX_REVENUE_FOR_LUMP_SUM",
+    "max_expense_claim_amount = 1600000.0": "max_expense_claim_amount = EXPENSE_CAPS[0.8]",
+    "max_expense_claim_amount = 1200000.0": "max_expense_claim_amount = EXPENSE_CAPS[0.6]",
+    "max_expense_claim_amount = 800000.0": "max_expense_claim_amount = EXPENSE_CAPS[0.4]",
+    "max_expense_claim_amount = 600000.0": "max_expense_claim_amount = EXPENSE_CAPS[0.3]",
+    "131901.0": "MIN_SOCIAL_ASSESSMENT_BASE_ANNUAL",
+    "226800.0": "MIN_HEALTH_ASSESSMENT_BASE_ANNUAL",
+    '"rok_kalkulace": 2024': '"rok_kalkulace": TAX_YEAR',
+}
+
+# Result keys the batch functions leave out (constant per call)
+BATCH_SKIPPED_KEYS = {"typ", "rok_kalkulace"}
+
+
+def _around(value: float) -> list:
+    return [value - HALER, value, value + HALER]
+
+
+def _annual_boundaries(tax_year: int) -> list:
+    """Annual amounts (profit or taxable income) where some rule changes."""
+    p = get_tax_params(tax_year)
+    factor = p.ico_profit_assessment_base_factor
+    return [
+        p.income_tax_threshold_annual,
+        p.personal_tax_credit_annual / p.income_tax_rate_lower,
+        p.min_social_assessment_base_annual / factor,
+        p.ico_min_social_annual / (p.ico_social_security_rate * factor),
+        p.min_health_assessment_base_annual / factor,
+        p.ico_min_health_annual / (p.ico_health_insurance_rate * factor),
+    ]
+
+
+def random_hpp_gross_monthly(rng: random.Random) -> float:
+    return round(rng.lognormvariate(10.7, 0.45), rng.choice([0, 0, 2]))
+
+
+def random_ico_revenue(rng: random.Random) -> float:
+    return round(rng.lognormvariate(13.8, 0.6), rng.choice([0, 0, 2]))
+
+
+def generate_cases(seed: int = SEED, random_cases_per_year: int = RANDOM_CASES_PER_YEAR) -> list:
+    """List of ``(function name, kwargs)`` pairs covering edge cases and realistic inputs."""
+    rng = random.Random(seed)
+    cases = []
+    for tax_year in available_tax_years():
+        p = get_tax_params(tax_year)
+        percentages = sorted(p.expense_caps)
+        bands = sorted(p.pausalni_dan_bands_monthly)
+        boundaries = _annual_boundaries(tax_year)
+
+        # --- HPP ---
+        hpp_gross = [0.0, -1.0, 0.01] + [b / 12 + d for b in boundaries for d in (-HALER, 0.0, HALER)]
+        hpp_gross += [random_hpp_gross_monthly(rng) for _ in range(random_cases_per_year)]
+        for gross in hpp_gross:
+            cases.append(("calculate_hpp_income", dict(
+                gross_monthly_income=gross,
+                other_annual_tax_credits=rng.choice([0.0, 0.0, 15204.0, 30408.0, round(rng.uniform(0, 60000), 2)]),
+                work_days_per_year_input=rng.choice([252, 252, 250, 200, 0]),
+                tax_year=tax_year,
+            )))
+
+        # --- IČO paušální výdaje ---
+        revenues = [0.0, -1.0, 0.01]
+        revenues += _around(p.max_revenue_for_lump_sum)
+        for percentage in percentages:
+            revenues += _around(p.expense_caps[percentage] / percentage)
+            revenues += [b / (1 - percentage) + d for b in boundaries for d in (-HALER, 0.0, HALER)]
+        revenue_cases = [(revenue, percentage) for revenue in revenues for percentage in percentages]
+        revenue_cases += [(random_ico_revenue(rng), rng.choice(percentages)) for _ in range(random_cases_per_year)]
+        revenue_cases += [(1000000.0, 0.5), (1000000.0, 0.0), (0.0, 0.5)]
+        for revenue, percentage in revenue_cases:
+            participate = rng.random() < 0.4
+            work_days = rng.choice([252, 252, 230, 0])
+            cases.append(("calculate_ico_pausalni_vydaje_income", dict(
+                gross_annual_revenue=revenue,
+                expense_percentage=percentage,
+                realne_rocni_provozni_naklady=rng.choice([0.0, 60000.0, round(rng.uniform(0, 400000), 2)]),
+                other_annual_tax_credits=rng.choice([0.0, 0.0, 15204.0, round(rng.uniform(0, 60000), 2)]),
+                participate_sickness_insurance=participate,
+                sickness_insurance_assessment_base_monthly=rng.choice([None, 0.0, p.min_ico_sickness_assessment_base_monthly, 25000.0]),
+                paid_vacation_days_by_client=rng.choice([0, 5]),
+                paid_sick_days_by_client=rng.choice([0, 3]),
+                actual_unpaid_vacation_days_taken=rng.choice([0, 20, 25, 300]),
+                actual_unpaid_sick_days_taken=rng.choice([0, 5, 10]),
+                work_days_per_year_input=work_days,
+                tax_year=tax_year,
+            )))
+
+        # --- IČO paušální daň ---
+        dan_revenues = [0.0, -1.0, 0.01] + _around(p.pausalni_dan_max_revenue) + [1000000.0, 1500000.0]
+        dan_cases = [(revenue, band) for revenue in dan_revenues for band in bands + [0, 4]]
+        dan_cases += [(random_ico_revenue(rng), rng.choice(bands)) for _ in range(random_cases_per_year)]
+        for revenue, band in dan_cases:
+            cases.append(("calculate_ico_pausalni_dan_income", dict(
+                gross_annual_revenue=revenue,
+                pausalni_dan_band=band,
+                actual_unpaid_vacation_days_taken=rng.choice([0, 20, 300]),
+                actual_unpaid_sick_days_taken=rng.choice([0, 5]),
+                work_days_per_year_input=rng.choice([252, 230, 0]),
+                tax_year=tax_year,
+            )))
+    return cases
+
+
+@functools.lru_cache(maxsize=None)
+def _baseline_source() -> str:
+    """The calculation functions of the baseline app, inline amounts replaced by names."""
+    app = subprocess.run(
+        ["git", "show", f"{BASELINE_COMMIT}:cisko_app.py"],
+        cwd=REPO_ROOT, capture_output=True, text=True, encoding="utf-8", check=True,
+    ).stdout
+    start = app.index("# --- Calculation Functions ---")
+    source = app[start:app.index("# --- Streamlit App UI ---", start)]
+    for amount, name in BASELINE_INLINE_AMOUNTS.items():
+        if amount not in source:
+            raise ValueError(f"Baseline {BASELINE_COMMIT} does not contain {amount!r}.")
+        source = source.replace(amount, name)
+    return source
+
+
+@functools.lru_cache(maxsize=None)
+def baseline_functions(tax_year: int) -> dict:
+    """Function name -> the baseline's calculate_* function with ``tax_year``'s parameters."""
+    p = get_tax_params(tax_year)
+    namespace = {
+        "TAX_YEAR": tax_year,
+        "DEFAULT_WORK_DAYS_PER_YEAR": DEFAULT_WORK_DAYS_PER_YEAR,
+        "PERSONAL_TAX_CREDIT_ANNUAL_2024": p.personal_tax_credit_annual,
+        "INCOME_TAX_THRESHOLD_ANNUAL_2024": p.income_tax_threshold_annual,
+        "INCOME_TAX_RATE_LOWER_2024": p.income_tax_rate_lower,
+        "INCOME_TAX_RATE_HIGHER_2024": p.income_tax_rate_higher,
+        "HPP_HEALTH_INSURANCE_RATE_EMPLOYEE_2024": p.hpp_health_insurance_rate_employee,
+        "HPP_SOCIAL_SECURITY_RATE_EMPLOYEE_2024": p.hpp_social_security_rate_employee,
+        "HPP_HEALTH_INSURANCE_RATE_EMPLOYER_2024": p.hpp_health_insurance_rate_employer,
+        "HPP_SOCIAL_SECURITY_RATE_EMPLOYER_2024": p.hpp_social_security_rate_employer,
+        "ICO_SOCIAL_SECURITY_RATE_2024": p.ico_social_security_rate,
+        "ICO_HEALTH_INSURANCE_RATE_2024": p.ico_health_insurance_rate,
+        "ICO_SICKNESS_INSURANCE_RATE_2024": p.ico_sickness_insurance_rate,
+        "ICO_PROFIT_ASSESSMENT_BASE_FACTOR_2024": p.ico_profit_assessment_base_factor,
+        "ICO_MIN_SOCIAL_MONTHLY_MAIN_ACTIVITY_2024": p.ico_min_social_monthly_main_activity,
+        "ICO_MIN_HEALTH_MONTHLY_2024": p.ico_min_health_monthly,
+        "ICO_MIN_SICKNESS_MONTHLY_2024": p.ico_min_sickness_monthly,
+        "MIN_ICO_SICKNESS_ASSESSMENT_BASE_MONTHLY_2024": p.min_ico_sickness_assessment_base_monthly,
+        "PAUSALNI_DAN_BAND_1_MONTHLY_2024": p.pausalni_dan_bands_monthly[1],
+        "PAUSALNI_DAN_BAND_2_MONTHLY_2024": p.pausalni_dan_bands_monthly[2],
+        "PAUSALNI_DAN_BAND_3_MONTHLY_2024": p.pausalni_dan_bands_monthly[3],
+        "PAUSALNI_DAN_MAX_REVENUE_2024": p.pausalni_dan_max_revenue,
+        "MAX_REVENUE_FOR_LUMP_SUM": p.max_revenue_for_lump_sum,
+        "EXPENSE_CAPS": dict(p.expense_caps),
+        "MIN_SOCIAL_ASSESSMENT_BASE_ANNUAL": p.min_social_assessment_base_annual,
+        "MIN_HEALTH_ASSESSMENT_BASE_ANNUAL": p.min_health_assessment_base_annual,
+    }
+    exec(compile(_baseline_source(), f"{BASELINE_COMMIT}:cisko_app.py", "exec"), namespace)
+    return {name: namespace[name] for name in FUNCTIONS}
+
+
+def baseline_result(name: str, kwargs: dict) -> dict:
+    """Result of the baseline function for one corpus case."""
+    kwargs = dict(kwargs)
+    tax_year = kwargs.pop("tax_year")
+    # None stands for the minimum assessment base, which the baseline had as the default
+    if kwargs.get("sickness_insurance_assessment_base_monthly", 0.0) is None:
+        kwargs["sickness_insurance_assessment_base_monthly"] = get_tax_params(tax_year).min_ico_sickness_assessment_base_monthly
+    return baseline_functions(tax_year)[name](**kwargs)
+
+
+def write_corpus(path: Path = CORPUS_PATH) -> int:
+    cases = generate_cases()
+    # mtime=0 keeps the file byte-identical across regenerations
+    with io.TextIOWrapper(gzip.GzipFile(path, "wb", compresslevel=9, mtime=0), encoding="utf-8") as f:
+        for name, kwargs in cases:
+            f.write(json.dumps({"funkce": name, "vstup": kwargs, "vystup": baseline_result(name, kwargs)}, ensure_ascii=False))
+            f.write("\n")
+    return len(cases)
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> list:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def flatten_result(result: dict) -> dict:
+    """Result dict with the nested ``info_k_*`` dicts merged into the top level."""
+    flat = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            flat.update(value)
+        else:
+            flat[key] = value
+    return flat
+
+
+def differences(expected: dict, actual: dict) -> list:
+    """Keys whose values differ; numbers are compared as the rounded values they are."""
+    expected, actual = flatten_result(expected), flatten_result(actual)
+    return [(key, expected.get(key), actual.get(key))
+            for key in expected.keys() | actual.keys() if expected.get(key) != actual.get(key)]
+
+
+def check_corpus(functions: dict = FUNCTIONS, path: Path = CORPUS_PATH) -> list:
+    """(case index, function name, differences) for every case that does not match."""
+    failures = []
+    for i, case in enumerate(load_corpus(path)):
+        diffs = differences(case["vystup"], functions[case["funkce"]](**case["vstup"]))
+        if diffs:
+            failures.append((i, case["funkce"], diffs))
+    return failures
+
+
+def _batch_columns(cases: list) -> dict:
+    """Keyword arguments of one batch call over ``cases`` (same function and tax year)."""
+    tax_year = cases[0]["vstup"]["tax_year"]
+    min_sickness_base = get_tax_params(tax_year).min_ico_sickness_assessment_base_monthly
+    columns = {"tax_year": tax_year}
+    for key in cases[0]["vstup"]:
+        if key == "tax_year":
+            continue
+        values = [case["vstup"][key] for case in cases]
+        if key == "sickness_insurance_assessment_base_monthly":
+            values = [min_sickness_base if value is None else value for value in values]
+        columns[key] = np.array(values)
+    return columns
+
+
+def _batch_rows(name: str, cases: list) -> list:
+    """Results of one batch call over ``cases`` as flat row dicts."""
+    results = BATCH_FUNCTIONS[name](**_batch_columns(cases))
+    rows = []
+    for i in range(len(cases)):
+        if results["error"][i] is not None:
+            rows.append({"error": results["error"][i]})
+        else:
+            rows.append({key: float(values[i]) for key, values in results.items() if key != "error"})
+    return rows
+
+
+def _grouped_cases(path: Path) -> dict:
+    groups = {}
+    for i, case in enumerate(load_corpus(path)):
+        groups.setdefault((case["funkce"], case["vstup"]["tax_year"]), []).append((i, case))
+    return groups
+
+
+def check_corpus_batch(path: Path = CORPUS_PATH) -> list:
+    """Like check_corpus, with one batch call per function and tax year."""
+    failures = []
+    for (name, _), indexed_cases in _grouped_cases(path).items():
+        cases = [case for _, case in indexed_cases]
+        for (i, case), row in zip(indexed_cases, _batch_rows(name, cases)):
+            expected = {k: v for k, v in flatten_result(case["vystup"]).items() if k not in BATCH_SKIPPED_KEYS}
+            if name == "calculate_ico_pausalni_dan_income" and expected.get("zvolene_pasmo_pausalni_dane") == "-":
+                expected["zvolene_pasmo_pausalni_dane"] = 0
+            diffs = differences(expected, row)
+            if diffs:
+                failures.append((i, name, diffs))
+    return sorted(failures)
+
+
+def check_corpus_arrays(path: Path = CORPUS_PATH) -> list:
+    """Like check_corpus_batch, comparing the per-row records of the unrounded ResultArrays."""
+    failures = []
+    for (name, _), indexed_cases in _grouped_cases(path).items():
+        records = ARRAYS_FUNCTIONS[name](**_batch_columns([case for _, case in indexed_cases])).records()
+        for (i, case), record in zip(indexed_cases, records):
+            diffs = differences(case["vystup"], record)
+            if diffs:
+                failures.append((i, name, diffs))
+    return sorted(failures)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.golden", description=__doc__.splitlines()[0])
+    parser.add_argument("--regenerate", action="store_true", help=f"Přegenerovat korpus z původní verze {BASELINE_COMMIT}.")
+    parser.add_argument("--implementation", choices=("scalar", "record", "cached", "batch", "arrays"), default="scalar",
+                        help="Kontrolovaná implementace (výchozí %(default)s).")
+    args = parser.parse_args(argv)
+    if args.regenerate:
+        print(f"Zapsáno {write_corpus():,} případů do {CORPUS_PATH}")
+        return 0
+    if args.implementation == "batch":
+        failures = check_corpus_batch()
+    elif args.implementation == "arrays":
+        failures = check_corpus_arrays()
+    else:
+        failures = check_corpus({"scalar": FUNCTIONS, "record": RECORD_FUNCTIONS, "cached": CACHED_FUNCTIONS}[args.implementation])
+    for i, name, diffs in failures[:20]:
+        print(f"#{i} {name}: {diffs}")
+    print(f"{len(failures):,} neshod")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
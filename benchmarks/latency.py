@@ -0,0 +1,96 @@
+"""Cold-start and first-click latency of the Streamlit page, with a budget.
+
+Each measurement runs in a fresh interpreter, so nothing is imported or cached
+yet, and drives the page with Streamlit's AppTest:
+
+* cold start: the first run of the page (the form), including the import of
+  the cisko modules; importing Streamlit itself happens before any session
+  and is reported separately;
+* first click: "Spočítat a porovnat" after ``THINK_TIME_S`` seconds, the
+  least a user needs to fill in the form, and with an empty scenario store;
+* second click: the same click again, for reference.
+
+    python -m benchmarks.latency                # measure and check the budget
+    python -m benchmarks.latency --no-preload   # the same with CISKO_PRELOAD=0
+
+AppTest runs the script without a browser or websocket, so the numbers are
+the server-side time of a rerun, not what the browser shows.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = REPO_ROOT / "cisko_app.py"
+THINK_TIME_S = 1.5
+# Seconds; about twice the measured 0.3-0.4 s cold start and 0.3 s first click (1 s
+# without the background preload), so that only real regressions fail
+BUDGET_S = {
+    "cold_start": 1.0,
+    "first_click": 0.6,
+}
+
+
+def _measure_here() -> dict:
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    measured = {"import_streamlit": time.perf_counter() - started}
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=60)
+    started = time.perf_counter()
+    at.run()
+    measured["cold_start"] = time.perf_counter() - started
+    time.sleep(THINK_TIME_S)
+    for name in ("first_click", "second_click"):
+        button = next(b for b in at.button if b.label.startswith("📊"))
+        started = time.perf_counter()
+        button.click().run()
+        measured[name] = time.perf_counter() - started
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return measured
+
+
+def measure(preload: bool = True) -> dict:
+    """Seconds of each step, measured in a fresh interpreter with an empty scenario store."""
+    with tempfile.TemporaryDirectory() as store_dir:
+        env = dict(os.environ, CISKO_STORE_PATH=str(Path(store_dir) / "scenarios.sqlite3"),
+                   CISKO_PRELOAD="1" if preload else "0", PYTHONPATH=str(REPO_ROOT))
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.latency", "--measure-here"],
+            cwd=store_dir, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def over_budget(measured: dict, budget: dict = BUDGET_S) -> list:
+    """(step, measured, budget) for every step slower than its budget."""
+    return [(step, measured[step], limit) for step, limit in budget.items() if measured[step] > limit]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-preload", action="store_true", help="measure with CISKO_PRELOAD=0")
+    parser.add_argument("--measure-here", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.measure_here:
+        print(json.dumps(_measure_here()))
+        return 0
+    measured = measure(preload=not args.no_preload)
+    for step, seconds in measured.items():
+        budget = f" (rozpočet {BUDGET_S[step] * 1000:.0f} ms)" if step in BUDGET_S else ""
+        print(f"{step}: {seconds * 1000:.0f} ms{budget}")
+    failures = over_budget(measured)
+    for step, seconds, limit in failures:
+        print(f"Překročen rozpočet {step}: {seconds * 1000:.0f} ms > {limit * 1000:.0f} ms", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Per-call latency and batch throughput of the calculate_* functions.
+
+Needs pytest-benchmark (``pip install -r requirements-dev.txt``):
+
+    python -m pytest benchmarks/test_benchmarks.py --benchmark-only
+
+Inputs follow the realistic distributions of the golden corpus. Scalar
+benchmarks cycle through a fixed list of calls, so one round measures
+``SCALAR_CALLS`` calls; batch benchmarks process ``BATCH_ROWS`` rows at once.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.golden import SEED, random_hpp_gross_monthly, random_ico_revenue  # noqa: E402
+from cisko.batch import (  # noqa: E402
+    calculate_hpp_income_batch,
+    calculate_ico_pausalni_dan_income_batch,
+    calculate_ico_pausalni_vydaje_income_batch,
+)
+from cisko.cache import (  # noqa: E402
+    cached_calculate_hpp_income,
+    cached_calculate_ico_pausalni_dan_income,
+    cached_calculate_ico_pausalni_vydaje_income,
+    clear_cache,
+)
+from cisko.engine import (  # noqa: E402
+    calculate_hpp_income,
+    calculate_ico_pausalni_dan_income,
+    calculate_ico_pausalni_vydaje_income,
+)
+from cisko.params import DEFAULT_TAX_YEAR, get_tax_params  # noqa: E402
+
+SCALAR_CALLS = 1000
+BATCH_ROWS = 100_000
+
+
+def _realistic_inputs(count: int) -> dict:
+    rng = random.Random(SEED)
+    p = get_tax_params(DEFAULT_TAX_YEAR)
+    percentages = sorted(p.expense_caps)
+    bands = sorted(p.pausalni_dan_bands_monthly)
+    return {
+        "hpp": [dict(gross_monthly_income=random_hpp_gross_monthly(rng)) for _ in range(count)],
+        "vydaje": [dict(
+            gross_annual_revenue=random_ico_revenue(rng),
+            expense_percentage=rng.choice(percentages),
+            realne_rocni_provozni_naklady=rng.choice([0.0, 60000.0]),
+            participate_sickness_insurance=rng.random() < 0.4,
+            actual_unpaid_vacation_days_taken=rng.choice([0, 20, 25]),
+            actual_unpaid_sick_days_taken=rng.choice([0, 5]),
+        ) for _ in range(count)],
+        "dan": [dict(
+            gross_annual_revenue=random_ico_revenue(rng),
+            pausalni_dan_band=rng.choice(bands),
+            actual_unpaid_vacation_days_taken=rng.choice([0, 20, 25]),
+        ) for _ in range(count)],
+    }
+
+
+SCALAR_INPUTS = _realistic_inputs(SCALAR_CALLS)
+BATCH_INPUTS = {
+    mode: {key: np.array([row[key] for row in rows]) for key in rows[0]}
+    for mode, rows in _realistic_inputs(BATCH_ROWS).items()
+}
+
+SCALAR_CASES = [
+    ("hpp", calculate_hpp_income),
+    ("vydaje", calculate_ico_pausalni_vydaje_income),
+    ("dan", calculate_ico_pausalni_dan_income),
+]
+CACHED_CASES = [
+    ("hpp", cached_calculate_hpp_income),
+    ("vydaje", cached_calculate_ico_pausalni_vydaje_income),
+    ("dan", cached_calculate_ico_pausalni_dan_income),
+]
+BATCH_CASES = [
+    ("hpp", calculate_hpp_income_batch),
+    ("vydaje", calculate_ico_pausalni_vydaje_income_batch),
+    ("dan", calculate_ico_pausalni_dan_income_batch),
+]
+
+
+def _call_all(function, inputs: list) -> None:
+    for kwargs in inputs:
+        function(**kwargs)
+
+
+@pytest.mark.parametrize("mode, function", SCALAR_CASES, ids=[mode for mode, _ in SCALAR_CASES])
+def test_scalar_latency(benchmark, mode, function):
+    benchmark.group = f"scalar ({SCALAR_CALLS} calls)"
+    benchmark.extra_info["calls"] = SCALAR_CALLS
+    benchmark(_call_all, function, SCALAR_INPUTS[mode])
+
+
+@pytest.mark.parametrize("mode, function", CACHED_CASES, ids=[mode for mode, _ in CACHED_CASES])
+def test_cached_latency_warm(benchmark, mode, function):
+    benchmark.group = f"cached, warm ({SCALAR_CALLS} calls)"
+    benchmark.extra_info["calls"] = SCALAR_CALLS
+    clear_cache()
+    _call_all(function, SCALAR_INPUTS[mode])
+    benchmark(_call_all, function, SCALAR_INPUTS[mode])
+
+
+@pytest.mark.parametrize("mode, function", BATCH_CASES, ids=[mode for mode, _ in BATCH_CASES])
+def test_batch_throughput(benchmark, mode, function):
+    benchmark.group = f"batch ({BATCH_ROWS:,} rows)"
+    benchmark.extra_info["rows"] = BATCH_ROWS
+    result = benchmark(function, **BATCH_INPUTS[mode])
+    assert len(result["error"]) == BATCH_ROWS
+
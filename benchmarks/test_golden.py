@@ -0,0 +1,46 @@
+"""Every implementation of the calculate_* functions must reproduce the golden corpus exactly."""
+
+import pytest
+
+from benchmarks.golden import (
+    CACHED_FUNCTIONS,
+    FUNCTIONS,
+    RECORD_FUNCTIONS,
+    check_corpus,
+    check_corpus_arrays,
+    check_corpus_batch,
+)
+from cisko.cache import clear_cache
+
+
+def _report(failures: list) -> str:
+    return "\n".join(f"#{i} {name}: {diffs}" for i, name, diffs in failures[:20])
+
+
+def test_scalar_matches_corpus():
+    failures = check_corpus(FUNCTIONS)
+    assert not failures, _report(failures)
+
+
+def test_records_match_corpus():
+    failures = check_corpus(RECORD_FUNCTIONS)
+    assert not failures, _report(failures)
+
+
+@pytest.mark.parametrize("warm", [False, True], ids=["cold", "warm"])
+def test_cached_matches_corpus(warm):
+    clear_cache()
+    if warm:
+        check_corpus(CACHED_FUNCTIONS)
+    failures = check_corpus(CACHED_FUNCTIONS)
+    assert not failures, _report(failures)
+
+
+def test_batch_matches_corpus():
+    failures = check_corpus_batch()
+    assert not failures, _report(failures)
+
+
+def test_result_arrays_match_corpus():
+    failures = check_corpus_arrays()
+    assert not failures, _report(failures)
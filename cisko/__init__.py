@@ -0,0 +1,39 @@
+"""CISKO - Čistý Srovnávací Kalkulátor Osoby.
+
+The package root only re-exports the dependency-free calculation engine, so
+``import cisko`` stays cheap for batch workers and tests. The Streamlit page
+lives in ``cisko_app.py`` on top of it.
+"""
+
+from cisko.engine import (
+    DEFAULT_MANDAYS_PER_YEAR_ICO,
+    DEFAULT_WORK_DAYS_PER_YEAR,
+    HPP_HEALTH_INSURANCE_RATE_EMPLOYEE_2024,
+    HPP_HEALTH_INSURANCE_RATE_EMPLOYER_2024,
+    HPP_SOCIAL_SECURITY_RATE_EMPLOYEE_2024,
+    HPP_SOCIAL_SECURITY_RATE_EMPLOYER_2024,
+    ICO_HEALTH_INSURANCE_RATE_2024,
+    ICO_MIN_HEALTH_MONTHLY_2024,
+    ICO_MIN_SICKNESS_MONTHLY_2024,
+    ICO_MIN_SOCIAL_MONTHLY_MAIN_ACTIVITY_2024,
+    ICO_PROFIT_ASSESSMENT_BASE_FACTOR_2024,
+    ICO_SICKNESS_INSURANCE_RATE_2024,
+    ICO_SOCIAL_SECURITY_RATE_2024,
+    INCOME_TAX_RATE_HIGHER_2024,
+    INCOME_TAX_RATE_LOWER_2024,
+    INCOME_TAX_THRESHOLD_ANNUAL_2024,
+    MIN_ICO_SICKNESS_ASSESSMENT_BASE_MONTHLY_2024,
+    PAUSALNI_DAN_BAND_1_MONTHLY_2024,
+    PAUSALNI_DAN_BAND_2_MONTHLY_2024,
+    PAUSALNI_DAN_BAND_3_MONTHLY_2024,
+    PAUSALNI_DAN_MAX_REVENUE_2024,
+    PERSONAL_TAX_CREDIT_ANNUAL_2024,
+    calculate_hpp_income,
+    calculate_hpp_income_record,
+    calculate_ico_pausalni_dan_income,
+    calculate_ico_pausalni_dan_income_record,
+    calculate_ico_pausalni_vydaje_income,
+    calculate_ico_pausalni_vydaje_income_record,
+)
+from cisko.params import DEFAULT_TAX_YEAR, TaxParams, available_tax_years, get_tax_params
+from cisko.records import CalculationResult, HppResult, IcoPausalniDanResult, IcoPausalniVydajeResult
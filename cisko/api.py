@@ -0,0 +1,348 @@
+"""Headless JSON HTTP API: ``python -m cisko.api [--host HOST] [--port PORT]``.
+
+A small HTTP/1.1 server on plain asyncio (keep-alive, ``Content-Length``
+bodies), so it needs nothing beyond NumPy. Results have the same dict shape
+as the calculate_* functions; invalid inputs give ``{"error": ...}``, just
+like the functions do.
+
+    GET  /health                      status and micro-batching counters
+    GET  /tax-years                   supported tax years
+    POST /hpp                         one scenario (JSON object of calculate_hpp_income arguments)
+    POST /ico/pausalni-vydaje         one scenario for calculate_ico_pausalni_vydaje_income
+    POST /ico/pausalni-dan            one scenario for calculate_ico_pausalni_dan_income
+    POST /bulk/hpp                    JSON array of scenarios -> array of results
+    POST /bulk/ico/pausalni-vydaje    (same)
+    POST /bulk/ico/pausalni-dan       (same)
+
+Single-scenario endpoints go through the shared LRU cache. Bulk requests are
+handed to a ``MicroBatcher``, which collects the scenarios of all concurrent
+bulk requests for up to ``max_delay`` seconds (or until ``max_batch_rows``
+rows are pending). It then runs one vectorized batch call per mode and tax
+year in a worker thread, so the event loop keeps serving other requests
+meanwhile, and hands each request its own slice of the results. Many small
+concurrent requests thus cost a few NumPy calls instead of thousands of
+scalar ones.
+
+    curl -s localhost:8000/hpp -d '{"gross_monthly_income": 60000}'
+"""
+
+import argparse
+import asyncio
+import functools
+import inspect
+import json
+import math
+import numbers
+import sys
+
+import numpy as np
+
+from cisko.batch import (
+    calculate_hpp_income_arrays,
+    calculate_ico_pausalni_dan_income_arrays,
+    calculate_ico_pausalni_vydaje_income_arrays,
+)
+from cisko.cache import (
+    MODE_HPP,
+    MODE_PAUSALNI_DAN,
+    MODE_PAUSALNI_VYDAJE,
+    cached_calculate_hpp_income,
+    cached_calculate_ico_pausalni_dan_income,
+    cached_calculate_ico_pausalni_vydaje_income,
+)
+from cisko.engine import (
+    calculate_hpp_income,
+    calculate_ico_pausalni_dan_income,
+    calculate_ico_pausalni_vydaje_income,
+)
+from cisko.params import DEFAULT_TAX_YEAR, available_tax_years, get_tax_params
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_MAX_BATCH_ROWS = 8192
+DEFAULT_MAX_DELAY = 0.002  # seconds
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+SCALAR_FUNCTIONS = {
+    MODE_HPP: calculate_hpp_income,
+    MODE_PAUSALNI_VYDAJE: calculate_ico_pausalni_vydaje_income,
+    MODE_PAUSALNI_DAN: calculate_ico_pausalni_dan_income,
+}
+CACHED_FUNCTIONS = {
+    MODE_HPP: cached_calculate_hpp_income,
+    MODE_PAUSALNI_VYDAJE: cached_calculate_ico_pausalni_vydaje_income,
+    MODE_PAUSALNI_DAN: cached_calculate_ico_pausalni_dan_income,
+}
+ARRAYS_FUNCTIONS = {
+    MODE_HPP: calculate_hpp_income_arrays,
+    MODE_PAUSALNI_VYDAJE: calculate_ico_pausalni_vydaje_income_arrays,
+    MODE_PAUSALNI_DAN: calculate_ico_pausalni_dan_income_arrays,
+}
+ROUTES = {
+    "/hpp": MODE_HPP,
+    "/ico/pausalni-vydaje": MODE_PAUSALNI_VYDAJE,
+    "/ico/pausalni-dan": MODE_PAUSALNI_DAN,
+}
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(ValueError):
+    """Invalid request; the message is returned to the client with HTTP 400."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_scenario(mode: str, scenario) -> dict:
+    """Validated keyword arguments of the mode's calculate_* function, defaults filled in."""
+    if not isinstance(scenario, dict):
+        raise RequestError("Scénář musí být JSON objekt s argumenty výpočtu.")
+    try:
+        bound = _signature(mode).bind(**scenario)
+    except TypeError as e:
+        raise RequestError(f"Neplatné argumenty výpočtu: {e}") from None
+    bound.apply_defaults()
+    arguments = bound.arguments
+    for name, parameter in _signature(mode).parameters.items():
+        value = arguments[name]
+        if value is None and name == "sickness_insurance_assessment_base_monthly":
+            continue
+        # JSON true/false are numbers to Python (bool subclasses int); only the flag may be one
+        if isinstance(value, bool) and parameter.annotation is not bool:
+            raise RequestError(f"Argument {name} musí být číslo, ne true/false.")
+        if not isinstance(value, numbers.Real) or not math.isfinite(value):
+            raise RequestError(f"Argument {name} musí být konečné číslo.")
+    # Day counts may be fractional and a band the year lacks gives the functions' error result,
+    # but the year selects the tax parameters
+    if arguments["tax_year"] != int(arguments["tax_year"]):
+        raise RequestError("Argument tax_year musí být celé číslo.")
+    arguments["tax_year"] = int(arguments["tax_year"])
+    try:
+        get_tax_params(arguments["tax_year"])
+    except ValueError as e:
+        raise RequestError(str(e)) from None
+    return arguments
+
+
+@functools.lru_cache(maxsize=None)
+def _signature(mode: str) -> inspect.Signature:
+    return inspect.signature(SCALAR_FUNCTIONS[mode])
+
+
+def compute_batch(mode: str, scenarios: list) -> list:
+    """Results of validated scenarios (see parse_scenario) in calculate_* dict shape.
+
+    Scenarios are grouped by tax year and each group goes through one call of
+    the mode's batch function.
+    """
+    results = [None] * len(scenarios)
+    by_year = {}
+    for i, arguments in enumerate(scenarios):
+        by_year.setdefault(arguments["tax_year"], []).append(i)
+
+    for tax_year, rows in by_year.items():
+        min_sickness_base = get_tax_params(tax_year).min_ico_sickness_assessment_base_monthly
+        columns = {}
+        for name in scenarios[rows[0]]:
+            if name == "tax_year":
+                continue
+            values = [scenarios[i][name] for i in rows]
+            if name == "sickness_insurance_assessment_base_monthly":
+                values = [min_sickness_base if value is None else value for value in values]
+            columns[name] = np.array(values, dtype=np.float64)
+        records = ARRAYS_FUNCTIONS[mode](tax_year=tax_year, **columns).records()
+        for i, record in zip(rows, records):
+            results[i] = record.as_dict()
+    return results
+
+
+class MicroBatcher:
+    """Coalesces the scenarios of concurrent requests into vectorized batch calls."""
+
+    def __init__(self, max_batch_rows: int = DEFAULT_MAX_BATCH_ROWS, max_delay: float = DEFAULT_MAX_DELAY):
+        self.max_batch_rows = max_batch_rows
+        self.max_delay = max_delay
+        self.batches = 0
+        self.rows = 0
+        self.requests = 0
+        self._pending = []
+        self._pending_rows = 0
+        self._flush_handle = None
+        self._tasks = set()
+
+    async def submit(self, mode: str, scenarios: list) -> list:
+        """Results for ``scenarios`` (validated, one mode), once their batch has run."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((mode, scenarios, future))
+        self._pending_rows += len(scenarios)
+        if self._pending_rows >= self.max_batch_rows:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        """Hand the pending scenarios to a worker thread; their requests are answered when it is done."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending, self._pending_rows = self._pending, [], 0
+        if not pending:
+            return
+        task = asyncio.get_running_loop().create_task(self._compute(pending))
+        # The loop keeps only weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _compute(self, pending: list) -> None:
+        loop = asyncio.get_running_loop()
+        by_mode = {}
+        for request in pending:
+            by_mode.setdefault(request[0], []).append(request)
+        for mode, requests in by_mode.items():
+            scenarios = [arguments for _, request_scenarios, _ in requests for arguments in request_scenarios]
+            try:
+                results = await loop.run_in_executor(None, compute_batch, mode, scenarios)
+            except Exception as e:
+                for _, _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.rows += len(scenarios)
+            self.requests += len(requests)
+            start = 0
+            for _, request_scenarios, future in requests:
+                stop = start + len(request_scenarios)
+                if not future.done():
+                    future.set_result(results[start:stop])
+                start = stop
+
+    def stats(self) -> dict:
+        return {
+            "davky": self.batches,
+            "pozadavky": self.requests,
+            "scenare": self.rows,
+            "prumerna_velikost_davky": self.rows / self.batches if self.batches else 0.0,
+        }
+
+
+class CiskoAPI:
+    """Request routing; ``handle_connection`` is the asyncio.start_server callback."""
+
+    def __init__(self, batcher: MicroBatcher | None = None):
+        self.batcher = batcher or MicroBatcher()
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple:
+        """``(status, JSON-serializable payload)`` for one request."""
+        if path == "/health":
+            return 200, {"status": "ok", "mikrodavkovani": self.batcher.stats()}
+        if path == "/tax-years":
+            return 200, {"roky": available_tax_years(), "vychozi": DEFAULT_TAX_YEAR}
+
+        bulk = path.startswith("/bulk/")
+        mode = ROUTES.get(path[len("/bulk"):] if bulk else path)
+        if mode is None:
+            return 404, {"error": "Neznámý endpoint."}
+        if method != "POST":
+            return 405, {"error": "Výpočty se volají metodou POST."}
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise RequestError("Tělo požadavku není platný JSON.") from None
+
+        if not bulk:
+            return 200, CACHED_FUNCTIONS[mode](**parse_scenario(mode, payload))
+        if not isinstance(payload, list):
+            raise RequestError("Hromadný endpoint očekává JSON pole scénářů.")
+        scenarios = [parse_scenario(mode, scenario) for scenario in payload]
+        if not scenarios:
+            return 200, []
+        return 200, await self.batcher.submit(mode, scenarios)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+                try:
+                    if "transfer-encoding" in headers:
+                        raise RequestError("Tělo požadavku musí mít hlavičku Content-Length.", 411)
+                    length = int(headers.get("content-length", 0))
+                    if length > MAX_BODY_BYTES:
+                        keep_alive = False
+                        raise RequestError(f"Tělo požadavku je větší než {MAX_BODY_BYTES:,} bajtů.", 413)
+                    body = await reader.readexactly(length) if length > 0 else b""
+                    status, payload = await self.dispatch(method.upper(), target.split("?", 1)[0], body)
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    raise
+                except Exception as e:  # keep serving other requests
+                    status, payload = 500, {"error": f"Interní chyba: {e}"}
+
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, batcher: MicroBatcher | None = None) -> None:
+    api = CiskoAPI(batcher)
+    server = await asyncio.start_server(api.handle_connection, host, port)
+    addresses = ", ".join(f"http://{s.getsockname()[0]}:{s.getsockname()[1]}" for s in server.sockets)
+    print(f"CISKO API naslouchá na {addresses}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cisko.api", description="JSON HTTP API pro výpočty HPP / IČO.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Adresa, na které server naslouchá (výchozí %(default)s).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port (výchozí %(default)s).")
+    parser.add_argument("--max-batch-rows", type=int, default=DEFAULT_MAX_BATCH_ROWS,
+                        help="Počet scénářů, po jehož dosažení se dávka spočítá hned (výchozí %(default)s).")
+    parser.add_argument("--max-delay-ms", type=float, default=DEFAULT_MAX_DELAY * 1000,
+                        help="Jak dlouho nejvýš čekat na další požadavky do dávky, v ms (výchozí %(default)s).")
+    args = parser.parse_args(argv)
+    if args.max_batch_rows < 1 or args.max_delay_ms < 0:
+        parser.error("--max-batch-rows musí být alespoň 1 a --max-delay-ms nezáporné.")
+
+    try:
+        asyncio.run(serve(args.host, args.port, MicroBatcher(args.max_batch_rows, args.max_delay_ms / 1000)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
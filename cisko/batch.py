@@ -0,0 +1,387 @@
+"""Vectorized NumPy versions of the calculate_* functions.
+
+Each ``calculate_*_batch`` function accepts scalars or array-likes (lists,
+NumPy arrays, pandas Series/DataFrame columns) that broadcast against each
+other and returns a dict of column arrays. The column names are the keys of
+the scalar result dicts, with the nested ``info_k_*`` dicts flattened (their
+keys are unique) and the constant ``typ`` / ``rok_kalkulace`` entries left
+out. Values are bit-identical to the scalar functions, including the final
+``round(x, 2)``. Rows the scalar function would reject get their message in
+the ``error`` column (``None`` otherwise) and NaN in every numeric column.
+
+    df = pd.DataFrame(calculate_hpp_income_batch(employees["hruba_mzda"]))
+
+``round_values=False`` skips the rounding. The ``calculate_*_arrays``
+functions wrap such unrounded columns in ``ResultArrays``. This is the
+struct-of-arrays counterpart of the records in cisko/records.py: it rounds
+only when asked and builds a record (or a legacy dict) per row only on demand.
+"""
+
+import numpy as np
+
+from cisko.engine import DEFAULT_WORK_DAYS_PER_YEAR
+from cisko.params import DEFAULT_TAX_YEAR, TaxParams, get_tax_params
+from cisko.records import CalculationResult, HppResult, IcoPausalniDanResult, IcoPausalniVydajeResult
+
+ERROR_NEGATIVE_HPP = "Hrubý měsíční příjem nemůže být záporný."
+ERROR_NEGATIVE_ICO = "Hrubý roční příjem (obrat) nemůže být záporný."
+ERROR_INVALID_EXPENSE_PERCENTAGE = "Neplatné procento paušálních výdajů."
+ERROR_INVALID_BAND = "Neplatné pásmo paušální daně."
+
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """Element-wise equivalent of Python's ``round(x, 2)``.
+
+    ``np.round`` scales by 100 before rounding, which can pick the wrong side
+    when ``x * 100`` lands within a few ulps of a .5 boundary. Those rare
+    elements are re-rounded with the built-in ``round``.
+    """
+    rounded = np.array(np.round(values, 2))
+    scaled = values * 100.0
+    distance_to_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5)
+    ambiguous = np.flatnonzero(distance_to_half <= 4 * np.spacing(np.abs(scaled)))
+    for i in ambiguous:
+        rounded.flat[i] = round(float(values.flat[i]), 2)
+    return rounded
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """``numerator / denominator`` where the denominator is positive, else 0."""
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def _progressive_income_tax(p: TaxParams, tax_base: np.ndarray, other_annual_tax_credits: np.ndarray) -> np.ndarray:
+    income_tax_before_credits = np.where(
+        tax_base <= p.income_tax_threshold_annual,
+        tax_base * p.income_tax_rate_lower,
+        p.income_tax_at_threshold + ((tax_base - p.income_tax_threshold_annual) * p.income_tax_rate_higher),
+    )
+    total_tax_credits = p.personal_tax_credit_annual + other_annual_tax_credits
+    return np.maximum(0.0, income_tax_before_credits - total_tax_credits)
+
+
+def _finish(columns: dict, error: np.ndarray, round_values: bool = True) -> dict:
+    """Round the money columns, blank out error rows and attach the error column."""
+    has_error = np.not_equal(error, None)
+    result = {}
+    for key, (values, is_money) in columns.items():
+        values = np.array(values, dtype=np.float64)
+        if round_values and is_money:
+            values = _round2(values)
+        values[has_error] = np.nan
+        result[key] = values
+    result["error"] = error
+    return result
+
+
+def calculate_hpp_income_batch(
+    gross_monthly_income,
+    other_annual_tax_credits=0.0,
+    work_days_per_year_input=DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+    round_values: bool = True,
+) -> dict:
+    p = get_tax_params(tax_year)
+    gross_monthly_income, other_annual_tax_credits, work_days = np.broadcast_arrays(
+        _as_float(gross_monthly_income), _as_float(other_annual_tax_credits), _as_float(work_days_per_year_input)
+    )
+    earning = gross_monthly_income > 0
+    gross_annual_income = gross_monthly_income * 12
+
+    health_insurance_employee = np.where(earning, gross_annual_income * p.hpp_health_insurance_rate_employee, 0.0)
+    social_security_employee = np.where(earning, gross_annual_income * p.hpp_social_security_rate_employee, 0.0)
+    health_insurance_employer = gross_annual_income * p.hpp_health_insurance_rate_employer
+    social_security_employer = gross_annual_income * p.hpp_social_security_rate_employer
+    total_employer_cost_annual = np.where(
+        earning, gross_annual_income + (health_insurance_employer + social_security_employer), 0.0
+    )
+    final_income_tax = np.where(earning, _progressive_income_tax(p, gross_annual_income, other_annual_tax_credits), 0.0)
+    net_annual_income = np.where(
+        earning, gross_annual_income - health_insurance_employee - social_security_employee - final_income_tax, 0.0
+    )
+    net_daily_income = np.where(earning, _safe_divide(net_annual_income, work_days), 0.0)
+
+    error = np.full(gross_monthly_income.shape, None, dtype=object)
+    error[gross_monthly_income < 0] = ERROR_NEGATIVE_HPP
+
+    return _finish({
+        "hruby_mesicni_prijem": (gross_monthly_income, True),
+        "hruby_rocni_prijem": (gross_annual_income, True),
+        "zamestnanec_rocni_zdravotni_pojisteni": (health_insurance_employee, True),
+        "zamestnanec_rocni_socialni_pojisteni": (social_security_employee, True),
+        "zamestnanec_konecna_rocni_dan_z_prijmu": (final_income_tax, True),
+        "cisty_rocni_prijem_zamestnanec": (net_annual_income, True),
+        "cisty_mesicni_prijem_zamestnanec": (np.where(earning, net_annual_income / 12, 0.0), True),
+        "cisty_denni_prijem_zamestnanec": (net_daily_income, True),
+        "zamestnavatel_celkove_rocni_naklady_na_zamestnance": (total_employer_cost_annual, True),
+        "zamestnavatel_celkove_mesicni_naklady_na_zamestnance": (
+            np.where(gross_annual_income > 0, total_employer_cost_annual / 12, 0.0), True
+        ),
+    }, error, round_values)
+
+
+def calculate_ico_pausalni_vydaje_income_batch(
+    gross_annual_revenue,
+    expense_percentage,
+    realne_rocni_provozni_naklady=0.0,
+    other_annual_tax_credits=0.0,
+    participate_sickness_insurance=False,
+    sickness_insurance_assessment_base_monthly=None,
+    paid_vacation_days_by_client=0,
+    paid_sick_days_by_client=0,
+    actual_unpaid_vacation_days_taken=0,
+    actual_unpaid_sick_days_taken=0,
+    work_days_per_year_input=DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+    round_values: bool = True,
+) -> dict:
+    p = get_tax_params(tax_year)
+    if sickness_insurance_assessment_base_monthly is None:
+        sickness_insurance_assessment_base_monthly = p.min_ico_sickness_assessment_base_monthly
+    (
+        revenue, expense_percentage, real_costs, other_annual_tax_credits, participate_sickness,
+        sickness_base_monthly, paid_vacation, paid_sick, unpaid_vacation, unpaid_sick, work_days,
+    ) = np.broadcast_arrays(
+        _as_float(gross_annual_revenue),
+        _as_float(expense_percentage),
+        _as_float(realne_rocni_provozni_naklady),
+        _as_float(other_annual_tax_credits),
+        np.asarray(participate_sickness_insurance, dtype=bool),
+        _as_float(sickness_insurance_assessment_base_monthly),
+        _as_float(paid_vacation_days_by_client),
+        _as_float(paid_sick_days_by_client),
+        _as_float(actual_unpaid_vacation_days_taken),
+        _as_float(actual_unpaid_sick_days_taken),
+        _as_float(work_days_per_year_input),
+    )
+    earning = revenue > 0
+    effective_work_days = work_days - unpaid_vacation - unpaid_sick
+
+    max_expense_claim_amount = np.full(revenue.shape, np.nan)
+    for percentage, cap in p.expense_caps.items():
+        max_expense_claim_amount[expense_percentage == percentage] = cap
+
+    applicable_revenue_for_lump_sum = np.minimum(revenue, p.max_revenue_for_lump_sum)
+    calculated_expenses_for_tax = applicable_revenue_for_lump_sum * expense_percentage
+    annual_expenses_for_tax = np.minimum(calculated_expenses_for_tax, max_expense_claim_amount)
+    profit = np.where(
+        revenue <= p.max_revenue_for_lump_sum,
+        revenue - annual_expenses_for_tax,
+        (applicable_revenue_for_lump_sum - annual_expenses_for_tax) + (revenue - p.max_revenue_for_lump_sum),
+    )
+    has_profit = profit > 0
+    assessment_base_insurance = profit * p.ico_profit_assessment_base_factor
+
+    effective_social_assessment_base = np.maximum(
+        assessment_base_insurance, np.where(has_profit, p.min_social_assessment_base_annual, 0.0)
+    )
+    annual_social_security = np.maximum(
+        effective_social_assessment_base * p.ico_social_security_rate,
+        np.where(has_profit, p.ico_min_social_annual, 0.0),
+    )
+    effective_health_assessment_base = np.maximum(
+        assessment_base_insurance, np.where(has_profit, p.min_health_assessment_base_annual, 0.0)
+    )
+    annual_health_insurance = np.maximum(
+        effective_health_assessment_base * p.ico_health_insurance_rate,
+        np.where(has_profit, p.ico_min_health_annual, 0.0),
+    )
+    monthly_sickness_payment = (
+        np.maximum(sickness_base_monthly, p.min_ico_sickness_assessment_base_monthly) * p.ico_sickness_insurance_rate
+    )
+    annual_sickness_insurance = np.where(
+        participate_sickness & has_profit, np.maximum(monthly_sickness_payment, p.ico_min_sickness_monthly) * 12, 0.0
+    )
+    final_income_tax = _progressive_income_tax(p, profit, other_annual_tax_credits)
+
+    net_annual_income_tax_method = (
+        profit - annual_social_security - annual_health_insurance - annual_sickness_insurance - final_income_tax
+    )
+    total_annual_deductions_tax_method = (
+        annual_social_security + annual_health_insurance + annual_sickness_insurance + final_income_tax
+    )
+    net_annual_disposable_income = revenue - real_costs - total_annual_deductions_tax_method
+
+    def when_earning(values):
+        return np.where(earning, values, 0.0)
+
+    error = np.full(revenue.shape, None, dtype=object)
+    error[earning & np.isnan(max_expense_claim_amount)] = ERROR_INVALID_EXPENSE_PERCENTAGE
+    error[revenue < 0] = ERROR_NEGATIVE_ICO
+
+    return _finish({
+        "hruby_rocni_prijem_obrat": (revenue, True),
+        "hruby_mesicni_prijem_obrat_prumer": (when_earning(revenue / 12), True),
+        "procento_pausalnich_vydaju": (when_earning(expense_percentage), False),
+        "rocni_pausalni_vydaje_pro_dane": (when_earning(annual_expenses_for_tax), True),
+        "zisk_pro_danove_ucely": (when_earning(profit), True),
+        "rocni_socialni_pojisteni": (when_earning(annual_social_security), True),
+        "rocni_zdravotni_pojisteni": (when_earning(annual_health_insurance), True),
+        "rocni_nemocenske_pojisteni": (when_earning(annual_sickness_insurance), True),
+        "konecna_rocni_dan_z_prijmu": (when_earning(final_income_tax), True),
+        "cisty_rocni_prijem_dle_pausalu": (when_earning(net_annual_income_tax_method), True),
+        "cisty_mesicni_prijem_dle_pausalu": (when_earning(net_annual_income_tax_method / 12), True),
+        "cisty_denni_prijem_dle_pausalu_efektivni": (
+            when_earning(_safe_divide(net_annual_income_tax_method, effective_work_days)), True
+        ),
+        "vstup_realne_rocni_provozni_naklady": (real_costs, True),
+        "cisty_rocni_prijem_disponibilni_po_realnych_nakladech": (when_earning(net_annual_disposable_income), True),
+        "cisty_mesicni_prijem_disponibilni_po_realnych_nakladech": (when_earning(net_annual_disposable_income / 12), True),
+        "cisty_denni_prijem_disponibilni_efektivni": (
+            when_earning(_safe_divide(net_annual_disposable_income, effective_work_days)), True
+        ),
+        "uvazovane_pracovni_dny_pro_denni_sazbu": (
+            np.where(effective_work_days > 0, effective_work_days, work_days), False
+        ),
+        "paid_vacation_days_by_client": (paid_vacation, False),
+        "paid_sick_days_by_client": (paid_sick, False),
+    }, error, round_values)
+
+
+def calculate_ico_pausalni_dan_income_batch(
+    gross_annual_revenue,
+    pausalni_dan_band,
+    actual_unpaid_vacation_days_taken=0,
+    actual_unpaid_sick_days_taken=0,
+    work_days_per_year_input=DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+    round_values: bool = True,
+) -> dict:
+    """Batch version of calculate_ico_pausalni_dan_income.
+
+    ``zvolene_pasmo_pausalni_dane`` is 0 where the scalar function reports "-".
+    """
+    p = get_tax_params(tax_year)
+    revenue, band, unpaid_vacation, unpaid_sick, work_days = np.broadcast_arrays(
+        _as_float(gross_annual_revenue),
+        _as_float(pausalni_dan_band),
+        _as_float(actual_unpaid_vacation_days_taken),
+        _as_float(actual_unpaid_sick_days_taken),
+        _as_float(work_days_per_year_input),
+    )
+    earning = revenue > 0
+    effective_work_days = work_days - unpaid_vacation - unpaid_sick
+
+    monthly_payment = np.full(revenue.shape, np.nan)
+    for band_number, payment in p.pausalni_dan_bands_monthly.items():
+        monthly_payment[band == band_number] = payment
+    monthly_payment = np.where(earning, monthly_payment, 0.0)
+    net_annual_income = np.where(earning, revenue - monthly_payment * 12, 0.0)
+
+    error = np.full(revenue.shape, None, dtype=object)
+    error[earning & np.isnan(monthly_payment)] = ERROR_INVALID_BAND
+    error[revenue > p.pausalni_dan_max_revenue] = (
+        f"Příjem přesahuje limit {p.pausalni_dan_max_revenue:,.0f} CZK pro paušální daň."
+    )
+    error[revenue < 0] = ERROR_NEGATIVE_ICO
+
+    return _finish({
+        "hruby_rocni_prijem_obrat": (revenue, True),
+        "hruby_mesicni_prijem_obrat_prumer": (np.where(earning, revenue / 12, 0.0), True),
+        "zvolene_pasmo_pausalni_dane": (np.where(earning, band, 0.0), False),
+        "mesicni_platba_pausalni_dane": (monthly_payment, True),
+        "cisty_rocni_prijem": (net_annual_income, True),
+        "cisty_mesicni_prijem": (net_annual_income / 12, True),
+        "cisty_denni_prijem_efektivni": (np.where(earning, _safe_divide(net_annual_income, effective_work_days), 0.0), True),
+        "uvazovane_pracovni_dny_pro_denni_sazbu": (
+            np.where(effective_work_days > 0, effective_work_days, work_days), False
+        ),
+    }, error, round_values)
+
+
+# Record fields that hold day counts; batch columns store them as floats
+_DAY_FIELDS = {"uvazovane_pracovni_dny_pro_denni_sazbu", "paid_vacation_days_by_client", "paid_sick_days_by_client"}
+
+
+def _record_value(name: str, value: float):
+    if name in _DAY_FIELDS:
+        return int(value) if value == int(value) else value
+    if name == "zvolene_pasmo_pausalni_dane":
+        return int(value) if value else "-"
+    return value
+
+
+class ResultArrays:
+    """Unrounded batch results of one calculate_* function (struct of arrays).
+
+    ``columns`` maps the record field names to float64 arrays and ``error``
+    is the error column. Use ``arrays[name]`` for one unrounded column,
+    ``rounded()`` for the regular batch dict, and ``record(i)`` / ``records()``
+    for per-row records with the legacy dict view.
+    """
+
+    __slots__ = ("record_type", "tax_year", "columns", "error")
+
+    def __init__(self, record_type: type, tax_year: int, columns: dict):
+        columns = dict(columns)
+        self.record_type = record_type
+        self.tax_year = tax_year
+        self.error = columns.pop("error")
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return self.error.size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def rounded(self) -> dict:
+        """The columns as the batch function returns them by default."""
+        result = {
+            name: values if name in self.record_type.NOT_ROUNDED else _round2(values)
+            for name, values in self.columns.items()
+        }
+        result["error"] = self.error
+        return result
+
+    def _record(self, error, values: tuple) -> CalculationResult:
+        if error is not None:
+            return self.record_type.failed(self.tax_year, error)
+        return self.record_type(self.tax_year, tuple(
+            _record_value(name, value) for name, value in zip(self.record_type.FIELDS, values)
+        ))
+
+    def record(self, index) -> CalculationResult:
+        """Record of one row (an index into the flattened arrays)."""
+        return self._record(self.error.flat[index], tuple(
+            float(self.columns[name].flat[index]) for name in self.record_type.FIELDS
+        ))
+
+    def records(self) -> list:
+        """Records of all rows, in flattened order."""
+        record_type, tax_year = self.record_type, self.tax_year
+        columns = []
+        for name in record_type.FIELDS:
+            values = self.columns[name].ravel().tolist()
+            # Only the day count and band columns need converting (error rows hold NaN and are dropped)
+            if name in _DAY_FIELDS or name == "zvolene_pasmo_pausalni_dane":
+                values = [_record_value(name, value) if value == value else value for value in values]
+            columns.append(values)
+        return [
+            record_type(tax_year, values) if error is None else record_type.failed(tax_year, error)
+            for error, values in zip(self.error.ravel().tolist(), zip(*columns))
+        ]
+
+
+def calculate_hpp_income_arrays(*args, tax_year: int = DEFAULT_TAX_YEAR, **kwargs) -> ResultArrays:
+    """calculate_hpp_income_batch without rounding, as ResultArrays of HppResult rows."""
+    return ResultArrays(HppResult, tax_year,
+                        calculate_hpp_income_batch(*args, tax_year=tax_year, round_values=False, **kwargs))
+
+
+def calculate_ico_pausalni_vydaje_income_arrays(*args, tax_year: int = DEFAULT_TAX_YEAR, **kwargs) -> ResultArrays:
+    """calculate_ico_pausalni_vydaje_income_batch without rounding, as ResultArrays."""
+    return ResultArrays(IcoPausalniVydajeResult, tax_year,
+                        calculate_ico_pausalni_vydaje_income_batch(*args, tax_year=tax_year, round_values=False, **kwargs))
+
+
+def calculate_ico_pausalni_dan_income_arrays(*args, tax_year: int = DEFAULT_TAX_YEAR, **kwargs) -> ResultArrays:
+    """calculate_ico_pausalni_dan_income_batch without rounding, as ResultArrays."""
+    return ResultArrays(IcoPausalniDanResult, tax_year,
+                        calculate_ico_pausalni_dan_income_batch(*args, tax_year=tax_year, round_values=False, **kwargs))
@@ -0,0 +1,150 @@
+"""Memoized calculate_* calls shared by all sessions of one server process.
+
+Streamlit re-executes the page script on every widget interaction, but
+imported modules are loaded once per process, so the LRU cache below is shared
+by every session the way ``st.cache_data`` is. Inputs are normalized into a
+canonical tuple first (floats as floats, whole-number counts as ints, inputs
+a mode ignores dropped), so equivalent widget states map to the same entry.
+Counts that are not whole numbers are kept as they are, so the cached
+functions accept and reject exactly what the engine does. The cache holds compact
+read-only records (cisko/records.py). The ``*_record`` functions return the
+shared record. Like ``st.cache_data``, the dict functions return a fresh dict
+on each call.
+
+The size is taken from the ``CISKO_CACHE_MAX_ENTRIES`` environment variable.
+``cache_stats()`` reports hits and misses for tuning it.
+"""
+
+import functools
+import os
+
+from cisko.engine import (
+    DEFAULT_WORK_DAYS_PER_YEAR,
+    calculate_hpp_income_record,
+    calculate_ico_pausalni_dan_income_record,
+    calculate_ico_pausalni_vydaje_income_record,
+)
+from cisko.records import HppResult, IcoPausalniDanResult, IcoPausalniVydajeResult
+from cisko.params import DEFAULT_TAX_YEAR
+
+DEFAULT_CACHE_MAX_ENTRIES = 4096
+CACHE_MAX_ENTRIES = int(os.environ.get("CISKO_CACHE_MAX_ENTRIES", DEFAULT_CACHE_MAX_ENTRIES))
+
+MODE_HPP = "hpp"
+MODE_PAUSALNI_VYDAJE = "pausalni_vydaje"
+MODE_PAUSALNI_DAN = "pausalni_dan"
+
+_CALCULATIONS = {
+    MODE_HPP: calculate_hpp_income_record,
+    MODE_PAUSALNI_VYDAJE: calculate_ico_pausalni_vydaje_income_record,
+    MODE_PAUSALNI_DAN: calculate_ico_pausalni_dan_income_record,
+}
+
+
+@functools.lru_cache(maxsize=CACHE_MAX_ENTRIES)
+def _calculate(key: tuple):
+    mode, *args = key
+    return _CALCULATIONS[mode](*args)
+
+
+def _count(value):
+    """A whole-number band, day count or year as int; anything else unchanged for the engine to judge."""
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def hpp_key(
+    gross_monthly_income: float,
+    other_annual_tax_credits: float = 0.0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> tuple:
+    return (MODE_HPP, float(gross_monthly_income), float(other_annual_tax_credits),
+            _count(work_days_per_year_input), _count(tax_year))
+
+
+def ico_pausalni_vydaje_key(
+    gross_annual_revenue: float,
+    expense_percentage: float,
+    realne_rocni_provozni_naklady: float = 0.0,
+    other_annual_tax_credits: float = 0.0,
+    participate_sickness_insurance: bool = False,
+    sickness_insurance_assessment_base_monthly: float | None = None,
+    paid_vacation_days_by_client: int = 0,
+    paid_sick_days_by_client: int = 0,
+    actual_unpaid_vacation_days_taken: int = 0,
+    actual_unpaid_sick_days_taken: int = 0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> tuple:
+    participate_sickness_insurance = bool(participate_sickness_insurance)
+    # The assessment base only matters when participating in sickness insurance
+    if not participate_sickness_insurance or sickness_insurance_assessment_base_monthly is None:
+        sickness_insurance_assessment_base_monthly = None
+    else:
+        sickness_insurance_assessment_base_monthly = float(sickness_insurance_assessment_base_monthly)
+    return (MODE_PAUSALNI_VYDAJE, float(gross_annual_revenue), float(expense_percentage),
+            float(realne_rocni_provozni_naklady), float(other_annual_tax_credits),
+            participate_sickness_insurance, sickness_insurance_assessment_base_monthly,
+            _count(paid_vacation_days_by_client), _count(paid_sick_days_by_client),
+            _count(actual_unpaid_vacation_days_taken), _count(actual_unpaid_sick_days_taken),
+            _count(work_days_per_year_input), _count(tax_year))
+
+
+def ico_pausalni_dan_key(
+    gross_annual_revenue: float,
+    pausalni_dan_band: int,
+    actual_unpaid_vacation_days_taken: int = 0,
+    actual_unpaid_sick_days_taken: int = 0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> tuple:
+    return (MODE_PAUSALNI_DAN, float(gross_annual_revenue), _count(pausalni_dan_band),
+            _count(actual_unpaid_vacation_days_taken), _count(actual_unpaid_sick_days_taken),
+            _count(work_days_per_year_input), _count(tax_year))
+
+
+def cached_calculate_hpp_income(*args, **kwargs) -> dict:
+    """Same arguments and result as calculate_hpp_income."""
+    return _calculate(hpp_key(*args, **kwargs)).as_dict()
+
+
+def cached_calculate_ico_pausalni_vydaje_income(*args, **kwargs) -> dict:
+    """Same arguments and result as calculate_ico_pausalni_vydaje_income."""
+    return _calculate(ico_pausalni_vydaje_key(*args, **kwargs)).as_dict()
+
+
+def cached_calculate_ico_pausalni_dan_income(*args, **kwargs) -> dict:
+    """Same arguments and result as calculate_ico_pausalni_dan_income."""
+    return _calculate(ico_pausalni_dan_key(*args, **kwargs)).as_dict()
+
+
+def cached_calculate_hpp_income_record(*args, **kwargs) -> HppResult:
+    """Same arguments and result as calculate_hpp_income_record; the record is shared."""
+    return _calculate(hpp_key(*args, **kwargs))
+
+
+def cached_calculate_ico_pausalni_vydaje_income_record(*args, **kwargs) -> IcoPausalniVydajeResult:
+    """Same arguments and result as calculate_ico_pausalni_vydaje_income_record; the record is shared."""
+    return _calculate(ico_pausalni_vydaje_key(*args, **kwargs))
+
+
+def cached_calculate_ico_pausalni_dan_income_record(*args, **kwargs) -> IcoPausalniDanResult:
+    """Same arguments and result as calculate_ico_pausalni_dan_income_record; the record is shared."""
+    return _calculate(ico_pausalni_dan_key(*args, **kwargs))
+
+
+def cache_stats() -> dict:
+    info = _calculate.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "entries": info.currsize,
+        "max_entries": info.maxsize,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+    }
+
+
+def clear_cache() -> None:
+    _calculate.cache_clear()
@@ -0,0 +1,243 @@
+"""Command-line bulk calculator: ``python -m cisko INPUT OUTPUT``.
+
+Streams a CSV or Parquet file of scenarios in chunks, so memory stays constant
+regardless of file size. Each chunk goes through the vectorized batch
+functions, which give the same results as the calculate_* functions. Result
+columns are written out before the next chunk is read.
+
+Input columns use the argument names of the calculate_* functions:
+``gross_monthly_income`` enables the HPP calculation, ``gross_annual_revenue``
+with ``expense_percentage`` the paušální výdaje one, and
+``gross_annual_revenue`` with ``pausalni_dan_band`` the paušální daň one.
+The optional ``other_annual_tax_credits``, ``realne_rocni_provozni_naklady``,
+``participate_sickness_insurance``,
+``sickness_insurance_assessment_base_monthly``, ``paid_vacation_days_by_client``,
+``paid_sick_days_by_client``, ``actual_unpaid_vacation_days_taken``,
+``actual_unpaid_sick_days_taken``, ``work_days_per_year_input`` and
+``tax_year`` columns fall back to the function defaults when missing or empty.
+Day counts may be fractional, as in the calculate_* functions.
+
+Output rows are the input rows plus ``hpp_*``, ``vydaje_*`` and ``dan_*``
+result columns. Each mode also gets an ``*_error`` column holding the message
+the scalar function would return as ``{"error": ...}``. A row whose
+``tax_year`` has no tax parameters gets the message the scalar function
+raises in its error columns, and the rest of the file is still processed.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cisko.batch import (
+    calculate_hpp_income_batch,
+    calculate_ico_pausalni_dan_income_batch,
+    calculate_ico_pausalni_vydaje_income_batch,
+)
+from cisko.engine import DEFAULT_WORK_DAYS_PER_YEAR
+from cisko.params import DEFAULT_TAX_YEAR, get_tax_params
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Optional input columns and the value used when a column or cell is missing.
+# An empty sickness base means the minimum, which max(0, minimum) yields.
+OPTIONAL_COLUMNS = {
+    "other_annual_tax_credits": 0.0,
+    "realne_rocni_provozni_naklady": 0.0,
+    "participate_sickness_insurance": False,
+    "sickness_insurance_assessment_base_monthly": 0.0,
+    "paid_vacation_days_by_client": 0,
+    "paid_sick_days_by_client": 0,
+    "actual_unpaid_vacation_days_taken": 0,
+    "actual_unpaid_sick_days_taken": 0,
+    "work_days_per_year_input": DEFAULT_WORK_DAYS_PER_YEAR,
+    "tax_year": DEFAULT_TAX_YEAR,
+}
+
+DAYS_COLUMNS = ("actual_unpaid_vacation_days_taken", "actual_unpaid_sick_days_taken", "work_days_per_year_input")
+
+
+def _column(chunk: pd.DataFrame, name: str) -> np.ndarray:
+    default = OPTIONAL_COLUMNS[name]
+    # Everything but the flag is read as float: day counts may be fractional and
+    # the tax year is checked for a whole number in _tax_year_error
+    dtype = bool if isinstance(default, bool) else float
+    if name not in chunk:
+        return np.full(len(chunk), default, dtype=dtype)
+    return chunk[name].fillna(default).to_numpy(dtype=dtype)
+
+
+def _tax_year_error(tax_year: float) -> str | None:
+    """The error of a tax year without tax parameters, None for a supported year."""
+    try:
+        get_tax_params(int(tax_year) if float(tax_year).is_integer() else tax_year)
+    except ValueError as exc:
+        return str(exc)
+    return None
+
+
+def _calculate(batch_function, year_error: str | None, main_input: np.ndarray, *args, **kwargs) -> dict:
+    """``batch_function(*args, **kwargs)``, or the same columns failing with ``year_error``."""
+    if year_error is None:
+        return batch_function(*args, **kwargs)
+    columns = batch_function(*(np.empty(0) for _ in args))
+    return {
+        key: np.where(np.isnan(main_input), None, year_error) if key == "error"
+        else np.full(len(main_input), np.nan, dtype=values.dtype)
+        for key, values in columns.items()
+    }
+
+
+def _add_results(out: dict, prefix: str, results: dict, rows: np.ndarray, main_input: np.ndarray) -> None:
+    for key, values in results.items():
+        column = out.setdefault(f"{prefix}_{key}", np.full(len(main_input), None if key == "error" else np.nan, dtype=values.dtype))
+        column[rows] = values
+    # Rows without the main input get no results
+    for key, column in out.items():
+        if key.startswith(prefix + "_") and key != f"{prefix}_error":
+            column[np.isnan(main_input)] = np.nan
+
+
+def process_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Input chunk plus the result columns of every mode its columns enable."""
+    inputs = {name: _column(chunk, name) for name in OPTIONAL_COLUMNS}
+    out = {}
+    for tax_year in np.unique(inputs["tax_year"]):
+        rows = inputs["tax_year"] == tax_year
+        year_error = _tax_year_error(tax_year)
+        common = dict(
+            other_annual_tax_credits=inputs["other_annual_tax_credits"][rows],
+            work_days_per_year_input=inputs["work_days_per_year_input"][rows],
+            tax_year=DEFAULT_TAX_YEAR if year_error else int(tax_year),
+        )
+        days = {name: inputs[name][rows] for name in DAYS_COLUMNS}
+
+        if "gross_monthly_income" in chunk:
+            gross = chunk["gross_monthly_income"].to_numpy(dtype=float)
+            results = _calculate(calculate_hpp_income_batch, year_error, gross[rows], gross[rows], **common)
+            _add_results(out, "hpp", results, rows, gross)
+        if "gross_annual_revenue" in chunk:
+            revenue = chunk["gross_annual_revenue"].to_numpy(dtype=float)
+            if "expense_percentage" in chunk:
+                results = _calculate(
+                    calculate_ico_pausalni_vydaje_income_batch, year_error, revenue[rows],
+                    revenue[rows],
+                    chunk["expense_percentage"].to_numpy(dtype=float)[rows],
+                    realne_rocni_provozni_naklady=inputs["realne_rocni_provozni_naklady"][rows],
+                    other_annual_tax_credits=common["other_annual_tax_credits"],
+                    participate_sickness_insurance=inputs["participate_sickness_insurance"][rows],
+                    sickness_insurance_assessment_base_monthly=inputs["sickness_insurance_assessment_base_monthly"][rows],
+                    paid_vacation_days_by_client=inputs["paid_vacation_days_by_client"][rows],
+                    paid_sick_days_by_client=inputs["paid_sick_days_by_client"][rows],
+                    tax_year=common["tax_year"],
+                    **days,
+                )
+                _add_results(out, "vydaje", results, rows, revenue)
+            if "pausalni_dan_band" in chunk:
+                results = _calculate(
+                    calculate_ico_pausalni_dan_income_batch, year_error, revenue[rows],
+                    revenue[rows],
+                    chunk["pausalni_dan_band"].to_numpy(dtype=float)[rows],
+                    tax_year=common["tax_year"],
+                    **days,
+                )
+                _add_results(out, "dan", results, rows, revenue)
+    results = pd.DataFrame({
+        # A string dtype keeps the Parquet schema stable when a chunk has no errors
+        key: pd.array(values, dtype="string") if key.endswith("_error") else values
+        for key, values in out.items()
+    })
+    return pd.concat([chunk.reset_index(drop=True), results], axis=1)
+
+
+def _format(path: Path, explicit: str | None) -> str:
+    fmt = explicit or path.suffix.lstrip(".").lower()
+    if fmt in ("pq", "parquet"):
+        return "parquet"
+    if fmt == "csv":
+        return "csv"
+    raise SystemExit(f"Neznámý formát souboru {path}; použijte --input-format/--output-format (csv, parquet).")
+
+
+def iter_chunks(path: Path, fmt: str, chunk_size: int):
+    if fmt == "csv":
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    else:
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+
+class ChunkWriter:
+    """Appends result chunks to a CSV or Parquet file as they arrive."""
+
+    def __init__(self, path: Path, fmt: str):
+        self.path = path
+        self.fmt = fmt
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self.fmt == "csv":
+            chunk.to_csv(self.path, mode="a" if self._wrote_header else "w", header=not self._wrote_header, index=False)
+            self._wrote_header = True
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table.cast(self._parquet_writer.schema))
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def _process_in_pool(chunks, workers: int):
+    """Yield processed chunks in input order with at most 2 * workers chunks in flight."""
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(pool.submit(process_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run(input_path: Path, output_path: Path, input_format: str | None = None, output_format: str | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1) -> int:
+    """Process the whole file and return the number of rows written."""
+    chunks = iter_chunks(input_path, _format(input_path, input_format), chunk_size)
+    processed = _process_in_pool(chunks, workers) if workers > 1 else map(process_chunk, chunks)
+    writer = ChunkWriter(output_path, _format(output_path, output_format))
+    rows = 0
+    try:
+        for chunk in processed:
+            writer.write(chunk)
+            rows += len(chunk)
+    finally:
+        writer.close()
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cisko", description="Hromadný výpočet HPP / IČO z CSV nebo Parquet souboru.")
+    parser.add_argument("input", type=Path, help="Vstupní soubor se scénáři (.csv nebo .parquet).")
+    parser.add_argument("output", type=Path, help="Výstupní soubor (.csv nebo .parquet).")
+    parser.add_argument("--input-format", choices=("csv", "parquet"), help="Formát vstupu, pokud nejde odvodit z přípony.")
+    parser.add_argument("--output-format", choices=("csv", "parquet"), help="Formát výstupu, pokud nejde odvodit z přípony.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Počet řádků zpracovaných najednou (výchozí %(default)s).")
+    parser.add_argument("--workers", type=int, default=1, help="Počet procesů pro paralelní zpracování bloků (výchozí %(default)s).")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or args.workers < 1:
+        parser.error("--chunk-size a --workers musí být alespoň 1.")
+
+    rows = run(args.input, args.output, args.input_format, args.output_format, args.chunk_size, args.workers)
+    print(f"Zpracováno {rows:,} řádků -> {args.output}", file=sys.stderr)
+    return 0
@@ -0,0 +1,283 @@
+"""Calculation core of CISKO, importable without Streamlit.
+
+The ``calculate_*_record`` functions return compact records with unrounded
+values (see cisko/records.py). The ``calculate_*`` functions return the
+records' legacy dict view: rounded values, with the nested ``info_k_*`` dicts.
+"""
+
+from cisko.params import DEFAULT_TAX_YEAR, get_tax_params
+from cisko.records import HppResult, IcoPausalniDanResult, IcoPausalniVydajeResult
+
+# --- Constants for 2024 (Czech Republic) ---
+# Kept for existing importers; the values come from the year-indexed registry
+# in cisko/params.py, which is what the calculation functions use.
+_TAX_PARAMS_2024 = get_tax_params(2024)
+
+# --- General ---
+PERSONAL_TAX_CREDIT_ANNUAL_2024 = _TAX_PARAMS_2024.personal_tax_credit_annual  # Sleva na poplatníka (2570 CZK/month)
+INCOME_TAX_THRESHOLD_ANNUAL_2024 = _TAX_PARAMS_2024.income_tax_threshold_annual # Threshold for 23% tax rate
+INCOME_TAX_RATE_LOWER_2024 = _TAX_PARAMS_2024.income_tax_rate_lower
+INCOME_TAX_RATE_HIGHER_2024 = _TAX_PARAMS_2024.income_tax_rate_higher
+DEFAULT_WORK_DAYS_PER_YEAR = 252 # Approximate, can be adjusted by user in advanced settings
+DEFAULT_MANDAYS_PER_YEAR_ICO = 220 # Default for man-day calculation
+
+# --- HPP (Zaměstnanec - Employee) Constants 2024 ---
+HPP_HEALTH_INSURANCE_RATE_EMPLOYEE_2024 = _TAX_PARAMS_2024.hpp_health_insurance_rate_employee
+HPP_SOCIAL_SECURITY_RATE_EMPLOYEE_2024 = _TAX_PARAMS_2024.hpp_social_security_rate_employee
+HPP_HEALTH_INSURANCE_RATE_EMPLOYER_2024 = _TAX_PARAMS_2024.hpp_health_insurance_rate_employer
+HPP_SOCIAL_SECURITY_RATE_EMPLOYER_2024 = _TAX_PARAMS_2024.hpp_social_security_rate_employer
+
+# --- IČO (OSVČ - Self-Employed) Constants 2024 ---
+ICO_SOCIAL_SECURITY_RATE_2024 = _TAX_PARAMS_2024.ico_social_security_rate
+ICO_HEALTH_INSURANCE_RATE_2024 = _TAX_PARAMS_2024.ico_health_insurance_rate
+ICO_SICKNESS_INSURANCE_RATE_2024 = _TAX_PARAMS_2024.ico_sickness_insurance_rate
+ICO_PROFIT_ASSESSMENT_BASE_FACTOR_2024 = _TAX_PARAMS_2024.ico_profit_assessment_base_factor
+ICO_MIN_SOCIAL_MONTHLY_MAIN_ACTIVITY_2024 = _TAX_PARAMS_2024.ico_min_social_monthly_main_activity
+ICO_MIN_HEALTH_MONTHLY_2024 = _TAX_PARAMS_2024.ico_min_health_monthly
+ICO_MIN_SICKNESS_MONTHLY_2024 = _TAX_PARAMS_2024.ico_min_sickness_monthly
+MIN_ICO_SICKNESS_ASSESSMENT_BASE_MONTHLY_2024 = _TAX_PARAMS_2024.min_ico_sickness_assessment_base_monthly
+PAUSALNI_DAN_BAND_1_MONTHLY_2024 = _TAX_PARAMS_2024.pausalni_dan_bands_monthly[1]
+PAUSALNI_DAN_BAND_2_MONTHLY_2024 = _TAX_PARAMS_2024.pausalni_dan_bands_monthly[2]
+PAUSALNI_DAN_BAND_3_MONTHLY_2024 = _TAX_PARAMS_2024.pausalni_dan_bands_monthly[3]
+PAUSALNI_DAN_MAX_REVENUE_2024 = _TAX_PARAMS_2024.pausalni_dan_max_revenue
+
+# --- Calculation Functions ---
+def calculate_hpp_income_record(
+    gross_monthly_income: float, 
+    other_annual_tax_credits: float = 0.0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR
+) -> HppResult:
+    p = get_tax_params(tax_year)
+    gross_annual_income = gross_monthly_income * 12
+    # Initialize values for zero income case
+    net_annual_income = 0
+    net_monthly_income = 0
+    net_daily_income = 0
+    health_insurance_employee = 0
+    social_security_employee = 0
+    final_income_tax = 0
+    total_employer_cost_annual = 0
+
+    if gross_monthly_income < 0:
+         return HppResult.failed(p.year, "Hrubý měsíční příjem nemůže být záporný.")
+    elif gross_monthly_income > 0:
+        health_insurance_employee = gross_annual_income * p.hpp_health_insurance_rate_employee
+        social_security_employee = gross_annual_income * p.hpp_social_security_rate_employee
+        health_insurance_employer = gross_annual_income * p.hpp_health_insurance_rate_employer
+        social_security_employer = gross_annual_income * p.hpp_social_security_rate_employer
+        total_employer_contributions = health_insurance_employer + social_security_employer
+        total_employer_cost_annual = gross_annual_income + total_employer_contributions
+        taxable_income_for_tax_calc = gross_annual_income
+        income_tax_before_credits = 0
+        if taxable_income_for_tax_calc <= p.income_tax_threshold_annual:
+            income_tax_before_credits = taxable_income_for_tax_calc * p.income_tax_rate_lower
+        else:
+            income_tax_before_credits = p.income_tax_at_threshold + \
+                                      ((taxable_income_for_tax_calc - p.income_tax_threshold_annual) * p.income_tax_rate_higher)
+        total_tax_credits = p.personal_tax_credit_annual + other_annual_tax_credits
+        final_income_tax = max(0, income_tax_before_credits - total_tax_credits)
+        net_annual_income = gross_annual_income - health_insurance_employee - social_security_employee - final_income_tax
+        net_monthly_income = net_annual_income / 12 
+        net_daily_income = net_annual_income / work_days_per_year_input if work_days_per_year_input > 0 else 0
+
+    return HppResult(p.year, (
+        gross_monthly_income,
+        gross_annual_income,
+        health_insurance_employee,
+        social_security_employee,
+        final_income_tax,
+        net_annual_income,
+        net_monthly_income,
+        net_daily_income,
+        total_employer_cost_annual,
+        total_employer_cost_annual / 12 if gross_annual_income > 0 else 0,
+    ))
+
+def calculate_hpp_income(
+    gross_monthly_income: float, 
+    other_annual_tax_credits: float = 0.0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR
+) -> dict:
+    return calculate_hpp_income_record(gross_monthly_income, other_annual_tax_credits, work_days_per_year_input, tax_year).as_dict()
+
+def calculate_ico_pausalni_vydaje_income_record(
+    gross_annual_revenue: float, 
+    expense_percentage: float, 
+    realne_rocni_provozni_naklady: float = 0.0, 
+    other_annual_tax_credits: float = 0.0, 
+    participate_sickness_insurance: bool = False, 
+    sickness_insurance_assessment_base_monthly: float | None = None, # None = minimum for the tax year
+    paid_vacation_days_by_client: int = 0, 
+    paid_sick_days_by_client: int = 0,    
+    actual_unpaid_vacation_days_taken: int = 0,
+    actual_unpaid_sick_days_taken: int = 0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR
+) -> IcoPausalniVydajeResult:
+    p = get_tax_params(tax_year)
+    # Initialize values for zero revenue case
+    net_annual_income_tax_method = 0
+    net_monthly_income_tax_method = 0
+    net_daily_income_tax_method_effective = 0
+    net_annual_disposable_income = 0
+    net_monthly_disposable_income = 0
+    net_daily_disposable_income_effective = 0
+    annual_expenses_for_tax = 0
+    profit_for_tax_purposes = 0
+    annual_social_security = 0
+    annual_health_insurance = 0
+    annual_sickness_insurance = 0
+    final_income_tax = 0
+    # Calculate effective work days based on all day inputs for the daily rate of *achieved* revenue
+    effective_work_days_for_achieved_revenue_rate = work_days_per_year_input - actual_unpaid_vacation_days_taken - actual_unpaid_sick_days_taken
+
+
+    if gross_annual_revenue < 0:
+        return IcoPausalniVydajeResult.failed(p.year, "Hrubý roční příjem (obrat) nemůže být záporný.")
+    elif gross_annual_revenue > 0:
+        max_revenue_for_lump_sum_application = p.max_revenue_for_lump_sum
+        applicable_revenue_for_lump_sum = min(gross_annual_revenue, max_revenue_for_lump_sum_application)
+        max_expense_claim_amount = p.expense_caps.get(expense_percentage)
+        if max_expense_claim_amount is None: return IcoPausalniVydajeResult.failed(p.year, "Neplatné procento paušálních výdajů.")
+
+        calculated_expenses_for_tax = applicable_revenue_for_lump_sum * expense_percentage
+        annual_expenses_for_tax = min(calculated_expenses_for_tax, max_expense_claim_amount)
+        profit_for_tax_purposes = (gross_annual_revenue - annual_expenses_for_tax) if gross_annual_revenue <= max_revenue_for_lump_sum_application \
+                                    else (applicable_revenue_for_lump_sum - annual_expenses_for_tax) + (gross_annual_revenue - max_revenue_for_lump_sum_application)
+        assessment_base_insurance = profit_for_tax_purposes * p.ico_profit_assessment_base_factor
+        min_annual_social_payment = p.ico_min_social_annual
+        effective_social_assessment_base = max(assessment_base_insurance, p.min_social_assessment_base_annual if profit_for_tax_purposes > 0 else 0)
+        annual_social_security = effective_social_assessment_base * p.ico_social_security_rate
+        annual_social_security = max(annual_social_security, min_annual_social_payment if profit_for_tax_purposes > 0 else 0)
+        min_annual_health_payment = p.ico_min_health_annual
+        effective_health_assessment_base = max(assessment_base_insurance, p.min_health_assessment_base_annual if profit_for_tax_purposes > 0 else 0)
+        annual_health_insurance = effective_health_assessment_base * p.ico_health_insurance_rate
+        annual_health_insurance = max(annual_health_insurance, min_annual_health_payment if profit_for_tax_purposes > 0 else 0)
+        annual_sickness_insurance = 0
+        if participate_sickness_insurance and profit_for_tax_purposes > 0:
+            if sickness_insurance_assessment_base_monthly is None:
+                sickness_insurance_assessment_base_monthly = p.min_ico_sickness_assessment_base_monthly
+            actual_sickness_assessment_base_monthly = max(sickness_insurance_assessment_base_monthly, p.min_ico_sickness_assessment_base_monthly)
+            monthly_sickness_payment = actual_sickness_assessment_base_monthly * p.ico_sickness_insurance_rate
+            annual_sickness_insurance = max(monthly_sickness_payment, p.ico_min_sickness_monthly) * 12
+        tax_base_for_income_tax = profit_for_tax_purposes
+        income_tax_before_credits = 0
+        if tax_base_for_income_tax <= p.income_tax_threshold_annual:
+            income_tax_before_credits = tax_base_for_income_tax * p.income_tax_rate_lower
+        else:
+            income_tax_before_credits = p.income_tax_at_threshold + \
+                                      ((tax_base_for_income_tax - p.income_tax_threshold_annual) * p.income_tax_rate_higher)
+        total_tax_credits = p.personal_tax_credit_annual + other_annual_tax_credits
+        final_income_tax = max(0, income_tax_before_credits - total_tax_credits)
+        net_annual_income_tax_method = profit_for_tax_purposes - annual_social_security - annual_health_insurance - annual_sickness_insurance - final_income_tax
+        net_monthly_income_tax_method = net_annual_income_tax_method / 12
+        total_annual_deductions_tax_method = annual_social_security + annual_health_insurance + annual_sickness_insurance + final_income_tax
+        net_annual_disposable_income = gross_annual_revenue - realne_rocni_provozni_naklady - total_annual_deductions_tax_method
+        net_monthly_disposable_income = net_annual_disposable_income / 12
+        
+        net_daily_income_tax_method_effective = net_annual_income_tax_method / effective_work_days_for_achieved_revenue_rate if effective_work_days_for_achieved_revenue_rate > 0 else 0
+        net_daily_disposable_income_effective = net_annual_disposable_income / effective_work_days_for_achieved_revenue_rate if effective_work_days_for_achieved_revenue_rate > 0 else 0
+
+    return IcoPausalniVydajeResult(p.year, (
+        gross_annual_revenue,
+        gross_annual_revenue / 12 if gross_annual_revenue > 0 else 0,
+        expense_percentage if gross_annual_revenue > 0 else 0,
+        annual_expenses_for_tax,
+        profit_for_tax_purposes,
+        annual_social_security,
+        annual_health_insurance,
+        annual_sickness_insurance,
+        final_income_tax,
+        net_annual_income_tax_method,
+        net_monthly_income_tax_method,
+        net_daily_income_tax_method_effective,
+        # info_k_realnym_nakladum
+        realne_rocni_provozni_naklady,
+        net_annual_disposable_income,
+        net_monthly_disposable_income,
+        net_daily_disposable_income_effective,
+        # info_k_efektivite_dnu, for the primary calculation based on achieved revenue
+        effective_work_days_for_achieved_revenue_rate if effective_work_days_for_achieved_revenue_rate > 0 else work_days_per_year_input,
+        paid_vacation_days_by_client, # Keep for context
+        paid_sick_days_by_client, # Keep for context
+    ))
+
+def calculate_ico_pausalni_vydaje_income(
+    gross_annual_revenue: float, 
+    expense_percentage: float, 
+    realne_rocni_provozni_naklady: float = 0.0, 
+    other_annual_tax_credits: float = 0.0, 
+    participate_sickness_insurance: bool = False, 
+    sickness_insurance_assessment_base_monthly: float | None = None, # None = minimum for the tax year
+    paid_vacation_days_by_client: int = 0, 
+    paid_sick_days_by_client: int = 0,    
+    actual_unpaid_vacation_days_taken: int = 0,
+    actual_unpaid_sick_days_taken: int = 0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR
+) -> dict:
+    return calculate_ico_pausalni_vydaje_income_record(
+        gross_annual_revenue, expense_percentage, realne_rocni_provozni_naklady, other_annual_tax_credits,
+        participate_sickness_insurance, sickness_insurance_assessment_base_monthly,
+        paid_vacation_days_by_client, paid_sick_days_by_client,
+        actual_unpaid_vacation_days_taken, actual_unpaid_sick_days_taken,
+        work_days_per_year_input, tax_year,
+    ).as_dict()
+
+def calculate_ico_pausalni_dan_income_record(
+    gross_annual_revenue: float,
+    pausalni_dan_band: int,
+    actual_unpaid_vacation_days_taken: int = 0, 
+    actual_unpaid_sick_days_taken: int = 0,    
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR
+) -> IcoPausalniDanResult:
+    p = get_tax_params(tax_year)
+    net_annual_income = 0
+    net_monthly_income = 0
+    net_daily_income_effective = 0
+    monthly_payment = 0
+    # Calculate effective work days based on *only unpaid* days for this mode
+    effective_work_days_for_rate = work_days_per_year_input - actual_unpaid_vacation_days_taken - actual_unpaid_sick_days_taken
+
+    if gross_annual_revenue < 0:
+        return IcoPausalniDanResult.failed(p.year, "Hrubý roční příjem (obrat) nemůže být záporný.")
+    elif gross_annual_revenue == 0:
+        pass # All values remain 0
+    elif gross_annual_revenue > p.pausalni_dan_max_revenue: 
+        return IcoPausalniDanResult.failed(p.year, f"Příjem přesahuje limit {p.pausalni_dan_max_revenue:,.0f} CZK pro paušální daň.")
+    else:
+        monthly_payment = p.pausalni_dan_bands_monthly.get(pausalni_dan_band)
+        if monthly_payment is None: return IcoPausalniDanResult.failed(p.year, "Neplatné pásmo paušální daně.")
+        
+        annual_pausalni_dan_payment = monthly_payment * 12
+        net_annual_income = gross_annual_revenue - annual_pausalni_dan_payment
+        net_monthly_income = net_annual_income / 12
+        net_daily_income_effective = net_annual_income / effective_work_days_for_rate if effective_work_days_for_rate > 0 else 0
+    
+    return IcoPausalniDanResult(p.year, (
+        gross_annual_revenue,
+        gross_annual_revenue / 12 if gross_annual_revenue > 0 else 0,
+        pausalni_dan_band if gross_annual_revenue > 0 else "-",
+        monthly_payment,
+        net_annual_income,
+        net_monthly_income,
+        net_daily_income_effective,
+        # info_k_efektivite_dnu
+        effective_work_days_for_rate if effective_work_days_for_rate > 0 else work_days_per_year_input,
+    ))
+
+def calculate_ico_pausalni_dan_income(
+    gross_annual_revenue: float,
+    pausalni_dan_band: int,
+    actual_unpaid_vacation_days_taken: int = 0, 
+    actual_unpaid_sick_days_taken: int = 0,    
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR
+) -> dict:
+    return calculate_ico_pausalni_dan_income_record(
+        gross_annual_revenue, pausalni_dan_band, actual_unpaid_vacation_days_taken, actual_unpaid_sick_days_taken,
+        work_days_per_year_input, tax_year,
+    ).as_dict()
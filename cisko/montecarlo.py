@@ -0,0 +1,177 @@
+"""Monte Carlo simulation of a year of IČO income under uncertain days off.
+
+The IČO scenario of the app takes the unpaid sick days as a fixed number. Here
+each simulated year draws:
+
+* sick days, Poisson with mean ``mean_unpaid_sick_days``;
+* unbilled (bench) days without a client, Poisson with mean
+  ``mean_unbilled_days``; they count as unpaid vacation;
+* a day rate change, a log-normal factor with mean 1 and log standard
+  deviation ``day_rate_volatility``.
+
+The planned vacation days stay fixed. As in the app, the year's revenue is the
+planned revenue times the share of working days left after all unpaid days
+(and times the rate factor). All years are sampled and calculated at once by
+the batch functions, in chunks of ``chunk_size`` years. Chunks can run in a
+process pool. Every chunk draws from its own child of the seed's
+SeedSequence, so a given seed gives the same result for any number of workers.
+"""
+
+import concurrent.futures
+import math
+
+import numpy as np
+
+from cisko.batch import calculate_ico_pausalni_dan_income_arrays, calculate_ico_pausalni_vydaje_income_arrays
+from cisko.engine import DEFAULT_WORK_DAYS_PER_YEAR
+from cisko.params import DEFAULT_TAX_YEAR
+
+DEFAULT_SIMULATIONS = 100_000
+DEFAULT_CHUNK_SIZE = 250_000
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+
+def sample_years(
+    rng: np.random.Generator,
+    size: int,
+    planned_annual_revenue: float,
+    unpaid_vacation_days: float = 0,
+    mean_unpaid_sick_days: float = 0.0,
+    mean_unbilled_days: float = 0.0,
+    day_rate_volatility: float = 0.0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+) -> dict:
+    """Draw ``size`` years: revenue and unpaid vacation / sick days of each."""
+    sick_days = rng.poisson(mean_unpaid_sick_days, size).astype(float)
+    unbilled_days = rng.poisson(mean_unbilled_days, size).astype(float)
+    if day_rate_volatility > 0:
+        rate_factor = rng.lognormal(-day_rate_volatility ** 2 / 2, day_rate_volatility, size)
+    else:
+        rate_factor = np.ones(size)
+    # A year has only so many working days; sick days are cut first
+    vacation_days = np.minimum(unpaid_vacation_days + unbilled_days, work_days_per_year_input)
+    sick_days = np.minimum(sick_days, work_days_per_year_input - vacation_days)
+    if work_days_per_year_input > 0:
+        earning_days_ratio = (work_days_per_year_input - vacation_days - sick_days) / work_days_per_year_input
+    else:
+        earning_days_ratio = np.zeros(size)
+    return {
+        "gross_annual_revenue": planned_annual_revenue * earning_days_ratio * rate_factor,
+        "actual_unpaid_vacation_days_taken": vacation_days,
+        "actual_unpaid_sick_days_taken": sick_days,
+    }
+
+
+def _net_monthly_income(years: dict, regime: dict, work_days_per_year_input: int, tax_year: int) -> np.ndarray:
+    """Net monthly income of sampled years; NaN where the calculation rejects the year."""
+    if regime.get("pausalni_dan_band") is not None:
+        results = calculate_ico_pausalni_dan_income_arrays(
+            pausalni_dan_band=regime["pausalni_dan_band"], work_days_per_year_input=work_days_per_year_input,
+            tax_year=tax_year, **years,
+        )
+        return results["cisty_mesicni_prijem"]
+    results = calculate_ico_pausalni_vydaje_income_arrays(
+        work_days_per_year_input=work_days_per_year_input, tax_year=tax_year, **regime, **years,
+    )
+    return results["cisty_mesicni_prijem_disponibilni_po_realnych_nakladech"]
+
+
+def _simulate_chunk(seed: np.random.SeedSequence, size: int, sampling: dict, regime: dict,
+                    work_days_per_year_input: int, tax_year: int) -> np.ndarray:
+    years = sample_years(np.random.default_rng(seed), size, work_days_per_year_input=work_days_per_year_input, **sampling)
+    return _net_monthly_income(years, regime, work_days_per_year_input, tax_year)
+
+
+def simulate_ico_income(
+    planned_annual_revenue: float,
+    expense_percentage: float | None = None,
+    pausalni_dan_band: int | None = None,
+    realne_rocni_provozni_naklady: float = 0.0,
+    other_annual_tax_credits: float = 0.0,
+    participate_sickness_insurance: bool = False,
+    sickness_insurance_assessment_base_monthly: float | None = None,
+    unpaid_vacation_days: float = 0,
+    mean_unpaid_sick_days: float = 0.0,
+    mean_unbilled_days: float = 0.0,
+    day_rate_volatility: float = 0.0,
+    hpp_net_monthly_income: float | None = None,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+    simulations: int = DEFAULT_SIMULATIONS,
+    seed: int | None = None,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    return_samples: bool = False,
+) -> dict:
+    """Distribution of the IČO net monthly income over ``simulations`` random years.
+
+    Percentiles, mean and the probability of beating ``hpp_net_monthly_income``
+    are taken over the valid years. Years that paušální daň does not allow
+    (revenue over its limit) are only counted in ``podil_neplatnych``; when the
+year with every input at its mean is such a year, the deterministic figure
+is None. The
+    ``seed`` entry repeats the seed, or the drawn entropy when none was given.
+    """
+    if (expense_percentage is None) == (pausalni_dan_band is None):
+        raise ValueError("Zadejte buď procento paušálních výdajů, nebo pásmo paušální daně.")
+    if simulations < 1 or chunk_size < 1 or workers < 1:
+        raise ValueError("Počet simulací, velikost bloku i počet procesů musí být alespoň 1.")
+    if pausalni_dan_band is not None:
+        regime = {"pausalni_dan_band": pausalni_dan_band}
+    else:
+        regime = {
+            "expense_percentage": expense_percentage,
+            "realne_rocni_provozni_naklady": realne_rocni_provozni_naklady,
+            "other_annual_tax_credits": other_annual_tax_credits,
+            "participate_sickness_insurance": participate_sickness_insurance,
+            "sickness_insurance_assessment_base_monthly": sickness_insurance_assessment_base_monthly,
+        }
+    sampling = dict(
+        planned_annual_revenue=planned_annual_revenue,
+        unpaid_vacation_days=unpaid_vacation_days,
+        mean_unpaid_sick_days=mean_unpaid_sick_days,
+        mean_unbilled_days=mean_unbilled_days,
+        day_rate_volatility=day_rate_volatility,
+    )
+
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = [min(chunk_size, simulations - start) for start in range(0, simulations, chunk_size)]
+    chunk_seeds = seed_sequence.spawn(len(sizes))
+    common = (sampling, regime, work_days_per_year_input, tax_year)
+    if workers > 1 and len(sizes) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, chunk_seeds, sizes, *([value] * len(sizes) for value in common)))
+    else:
+        chunks = [_simulate_chunk(chunk_seed, size, *common) for chunk_seed, size in zip(chunk_seeds, sizes)]
+    samples = np.concatenate(chunks)
+
+    valid = samples[~np.isnan(samples)]
+    # The app's fixed-days figure: every random input at its mean
+    days_not_earning = unpaid_vacation_days + mean_unbilled_days + mean_unpaid_sick_days
+    earning_days_ratio = max(0, work_days_per_year_input - days_not_earning) / work_days_per_year_input if work_days_per_year_input > 0 else 0
+    deterministic_years = {
+        "gross_annual_revenue": np.array([planned_annual_revenue * earning_days_ratio]),
+        "actual_unpaid_vacation_days_taken": np.array([unpaid_vacation_days + mean_unbilled_days]),
+        "actual_unpaid_sick_days_taken": np.array([mean_unpaid_sick_days]),
+    }
+    deterministic = float(_net_monthly_income(deterministic_years, regime, work_days_per_year_input, tax_year)[0])
+    result = {
+        "pocet_simulaci": simulations,
+        "seed": seed_sequence.entropy,
+        "podil_neplatnych": round(1 - valid.size / samples.size, 6),
+        "deterministicky_cisty_mesicni_prijem": None if math.isnan(deterministic) else round(deterministic, 2),
+        "prumer": round(float(valid.mean()), 2) if valid.size else None,
+        "smerodatna_odchylka": round(float(valid.std()), 2) if valid.size else None,
+        "percentily": (
+            {p: round(float(value), 2) for p, value in zip(PERCENTILES, np.percentile(valid, PERCENTILES))}
+            if valid.size else {}
+        ),
+    }
+    if hpp_net_monthly_income is not None:
+        result["hpp_cisty_mesicni_prijem"] = hpp_net_monthly_income
+        result["pravdepodobnost_lepsi_nez_hpp"] = (
+            round(float(np.mean(valid > hpp_net_monthly_income)), 6) if valid.size else None
+        )
+    if return_samples:
+        result["vzorky"] = samples
+    return result
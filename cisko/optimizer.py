@@ -0,0 +1,122 @@
+"""Optimal IČO regime: rank every legal paušální výdaje / paušální daň variant.
+
+All expense percentages go through a single batch call. Profit, assessment
+bases, insurance and tax are computed once per percentage. The voluntary
+sickness insurance does not change the tax base, so the "+ nemocenské"
+variants only subtract the premium, which is computed once. The paušální daň
+bands share one batch call as well.
+
+Band eligibility comes from the year's ``pausalni_dan_band_limits`` in
+tax_params.json. For 2023-2026 these are:
+
+* band 1: revenue up to 1M CZK, or up to 1.5M CZK with the 80 % / 60 %
+  expense lump sum, or up to 2M CZK with the 80 % one;
+* band 2: revenue up to 1.5M CZK, or up to 2M CZK with the 80 % / 60 % lump sum;
+* band 3: revenue up to the paušální daň limit (2M CZK).
+
+When ``activity_expense_percentage`` (the lump sum the activity qualifies for)
+is not given, all percentages are evaluated and bands are checked against
+the limits open to any activity only, i.e. 1M / 1.5M / 2M CZK.
+"""
+
+import numpy as np
+
+from cisko.batch import calculate_ico_pausalni_dan_income_batch, calculate_ico_pausalni_vydaje_income_batch
+from cisko.engine import DEFAULT_WORK_DAYS_PER_YEAR
+from cisko.params import DEFAULT_TAX_YEAR, TaxParams, get_tax_params
+
+
+def band_is_eligible(p: TaxParams, band: int, revenue: float, activity_expense_percentage: float | None = None) -> bool:
+    if revenue > p.pausalni_dan_max_revenue:
+        return False
+    for revenue_limit, expense_percentages in p.pausalni_dan_band_limits[band]:
+        if revenue <= revenue_limit and (
+            expense_percentages is None
+            or (activity_expense_percentage is not None and activity_expense_percentage in expense_percentages)
+        ):
+            return True
+    return False
+
+
+def rank_regimes(
+    gross_annual_revenue: float,
+    realne_rocni_provozni_naklady: float = 0.0,
+    other_annual_tax_credits: float = 0.0,
+    activity_expense_percentage: float | None = None,
+    sickness_insurance_assessment_base_monthly: float | None = None,
+    actual_unpaid_vacation_days_taken: int = 0,
+    actual_unpaid_sick_days_taken: int = 0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> list:
+    """Legal IČO variants ranked by disposable net income, best first.
+
+    Each row has ``rezim``, ``procento_pausalnich_vydaju``, ``nemocenske``,
+    ``pasmo_pausalni_dane``, ``rocni_odvody_a_dan``,
+    ``cisty_rocni_prijem_disponibilni``, ``cisty_mesicni_prijem_disponibilni``,
+    ``rozdil_oproti_nejlepsimu`` (monthly) and ``nejlepsi``. Real costs are
+    subtracted in every mode, so paušální daň rows compare like for like.
+    """
+    p = get_tax_params(tax_year)
+    if gross_annual_revenue < 0:
+        raise ValueError("Hrubý roční příjem (obrat) nemůže být záporný.")
+    days = dict(
+        actual_unpaid_vacation_days_taken=actual_unpaid_vacation_days_taken,
+        actual_unpaid_sick_days_taken=actual_unpaid_sick_days_taken,
+        work_days_per_year_input=work_days_per_year_input,
+        tax_year=tax_year,
+    )
+    rows = []
+
+    if activity_expense_percentage is None:
+        expense_percentages = np.array(sorted(p.expense_caps, reverse=True))
+    else:
+        expense_percentages = np.array([activity_expense_percentage])
+    vydaje = calculate_ico_pausalni_vydaje_income_batch(
+        gross_annual_revenue, expense_percentages,
+        realne_rocni_provozni_naklady=realne_rocni_provozni_naklady,
+        other_annual_tax_credits=other_annual_tax_credits,
+        **days,
+    )
+    if sickness_insurance_assessment_base_monthly is None:
+        sickness_insurance_assessment_base_monthly = p.min_ico_sickness_assessment_base_monthly
+    monthly_sickness_payment = max(sickness_insurance_assessment_base_monthly, p.min_ico_sickness_assessment_base_monthly) * p.ico_sickness_insurance_rate
+    annual_sickness_insurance = max(monthly_sickness_payment, p.ico_min_sickness_monthly) * 12 if gross_annual_revenue > 0 else 0.0
+    for i, expense_percentage in enumerate(expense_percentages):
+        if vydaje["error"][i] is not None:
+            continue
+        deductions = (vydaje["rocni_socialni_pojisteni"][i] + vydaje["rocni_zdravotni_pojisteni"][i]
+                      + vydaje["konecna_rocni_dan_z_prijmu"][i])
+        net_annual = vydaje["cisty_rocni_prijem_disponibilni_po_realnych_nakladech"][i]
+        for sickness in (False, True):
+            rows.append({
+                "rezim": f"Paušální výdaje {int(expense_percentage * 100)}%" + (" + nemocenské" if sickness else ""),
+                "procento_pausalnich_vydaju": float(expense_percentage),
+                "nemocenske": sickness,
+                "pasmo_pausalni_dane": None,
+                "rocni_odvody_a_dan": float(deductions + (annual_sickness_insurance if sickness else 0.0)),
+                "cisty_rocni_prijem_disponibilni": float(net_annual - (annual_sickness_insurance if sickness else 0.0)),
+            })
+
+    bands = [band for band in sorted(p.pausalni_dan_bands_monthly)
+             if band_is_eligible(p, band, gross_annual_revenue, activity_expense_percentage)]
+    if bands:
+        dan = calculate_ico_pausalni_dan_income_batch(gross_annual_revenue, np.array(bands), **days)
+        for i, band in enumerate(bands):
+            rows.append({
+                "rezim": f"Paušální daň {band}. pásmo",
+                "procento_pausalnich_vydaju": None,
+                "nemocenske": False,
+                "pasmo_pausalni_dane": band,
+                "rocni_odvody_a_dan": float(dan["mesicni_platba_pausalni_dane"][i] * 12),
+                "cisty_rocni_prijem_disponibilni": float(dan["cisty_rocni_prijem"][i] - realne_rocni_provozni_naklady),
+            })
+
+    rows.sort(key=lambda row: row["cisty_rocni_prijem_disponibilni"], reverse=True)
+    for row in rows:
+        row["cisty_rocni_prijem_disponibilni"] = round(row["cisty_rocni_prijem_disponibilni"], 2)
+        row["rocni_odvody_a_dan"] = round(row["rocni_odvody_a_dan"], 2)
+        row["cisty_mesicni_prijem_disponibilni"] = round(row["cisty_rocni_prijem_disponibilni"] / 12, 2)
+        row["rozdil_oproti_nejlepsimu"] = round((row["cisty_rocni_prijem_disponibilni"] - rows[0]["cisty_rocni_prijem_disponibilni"]) / 12, 2)
+        row["nejlepsi"] = row is rows[0]
+    return rows
@@ -0,0 +1,114 @@
+"""Year-indexed tax parameters (Czech Republic).
+
+All rates, minimums and caps live in ``tax_params.json`` next to this module,
+one entry per tax year. The file is read once, on first use, into immutable
+``TaxParams`` objects, so calculations do plain attribute lookups.
+Sources for updates: Ministry of Finance CZ (mfcr.cz),
+Czech Social Security Administration (cssz.cz), Health Insurance Companies (e.g., VZP).
+"""
+
+import json
+from pathlib import Path
+from types import MappingProxyType
+
+TAX_PARAMS_FILE = Path(__file__).with_name("tax_params.json")
+DEFAULT_TAX_YEAR = 2024
+
+
+class TaxParams:
+    """Read-only parameter set for one tax year."""
+
+    __slots__ = (
+        "year",
+        # --- General ---
+        "personal_tax_credit_annual",
+        "income_tax_threshold_annual",
+        "income_tax_rate_lower",
+        "income_tax_rate_higher",
+        # --- HPP ---
+        "hpp_health_insurance_rate_employee",
+        "hpp_social_security_rate_employee",
+        "hpp_health_insurance_rate_employer",
+        "hpp_social_security_rate_employer",
+        # --- IČO ---
+        "ico_social_security_rate",
+        "ico_health_insurance_rate",
+        "ico_sickness_insurance_rate",
+        "ico_profit_assessment_base_factor",
+        "ico_min_social_monthly_main_activity",
+        "ico_min_health_monthly",
+        "ico_min_sickness_monthly",
+        "min_ico_sickness_assessment_base_monthly",
+        "min_social_assessment_base_annual",
+        "min_health_assessment_base_annual",
+        "max_revenue_for_lump_sum",
+        "expense_caps",  # expense percentage -> max annual expense claim
+        "pausalni_dan_bands_monthly",  # band number -> monthly payment
+        "pausalni_dan_band_limits",  # band number -> ((revenue limit, qualifying expense percentages or None = any), ...)
+        "pausalni_dan_max_revenue",
+        # --- Derived once at load time ---
+        "income_tax_at_threshold",
+        "ico_min_social_annual",
+        "ico_min_health_annual",
+    )
+
+    def __init__(self, year: int, **values):
+        set_attr = object.__setattr__
+        set_attr(self, "year", year)
+        for name, value in values.items():
+            set_attr(self, name, value)
+        set_attr(self, "expense_caps", MappingProxyType(
+            {float(percentage): float(cap) for percentage, cap in values["expense_caps"].items()}
+        ))
+        set_attr(self, "pausalni_dan_bands_monthly", MappingProxyType(
+            {int(band): float(payment) for band, payment in values["pausalni_dan_bands_monthly"].items()}
+        ))
+        set_attr(self, "pausalni_dan_band_limits", MappingProxyType({
+            int(band): tuple(
+                (float(revenue_limit), None if percentages is None else tuple(float(x) for x in percentages))
+                for revenue_limit, percentages in limits
+            )
+            for band, limits in values["pausalni_dan_band_limits"].items()
+        }))
+        set_attr(self, "income_tax_at_threshold", self.income_tax_threshold_annual * self.income_tax_rate_lower)
+        set_attr(self, "ico_min_social_annual", self.ico_min_social_monthly_main_activity * 12)
+        set_attr(self, "ico_min_health_annual", self.ico_min_health_monthly * 12)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"TaxParams for {self.year} are read-only.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"TaxParams for {self.year} are read-only.")
+
+    def __repr__(self) -> str:
+        return f"TaxParams(year={self.year})"
+
+
+_registry = None
+
+
+def load_tax_params(path: Path = TAX_PARAMS_FILE) -> dict:
+    """Parse a parameter file into ``{year: TaxParams}``."""
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    return {int(year): TaxParams(int(year), **values) for year, values in raw.items()}
+
+
+def _get_registry() -> dict:
+    global _registry
+    if _registry is None:
+        _registry = load_tax_params()
+    return _registry
+
+
+def available_tax_years() -> tuple:
+    return tuple(sorted(_get_registry()))
+
+
+def get_tax_params(tax_year: int = DEFAULT_TAX_YEAR) -> TaxParams:
+    try:
+        return _get_registry()[tax_year]
+    except KeyError:
+        raise ValueError(
+            f"Pro rok {tax_year} nejsou k dispozici daňové parametry (dostupné: {', '.join(map(str, available_tax_years()))})."
+        ) from None
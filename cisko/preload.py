@@ -0,0 +1,56 @@
+"""Background import of the heavy modules the page needs only after a click.
+
+The first render of the page (the form) needs none of pandas, pyarrow and
+altair, but every table and chart does: Streamlit converts any chart or table
+data to an Arrow table through pandas. Imported on the first click, they add
+about a second to it. The page calls ``preload_in_background()`` after its
+first render; a daemon thread then imports the modules once per process.
+``CISKO_PRELOAD=0`` turns this off, e.g. to measure the difference.
+
+A page that needs a module before the thread got to it simply imports it
+itself; Python's import lock makes it wait for the thread's import in progress
+instead of importing twice.
+"""
+
+import importlib
+import os
+import threading
+import time
+
+ENABLE_ENV_VAR = "CISKO_PRELOAD"
+HEAVY_MODULES = ("pandas", "pyarrow", "altair")
+
+_lock = threading.Lock()
+_thread = None
+_import_seconds = {}  # module -> seconds its import took in the preload thread, None if it failed
+
+
+def _import_modules(modules: tuple) -> None:
+    for module in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            _import_seconds[module] = None
+        else:
+            _import_seconds[module] = time.perf_counter() - started
+
+
+def preload_in_background(modules: tuple = HEAVY_MODULES) -> threading.Thread | None:
+    """Start importing ``modules`` in a daemon thread; later calls return the same thread.
+
+    Returns None when preloading is turned off.
+    """
+    global _thread
+    if os.environ.get(ENABLE_ENV_VAR, "1").strip().lower() in ("0", "false", "no"):
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_import_modules, args=(tuple(modules),), name="cisko-preload", daemon=True)
+            _thread.start()
+        return _thread
+
+
+def preload_status() -> dict:
+    """Module -> import time in seconds, for the modules the preload thread has finished."""
+    return dict(_import_seconds)
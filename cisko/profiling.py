@@ -0,0 +1,265 @@
+"""Opt-in timing of the phases of each Streamlit rerun.
+
+Set ``CISKO_PROFILE=1`` to enable it; ``CISKO_METRICS_FILE=path`` also appends
+one JSON line per rerun to that file. The page marks the end of each phase:
+
+    rerun = PROFILER.start_rerun(session_id)
+    ...  # widgets
+    rerun.checkpoint("vstupy")
+    ...  # calculate_* calls
+    rerun.checkpoint("vypocet")
+    rerun.finish()
+
+A checkpoint charges the time since the previous one to the named phase, so
+the page needs no extra indentation. A phase marked several times in one
+rerun is summed. When profiling is disabled, ``start_rerun`` returns a shared
+object whose methods do nothing.
+
+A rerun that ends before ``finish()`` (``st.stop``, ``st.rerun``, an
+exception) is recorded as interrupted when the session's next rerun starts:
+its phases up to the last checkpoint count, its total does not. A rerun of a
+single fragment does not run the page script, so the fragment times itself:
+
+    with PROFILER.start_fragment_rerun(session_id, "cashflow"):
+        ...  # the fragment body
+
+Only the last ``MAX_SESSIONS`` active sessions are tracked; the per-phase
+aggregates cover every rerun.
+
+Summarize a metrics file with ``python -m cisko.profiling METRICS_FILE``.
+"""
+
+import collections
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+ENABLE_ENV_VAR = "CISKO_PROFILE"
+METRICS_FILE_ENV_VAR = "CISKO_METRICS_FILE"
+# Durations kept per phase for the percentiles; counts and totals cover every rerun
+RECENT_DURATIONS = 1000
+# Sessions whose rerun count and last rerun are kept, least recently active dropped first
+MAX_SESSIONS = 1000
+
+
+class _DisabledRerun:
+    __slots__ = ()
+
+    def checkpoint(self, phase: str) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        pass
+
+
+_DISABLED_RERUN = _DisabledRerun()
+
+
+class Rerun:
+    """Phase timings of one rerun of one session, or of one fragment when ``fragment`` names it.
+
+    As a context manager (fragment reruns) it records itself on exit, as
+    interrupted when the body raised.
+    """
+
+    __slots__ = ("profiler", "session_id", "fragment", "phases", "started", "last")
+
+    def __init__(self, profiler: "Profiler", session_id: str, fragment: str | None = None):
+        self.profiler = profiler
+        self.session_id = session_id
+        self.fragment = fragment
+        self.phases = {}
+        self.started = self.last = time.perf_counter()
+
+    def checkpoint(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self.last)
+        self.last = now
+
+    def finish(self) -> None:
+        self.profiler.record(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if self.fragment is not None:
+            self.checkpoint(self.fragment)
+        self.profiler.record(self, complete=exc_type is None)
+
+
+class _Session:
+    __slots__ = ("reruns", "last_rerun", "active")
+
+    def __init__(self):
+        self.reruns = 0
+        self.last_rerun = None  # phase durations (ms) of the last finished page rerun
+        self.active = None  # the page rerun started but not finished yet
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+class Profiler:
+    """Process-wide aggregates of the rerun timings, shared by all sessions."""
+
+    def __init__(self, enabled: bool = False, metrics_file: Path | None = None):
+        self.enabled = enabled
+        self.metrics_file = Path(metrics_file) if metrics_file else None
+        self._lock = threading.Lock()
+        self._counts = collections.Counter()
+        self._totals = collections.Counter()
+        self._maxima = {}
+        self._recent = collections.defaultdict(lambda: collections.deque(maxlen=RECENT_DURATIONS))
+        self._sessions = collections.OrderedDict()  # session id -> _Session, least recently active first
+        self._reruns = 0
+        self._fragment_reruns = 0
+        self._interrupted = 0
+
+    @classmethod
+    def from_environment(cls) -> "Profiler":
+        enabled = os.environ.get(ENABLE_ENV_VAR, "").strip().lower() not in ("", "0", "false", "no")
+        return cls(enabled, os.environ.get(METRICS_FILE_ENV_VAR) or None)
+
+    def start_rerun(self, session_id: str):
+        if not self.enabled:
+            return _DISABLED_RERUN
+        rerun = Rerun(self, session_id)
+        with self._lock:
+            session = self._session(session_id)
+            interrupted, session.active = session.active, rerun
+        if interrupted is not None:
+            self.record(interrupted, complete=False)
+        return rerun
+
+    def start_fragment_rerun(self, session_id: str, fragment: str):
+        """Context manager timing a rerun of only the named fragment."""
+        return Rerun(self, session_id, fragment) if self.enabled else _DISABLED_RERUN
+
+    def _session(self, session_id: str) -> _Session:
+        # Called with the lock held
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session()
+            if len(self._sessions) > MAX_SESSIONS:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def record(self, rerun: Rerun, complete: bool = True) -> None:
+        phases_ms = {phase: seconds * 1000 for phase, seconds in rerun.phases.items()}
+        if complete and rerun.fragment is None:
+            phases_ms["celkem"] = (rerun.last - rerun.started) * 1000
+        with self._lock:
+            session = self._session(rerun.session_id)
+            session.reruns += 1
+            if rerun.fragment is not None:
+                self._fragment_reruns += 1
+            else:
+                self._reruns += 1
+                if session.active is rerun:
+                    session.active = None
+            if not complete:
+                self._interrupted += 1
+            elif rerun.fragment is None:
+                session.last_rerun = phases_ms
+            for phase, ms in phases_ms.items():
+                self._counts[phase] += 1
+                self._totals[phase] += ms
+                self._maxima[phase] = max(self._maxima.get(phase, 0.0), ms)
+                self._recent[phase].append(ms)
+            if self.metrics_file is not None:
+                line = {
+                    "cas": time.time(),
+                    "session": rerun.session_id,
+                    "rerun": session.reruns,
+                    "faze_ms": {phase: round(ms, 3) for phase, ms in phases_ms.items()},
+                }
+                if rerun.fragment is not None:
+                    line["fragment"] = rerun.fragment
+                if not complete:
+                    line["preruseno"] = True
+                with self.metrics_file.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+    def reruns(self, session_id: str) -> int:
+        """Recorded reruns (page and fragment) of a session; 0 once it is no longer tracked."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return session.reruns if session is not None else 0
+
+    def last_rerun(self, session_id: str) -> dict | None:
+        """Phase durations (ms) of the session's last finished page rerun."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return session.last_rerun if session is not None else None
+
+    def summary(self) -> list:
+        """One dict per phase, in the order the phases were first seen: count and ms statistics."""
+        with self._lock:
+            rows = []
+            for phase, count in self._counts.items():
+                recent = sorted(self._recent[phase])
+                rows.append({
+                    "faze": phase,
+                    "pocet": count,
+                    "prumer_ms": round(self._totals[phase] / count, 3),
+                    "p50_ms": round(_percentile(recent, 50), 3),
+                    "p95_ms": round(_percentile(recent, 95), 3),
+                    "max_ms": round(self._maxima[phase], 3),
+                })
+            return rows
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "relace": len(self._sessions),
+                "behy": self._reruns,
+                "behy_fragmentu": self._fragment_reruns,
+                "prerusene_behy": self._interrupted,
+            }
+
+
+PROFILER = Profiler.from_environment()
+
+
+def summarize_metrics_file(path: Path) -> list:
+    """Rebuild the per-phase summary from a metrics file."""
+    profiler = Profiler(enabled=True)
+    with Path(path).open(encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            rerun = Rerun(profiler, entry["session"], entry.get("fragment"))
+            phases_ms = dict(entry["faze_ms"])
+            total_ms = phases_ms.pop("celkem", sum(phases_ms.values()))
+            rerun.phases = {phase: ms / 1000 for phase, ms in phases_ms.items()}
+            rerun.last = rerun.started + total_ms / 1000
+            profiler.record(rerun, complete=not entry.get("preruseno", False))
+    return profiler.summary()
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Použití: python -m cisko.profiling METRICS_FILE", file=sys.stderr)
+        return 2
+    rows = summarize_metrics_file(Path(argv[0]))
+    print("\t".join(("Fáze", "Počet", "Průměr ms", "p50 ms", "p95 ms", "Max ms")))
+    for row in rows:
+        print("\t".join([row["faze"], str(row["pocet"])] + [f"{row[key]:.1f}" for key in ("prumer_ms", "p50_ms", "p95_ms", "max_ms")]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
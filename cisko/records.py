@@ -0,0 +1,189 @@
+"""Compact result records of the calculate_* functions.
+
+A record keeps the unrounded values of one calculation in a tuple inside a
+read-only ``__slots__`` object, instead of a dict of rounded values with two
+nested dicts. The unrounded values are attributes named like the dict keys
+(``record.cisty_mesicni_prijem_zamestnanec``).
+
+A record is also a read-only Mapping that shows the legacy dict. So
+``record["typ"]``, ``record.get("info_k_realnym_nakladum", {})`` and
+``"error" in record`` behave as on the dict the calculate_* function returns.
+Values are rounded, and nested dicts built, only for the keys that are read.
+``as_dict()`` builds the whole legacy dict, equal to the calculate_* result.
+"""
+
+from collections.abc import Mapping
+
+
+class CalculationResult(Mapping):
+    """Base class; subclasses declare ``TYP``, ``FIELDS``, ``NESTED`` and ``NOT_ROUNDED``."""
+
+    __slots__ = ("tax_year", "values", "error")
+
+    TYP = ""
+    FIELDS = ()  # every leaf key of the legacy dict, in its order
+    NESTED = {}  # nested dict key -> its leaf keys
+    NOT_ROUNDED = frozenset()  # leaf keys the legacy dict reports as they are
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        nested_fields = {name for names in cls.NESTED.values() for name in names}
+        index = {name: i for i, name in enumerate(cls.FIELDS)}
+        cls._INDEX = index
+        cls._TOP_LAYOUT = tuple(
+            (name, index[name], name not in cls.NOT_ROUNDED) for name in cls.FIELDS if name not in nested_fields
+        )
+        cls._NESTED_LAYOUT = tuple(
+            (key, tuple((name, index[name], name not in cls.NOT_ROUNDED) for name in names))
+            for key, names in cls.NESTED.items()
+        )
+        cls._TOP_FIELDS = frozenset(name for name, _, _ in cls._TOP_LAYOUT)
+        cls._KEYS = ("typ", "rok_kalkulace") + tuple(name for name, _, _ in cls._TOP_LAYOUT) + tuple(cls.NESTED)
+
+    def __init__(self, tax_year: int, values: tuple = (), error: str | None = None):
+        set_attr = object.__setattr__
+        set_attr(self, "tax_year", tax_year)
+        set_attr(self, "values", values)
+        set_attr(self, "error", error)
+
+    @classmethod
+    def failed(cls, tax_year: int, error: str) -> "CalculationResult":
+        return cls(tax_year, (), error)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def __reduce__(self):
+        return type(self), (self.tax_year, self.values, self.error)
+
+    def __getattr__(self, name):
+        # Only reached for names that are not slots: unrounded field values
+        index = self._INDEX.get(name)
+        if index is None or self.error is not None:
+            raise AttributeError(name)
+        return self.values[index]
+
+    def _legacy_value(self, index: int, rounded: bool):
+        value = self.values[index]
+        return round(value, 2) if rounded else value
+
+    def __getitem__(self, key):
+        if self.error is not None:
+            if key == "error":
+                return self.error
+            raise KeyError(key)
+        if key == "typ":
+            return self.TYP
+        if key == "rok_kalkulace":
+            return self.tax_year
+        if key in self._TOP_FIELDS:
+            return self._legacy_value(self._INDEX[key], key not in self.NOT_ROUNDED)
+        for nested_key, layout in self._NESTED_LAYOUT:
+            if nested_key == key:
+                return {name: self._legacy_value(index, rounded) for name, index, rounded in layout}
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(("error",) if self.error is not None else self._KEYS)
+
+    def __len__(self) -> int:
+        return 1 if self.error is not None else len(self._KEYS)
+
+    def as_dict(self) -> dict:
+        """The legacy result dict, as returned by the calculate_* function."""
+        if self.error is not None:
+            return {"error": self.error}
+        values = self.values
+        result = {"typ": self.TYP, "rok_kalkulace": self.tax_year}
+        for name, index, rounded in self._TOP_LAYOUT:
+            result[name] = round(values[index], 2) if rounded else values[index]
+        for key, layout in self._NESTED_LAYOUT:
+            result[key] = {name: round(values[index], 2) if rounded else values[index] for name, index, rounded in layout}
+        return result
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+
+class HppResult(CalculationResult):
+    __slots__ = ()
+    TYP = "HPP (Zaměstnanec)"
+    FIELDS = (
+        "hruby_mesicni_prijem",
+        "hruby_rocni_prijem",
+        "zamestnanec_rocni_zdravotni_pojisteni",
+        "zamestnanec_rocni_socialni_pojisteni",
+        "zamestnanec_konecna_rocni_dan_z_prijmu",
+        "cisty_rocni_prijem_zamestnanec",
+        "cisty_mesicni_prijem_zamestnanec",
+        "cisty_denni_prijem_zamestnanec",
+        "zamestnavatel_celkove_rocni_naklady_na_zamestnance",
+        "zamestnavatel_celkove_mesicni_naklady_na_zamestnance",
+    )
+
+
+class IcoPausalniVydajeResult(CalculationResult):
+    __slots__ = ()
+    TYP = "IČO (Paušální výdaje)"
+    FIELDS = (
+        "hruby_rocni_prijem_obrat",
+        "hruby_mesicni_prijem_obrat_prumer",
+        "procento_pausalnich_vydaju",
+        "rocni_pausalni_vydaje_pro_dane",
+        "zisk_pro_danove_ucely",
+        "rocni_socialni_pojisteni",
+        "rocni_zdravotni_pojisteni",
+        "rocni_nemocenske_pojisteni",
+        "konecna_rocni_dan_z_prijmu",
+        "cisty_rocni_prijem_dle_pausalu",
+        "cisty_mesicni_prijem_dle_pausalu",
+        "cisty_denni_prijem_dle_pausalu_efektivni",
+        "vstup_realne_rocni_provozni_naklady",
+        "cisty_rocni_prijem_disponibilni_po_realnych_nakladech",
+        "cisty_mesicni_prijem_disponibilni_po_realnych_nakladech",
+        "cisty_denni_prijem_disponibilni_efektivni",
+        "uvazovane_pracovni_dny_pro_denni_sazbu",
+        "paid_vacation_days_by_client",
+        "paid_sick_days_by_client",
+    )
+    NESTED = {
+        "info_k_realnym_nakladum": (
+            "vstup_realne_rocni_provozni_naklady",
+            "cisty_rocni_prijem_disponibilni_po_realnych_nakladech",
+            "cisty_mesicni_prijem_disponibilni_po_realnych_nakladech",
+            "cisty_denni_prijem_disponibilni_efektivni",
+        ),
+        "info_k_efektivite_dnu": (
+            "uvazovane_pracovni_dny_pro_denni_sazbu",
+            "paid_vacation_days_by_client",
+            "paid_sick_days_by_client",
+        ),
+    }
+    NOT_ROUNDED = frozenset((
+        "procento_pausalnich_vydaju",
+        "uvazovane_pracovni_dny_pro_denni_sazbu",
+        "paid_vacation_days_by_client",
+        "paid_sick_days_by_client",
+    ))
+
+
+class IcoPausalniDanResult(CalculationResult):
+    __slots__ = ()
+    TYP = "IČO (Paušální daň)"
+    FIELDS = (
+        "hruby_rocni_prijem_obrat",
+        "hruby_mesicni_prijem_obrat_prumer",
+        "zvolene_pasmo_pausalni_dane",  # the band, or "-" without revenue
+        "mesicni_platba_pausalni_dane",
+        "cisty_rocni_prijem",
+        "cisty_mesicni_prijem",
+        "cisty_denni_prijem_efektivni",
+        "uvazovane_pracovni_dny_pro_denni_sazbu",
+    )
+    NESTED = {
+        "info_k_efektivite_dnu": ("uvazovane_pracovni_dny_pro_denni_sazbu",),
+    }
+    NOT_ROUNDED = frozenset(("zvolene_pasmo_pausalni_dane", "uvazovane_pracovni_dny_pro_denni_sazbu"))
@@ -0,0 +1,459 @@
+"""Scenarios of the page as compact query parameters, stored with their results.
+
+A scenario is the dict of all sidebar, HPP and IČO inputs of the page
+(``SCENARIO_FIELDS``). ``encode_scenario`` turns it into short URL query
+parameters and leaves out the values equal to the defaults, so a permalink
+like ``?h=80000&m=1&b=2`` restores the whole page. ``decode_scenario`` is the
+inverse and skips invalid parameters, including values the page's widgets
+would not accept (``FIELD_LIMITS``, and the tax year's expense caps, bands
+and minimum sickness insurance base).
+
+``ScenarioStore`` keeps computed results in a SQLite file, keyed by the hash
+of the normalized scenario. Inputs a scenario's modes ignore (the band in the
+paušální výdaje mode, the daily rate when the monthly billing is entered, ...)
+are reset to their defaults before hashing, so equivalent scenarios share one
+entry. The hash also covers the tax parameter file and ``RESULTS_VERSION``,
+so results are recomputed after a parameter or engine change. Results are
+stored as the record values (cisko/records.py) and come back as records.
+Scenarios saved by the user get a name and are listed for the side-by-side
+comparison.
+"""
+
+import collections
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from cisko.batch import (
+    calculate_hpp_income_arrays,
+    calculate_ico_pausalni_dan_income_arrays,
+    calculate_ico_pausalni_vydaje_income_arrays,
+)
+from cisko.cache import (
+    MODE_HPP,
+    MODE_PAUSALNI_DAN,
+    MODE_PAUSALNI_VYDAJE,
+    cached_calculate_hpp_income_record,
+    cached_calculate_ico_pausalni_dan_income_record,
+    cached_calculate_ico_pausalni_vydaje_income_record,
+)
+from cisko.engine import DEFAULT_MANDAYS_PER_YEAR_ICO, DEFAULT_WORK_DAYS_PER_YEAR
+from cisko.params import DEFAULT_TAX_YEAR, TAX_PARAMS_FILE, available_tax_years, get_tax_params
+from cisko.records import HppResult, IcoPausalniDanResult, IcoPausalniVydajeResult
+
+# Bump when a change of the calculations makes stored results stale
+RESULTS_VERSION = 1
+
+DEFAULT_STORE_PATH = Path(os.environ.get("CISKO_STORE_PATH", "cisko_scenarios.sqlite3"))
+
+ICO_INPUT_PERIODS = ("Roční obrat", "Měsíční fakturace", "Denní sazba (man-day rate)")
+ICO_MODES = ("Paušální výdaje", "Paušální daň")
+
+# Scenario field -> (query parameter, type, default). Choice fields are
+# encoded as their index in the tuple of choices.
+SCENARIO_FIELDS = {
+    "tax_year": ("r", int, DEFAULT_TAX_YEAR),
+    "work_days_per_year_input": ("d", int, DEFAULT_WORK_DAYS_PER_YEAR),
+    "other_annual_tax_credits": ("s", float, 0.0),
+    "hpp_gross_monthly_income": ("h", float, 50000.0),
+    "ico_input_period": ("p", ICO_INPUT_PERIODS, "Měsíční fakturace"),
+    "ico_annual_revenue": ("o", float, 1200000.0),
+    "ico_monthly_billing": ("f", float, 100000.0),
+    "ico_daily_rate": ("ds", float, 5000.0),
+    "ico_mandays_per_year": ("md", int, DEFAULT_MANDAYS_PER_YEAR_ICO),
+    "ico_unpaid_vacation": ("uv", int, 20),
+    "ico_unpaid_sick": ("us", int, 5),
+    "ico_mode": ("m", ICO_MODES, "Paušální výdaje"),
+    "expense_percentage": ("e", float, 0.6),
+    "realne_rocni_provozni_naklady": ("n", float, 60000.0),
+    "participate_sickness_insurance": ("np", bool, False),
+    "sickness_insurance_assessment_base_monthly": ("nz", float, None),  # None = minimum for the tax year
+    "pausalni_dan_band": ("b", int, 1),
+}
+
+# (minimum, maximum) of the page's number inputs; a maximum naming a field is
+# that field's value, None is no maximum
+FIELD_LIMITS = {
+    "work_days_per_year_input": (200, 300),
+    "other_annual_tax_credits": (0.0, None),
+    "hpp_gross_monthly_income": (0.0, None),
+    "ico_annual_revenue": (0.0, None),
+    "ico_monthly_billing": (0.0, None),
+    "ico_daily_rate": (0.0, None),
+    "ico_mandays_per_year": (0, "work_days_per_year_input"),
+    "ico_unpaid_vacation": (0, "work_days_per_year_input"),
+    "ico_unpaid_sick": (0, "work_days_per_year_input"),
+    "realne_rocni_provozni_naklady": (0.0, None),
+}
+
+_CACHED_CALCULATIONS = {
+    MODE_HPP: cached_calculate_hpp_income_record,
+    MODE_PAUSALNI_VYDAJE: cached_calculate_ico_pausalni_vydaje_income_record,
+    MODE_PAUSALNI_DAN: cached_calculate_ico_pausalni_dan_income_record,
+}
+_ARRAYS_CALCULATIONS = {
+    MODE_HPP: calculate_hpp_income_arrays,
+    MODE_PAUSALNI_VYDAJE: calculate_ico_pausalni_vydaje_income_arrays,
+    MODE_PAUSALNI_DAN: calculate_ico_pausalni_dan_income_arrays,
+}
+_RECORD_TYPES = {cls.__name__: cls for cls in (HppResult, IcoPausalniVydajeResult, IcoPausalniDanResult)}
+
+
+_DEFAULT_SCENARIO = {name: default for name, (_, _, default) in SCENARIO_FIELDS.items()}
+_NUMERIC_FIELDS = tuple((name, kind) for name, (_, kind, _) in SCENARIO_FIELDS.items() if kind in (int, float))
+# Inputs each IČO input period and mode ignore
+_UNUSED_BY_INPUT_PERIOD = {
+    "Roční obrat": ("ico_monthly_billing", "ico_daily_rate", "ico_mandays_per_year"),
+    "Měsíční fakturace": ("ico_annual_revenue", "ico_daily_rate", "ico_mandays_per_year"),
+    "Denní sazba (man-day rate)": ("ico_annual_revenue", "ico_monthly_billing"),
+}
+_UNUSED_BY_PAUSALNI_DAN = ("expense_percentage", "realne_rocni_provozni_naklady", "participate_sickness_insurance",
+                           "sickness_insurance_assessment_base_monthly")
+
+
+def default_scenario() -> dict:
+    return dict(_DEFAULT_SCENARIO)
+
+
+def _encode_value(kind, value) -> str:
+    if isinstance(kind, tuple):
+        return str(kind.index(value))
+    if kind is bool:
+        return "1" if value else "0"
+    if kind is float and float(value).is_integer():
+        return str(int(value))
+    return repr(value) if kind is float else str(value)
+
+
+def _decode_value(kind, text: str):
+    if isinstance(kind, tuple):
+        index = int(text)
+        if index < 0:
+            raise IndexError(text)
+        return kind[index]
+    if kind is bool:
+        if text not in ("0", "1"):
+            raise ValueError(text)
+        return text == "1"
+    if kind is int:
+        return int(text)
+    value = float(text)
+    if value != value or value in (float("inf"), float("-inf")):
+        raise ValueError(text)
+    return value
+
+
+def _within_limits(name: str, value, scenario: dict) -> bool:
+    """Whether the page's widget for the field accepts the value, given the rest of the scenario."""
+    p = get_tax_params(scenario.get("tax_year", DEFAULT_TAX_YEAR))
+    if name == "expense_percentage":
+        return value in p.expense_caps
+    if name == "pausalni_dan_band":
+        return value in p.pausalni_dan_bands_monthly
+    if name == "sickness_insurance_assessment_base_monthly":
+        return value >= p.min_ico_sickness_assessment_base_monthly
+    if name not in FIELD_LIMITS:
+        return True
+    minimum, maximum = FIELD_LIMITS[name]
+    if isinstance(maximum, str):
+        maximum = scenario.get(maximum, _DEFAULT_SCENARIO[maximum])
+    return value >= minimum and (maximum is None or value <= maximum)
+
+
+def encode_scenario(scenario: dict) -> dict:
+    """Query parameters of a scenario; values equal to the defaults are left out."""
+    params = {}
+    for name, (key, kind, default) in SCENARIO_FIELDS.items():
+        value = scenario.get(name, default)
+        if value is not None and value != default:
+            params[key] = _encode_value(kind, value)
+    return params
+
+
+def decode_scenario(params) -> tuple:
+    """``(scenario, invalid)``: the scenario given by query parameters, and the keys that were skipped.
+
+    The scenario holds only the fields present in ``params``. A value outside
+    its widget's limits is skipped like a malformed one, since the page would
+    otherwise reset it to the default without a warning.
+    """
+    scenario = {}
+    invalid = []
+    for name, (key, kind, _) in SCENARIO_FIELDS.items():
+        if key not in params:
+            continue
+        try:
+            scenario[name] = _decode_value(kind, params[key])
+        except (ValueError, IndexError):
+            invalid.append(key)
+    if scenario.get("tax_year", DEFAULT_TAX_YEAR) not in available_tax_years():
+        scenario.pop("tax_year")
+        invalid.append(SCENARIO_FIELDS["tax_year"][0])
+    # In field order, so the work days are checked before the day counts limited by them
+    for name, value in list(scenario.items()):
+        if not _within_limits(name, value, scenario):
+            del scenario[name]
+            invalid.append(SCENARIO_FIELDS[name][0])
+    return scenario, invalid
+
+
+def normalize_scenario(scenario: dict) -> dict:
+    """All fields, with the ones the scenario's modes ignore reset to their defaults."""
+    normalized = {**_DEFAULT_SCENARIO, **scenario}
+    unused = _UNUSED_BY_INPUT_PERIOD[normalized["ico_input_period"]]
+    if normalized["ico_mode"] == "Paušální výdaje":
+        unused += ("pausalni_dan_band",)
+        if not normalized["participate_sickness_insurance"]:
+            unused += ("sickness_insurance_assessment_base_monthly",)
+    else:
+        unused += _UNUSED_BY_PAUSALNI_DAN
+    for name in unused:
+        normalized[name] = _DEFAULT_SCENARIO[name]
+    for name, kind in _NUMERIC_FIELDS:
+        value = normalized[name]
+        if value is not None:
+            normalized[name] = kind(value)
+    return normalized
+
+
+@functools.cache
+def _params_fingerprint() -> str:
+    return hashlib.sha256(TAX_PARAMS_FILE.read_bytes()).hexdigest()
+
+
+def scenario_hash(scenario: dict) -> str:
+    """Hash of the normalized scenario, the tax parameters and RESULTS_VERSION."""
+    payload = json.dumps(
+        [RESULTS_VERSION, _params_fingerprint(), normalize_scenario(scenario)], sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def ico_revenues(scenario: dict) -> tuple:
+    """(planned annual revenue, revenue after the unpaid days) of the IČO scenario, as on the page."""
+    return _ico_revenues(normalize_scenario(scenario))
+
+
+def _ico_revenues(scenario: dict) -> tuple:
+    period = scenario["ico_input_period"]
+    if period == "Roční obrat":
+        potential = scenario["ico_annual_revenue"]
+    elif period == "Měsíční fakturace":
+        potential = scenario["ico_monthly_billing"] * 12
+    else:
+        potential = scenario["ico_daily_rate"] * scenario["ico_mandays_per_year"]
+    work_days = scenario["work_days_per_year_input"]
+    days_not_earning = scenario["ico_unpaid_vacation"] + scenario["ico_unpaid_sick"]
+    earning_days_ratio = max(0, work_days - days_not_earning) / work_days if work_days > 0 else 0
+    return potential, potential * earning_days_ratio
+
+
+def _calculation_inputs(scenario: dict) -> tuple:
+    """``(hpp arguments, IČO mode, IČO arguments)`` of a normalized scenario, without the tax year."""
+    _, revenue = _ico_revenues(scenario)
+    days = dict(
+        actual_unpaid_vacation_days_taken=scenario["ico_unpaid_vacation"],
+        actual_unpaid_sick_days_taken=scenario["ico_unpaid_sick"],
+        work_days_per_year_input=scenario["work_days_per_year_input"],
+    )
+    hpp = dict(
+        gross_monthly_income=scenario["hpp_gross_monthly_income"],
+        other_annual_tax_credits=scenario["other_annual_tax_credits"],
+        work_days_per_year_input=scenario["work_days_per_year_input"],
+    )
+    if scenario["ico_mode"] == "Paušální výdaje":
+        return hpp, MODE_PAUSALNI_VYDAJE, dict(
+            gross_annual_revenue=revenue,
+            expense_percentage=scenario["expense_percentage"],
+            realne_rocni_provozni_naklady=scenario["realne_rocni_provozni_naklady"],
+            other_annual_tax_credits=scenario["other_annual_tax_credits"],
+            participate_sickness_insurance=scenario["participate_sickness_insurance"],
+            sickness_insurance_assessment_base_monthly=scenario["sickness_insurance_assessment_base_monthly"] or 0.0,
+            **days,
+        )
+    return hpp, MODE_PAUSALNI_DAN, dict(gross_annual_revenue=revenue, pausalni_dan_band=scenario["pausalni_dan_band"], **days)
+
+
+def calculate_scenario(scenario: dict) -> dict:
+    """``{"hpp": record, "ico": record}`` of a scenario, computed as the page computes them."""
+    scenario = normalize_scenario(scenario)
+    hpp, mode, ico = _calculation_inputs(scenario)
+    return {
+        "hpp": cached_calculate_hpp_income_record(**hpp, tax_year=scenario["tax_year"]),
+        "ico": _CACHED_CALCULATIONS[mode](**ico, tax_year=scenario["tax_year"]),
+    }
+
+
+def calculate_scenarios(scenarios: list) -> list:
+    """calculate_scenario for many scenarios in one batched pass.
+
+    The calculations are grouped by mode and tax year and each group is one
+    call of a batch function. Identical inputs are computed once, e.g. the
+    HPP side of configurations that differ only in the IČO settings, and
+    their scenarios share the record.
+    """
+    results = [{} for _ in scenarios]
+    # (mode, tax year) -> {calculation inputs: [(scenario index, result key)]}
+    groups = collections.defaultdict(dict)
+    for i, scenario in enumerate(scenarios):
+        scenario = normalize_scenario(scenario)
+        hpp, mode, ico = _calculation_inputs(scenario)
+        for key, calculation_mode, inputs in (("hpp", MODE_HPP, hpp), ("ico", mode, ico)):
+            groups[calculation_mode, scenario["tax_year"]].setdefault(tuple(inputs.items()), []).append((i, key))
+
+    for (mode, tax_year), targets_by_inputs in groups.items():
+        names = [name for name, _ in next(iter(targets_by_inputs))]
+        columns = zip(*([value for _, value in inputs] for inputs in targets_by_inputs))
+        arrays = _ARRAYS_CALCULATIONS[mode](
+            **{name: np.array(values) for name, values in zip(names, columns)}, tax_year=tax_year
+        )
+        for record, targets in zip(arrays.records(), targets_by_inputs.values()):
+            for i, key in targets:
+                results[i][key] = record
+    return results
+
+
+def _dump_results(results: dict) -> str:
+    return json.dumps({
+        key: {"type": type(record).__name__, "tax_year": record.tax_year, "values": record.values, "error": record.error}
+        for key, record in results.items()
+    }, ensure_ascii=False)
+
+
+def _load_results(text: str) -> dict:
+    results = {}
+    for key, state in json.loads(text).items():
+        record_type = _RECORD_TYPES[state["type"]]
+        results[key] = record_type(state["tax_year"], tuple(state["values"]), state["error"])
+    return results
+
+
+class ScenarioStore:
+    """SQLite file of computed scenarios, shared by all sessions and server processes."""
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS scenarios (
+                    input_hash TEXT PRIMARY KEY,
+                    params TEXT NOT NULL,
+                    results TEXT NOT NULL,
+                    name TEXT,
+                    created REAL NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS scenarios_named ON scenarios (name) WHERE name IS NOT NULL")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # One short-lived connection per operation: sessions run in separate threads
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def get(self, scenario: dict) -> dict | None:
+        with self._connect() as db:
+            row = db.execute("SELECT results FROM scenarios WHERE input_hash = ?", (scenario_hash(scenario),)).fetchone()
+        return None if row is None else _load_results(row[0])
+
+    def get_or_calculate(self, scenario: dict) -> tuple:
+        """``(results, from_store)``; a scenario not stored yet is computed and stored."""
+        input_hash = scenario_hash(scenario)
+        with self._connect() as db:
+            row = db.execute("SELECT results FROM scenarios WHERE input_hash = ?", (input_hash,)).fetchone()
+        if row is not None:
+            with self._lock:
+                self.hits += 1
+            return _load_results(row[0]), True
+        results = calculate_scenario(scenario)
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR IGNORE INTO scenarios (input_hash, params, results, created) VALUES (?, ?, ?, ?)",
+                (input_hash, json.dumps(encode_scenario(normalize_scenario(scenario))), _dump_results(results), time.time()),
+            )
+        with self._lock:
+            self.misses += 1
+        return results, False
+
+    def get_or_calculate_many(self, scenarios: list) -> tuple:
+        """``(results, from_store)`` for a list of scenarios: one query, one batched pass for the new ones.
+
+        ``from_store`` is the number of scenarios found in the store.
+        """
+        hashes = [scenario_hash(scenario) for scenario in scenarios]
+        unique_hashes = list(dict.fromkeys(hashes))
+        stored = {}
+        with self._connect() as db:
+            # SQLite limits the number of bound parameters of one statement
+            for start in range(0, len(unique_hashes), 500):
+                chunk = unique_hashes[start:start + 500]
+                stored.update(db.execute(
+                    f"SELECT input_hash, results FROM scenarios WHERE input_hash IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall())
+        missing = {input_hash: scenario for input_hash, scenario in zip(hashes, scenarios) if input_hash not in stored}
+        loaded = {input_hash: _load_results(results) for input_hash, results in stored.items()}
+        loaded.update(zip(missing, calculate_scenarios(list(missing.values()))))
+        if missing:
+            now = time.time()
+            with self._connect() as db:
+                db.executemany(
+                    "INSERT OR IGNORE INTO scenarios (input_hash, params, results, created) VALUES (?, ?, ?, ?)",
+                    [(input_hash, json.dumps(encode_scenario(normalize_scenario(scenario))), _dump_results(loaded[input_hash]), now)
+                     for input_hash, scenario in missing.items()],
+                )
+        from_store = sum(input_hash in stored for input_hash in hashes)
+        with self._lock:
+            self.hits += from_store
+            self.misses += len(hashes) - from_store
+        return [loaded[input_hash] for input_hash in hashes], from_store
+
+    def save(self, scenario: dict, name: str) -> str:
+        """Store the scenario under a name for the comparison and return its hash."""
+        if not name.strip():
+            raise ValueError("Zadejte název scénáře.")
+        self.get_or_calculate(scenario)
+        input_hash = scenario_hash(scenario)
+        with self._connect() as db:
+            db.execute("UPDATE scenarios SET name = ? WHERE input_hash = ?", (name.strip(), input_hash))
+        return input_hash
+
+    def forget(self, input_hash: str) -> None:
+        """Remove a saved scenario from the comparison; its results stay stored."""
+        with self._connect() as db:
+            db.execute("UPDATE scenarios SET name = NULL WHERE input_hash = ?", (input_hash,))
+
+    def saved_scenarios(self) -> list:
+        """Saved scenarios, oldest first, as dicts with hash, name, query params and result records."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT input_hash, name, params, results FROM scenarios WHERE name IS NOT NULL ORDER BY created"
+            ).fetchall()
+        saved = []
+        for input_hash, name, params, results in rows:
+            params = json.loads(params)
+            scenario, _ = decode_scenario(params)
+            if scenario_hash(scenario) != input_hash:
+                # Stored before a parameter or engine change: recompute under the new hash
+                self.forget(input_hash)
+                input_hash = self.save(scenario, name)
+                results = self.get(scenario)
+            else:
+                results = _load_results(results)
+            saved.append({"hash": input_hash, "nazev": name, "params": params, "vysledky": results})
+        return saved
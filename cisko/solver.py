@@ -0,0 +1,511 @@
+"""Break-even solver: the IČO revenue / day rate that matches an HPP net income.
+
+For a fixed set of the other inputs, the IČO net income is an increasing,
+piecewise-linear function of revenue. The kinks are known in advance: expense
+caps, the 2M CZK lump-sum limit, the insurance assessment-base floors and
+minimum payments, the bracket threshold and the point where the tax covers
+the credits. The solver evaluates the calculate_* functions only at those
+kinks (as records, reading the unrounded value it needs), finds the segment
+containing the target and interpolates inside it. That costs about ten
+evaluations per mode instead of a search over revenue. The answer is then
+settled on the haléř grid against the rounded value the calculate_* functions
+report: the smallest amount whose reported net income reaches the target,
+usually one or two more evaluations.
+
+The same holds for the HPP net income as a function of the gross salary,
+with the bracket threshold and the credits point as kinks. The ``*_batch``
+variants invert whole arrays of targets. They evaluate the kinks once and
+locate every target's segment with one ``searchsorted``; settling each answer
+on the haléř grid is done per target, so they give the same results as the
+scalar functions.
+"""
+
+import math
+
+import numpy as np
+
+from cisko.engine import (
+    DEFAULT_MANDAYS_PER_YEAR_ICO,
+    DEFAULT_WORK_DAYS_PER_YEAR,
+    calculate_hpp_income_record,
+    calculate_ico_pausalni_dan_income_record,
+    calculate_ico_pausalni_vydaje_income_record,
+)
+from cisko.params import DEFAULT_TAX_YEAR, TaxParams, get_tax_params
+
+# Smallest revenue evaluated; any positive revenue is on the first linear segment
+MIN_REVENUE = 0.01
+
+
+def solve_increasing_piecewise_linear(f, knots, target: float, extrapolate: bool = True, clamp_below: bool = False) -> float | None:
+    """Return x with f(x) == target for an increasing piecewise-linear f.
+
+    ``knots`` must contain every x where f changes slope (others are
+    harmless). Between knots f is linear, so the root is found by linear
+    interpolation in the bracketing segment. Beyond the last knot f is
+    extrapolated along the last segment when ``extrapolate`` is true.
+    A target below f at the first knot gives the first knot when
+    ``clamp_below`` is true. Returns None when the target is outside the
+    reachable range.
+    """
+    points = list(zip(*_knot_values(f, knots)))
+    if target < points[0][1]:
+        return points[0][0] if clamp_below else None
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if target <= y1:
+            return x0 if y1 == y0 else x0 + (target - y0) * (x1 - x0) / (y1 - y0)
+    if not extrapolate or len(points) < 2:
+        return None
+    (x0, y0), (x1, y1) = points[-2], points[-1]
+    return x1 + (target - y1) * (x1 - x0) / (y1 - y0)
+
+
+def _knot_values(f, knots) -> tuple:
+    xs = sorted({x for x in knots if x > 0})
+    return xs, [f(x) for x in xs]
+
+
+def solve_increasing_piecewise_linear_batch(f, knots, targets, extrapolate: bool = True, clamp_below: bool = False) -> np.ndarray:
+    """solve_increasing_piecewise_linear for an array of targets; NaN where it returns None."""
+    xs, ys = (np.array(values, dtype=np.float64) for values in _knot_values(f, knots))
+    targets = np.asarray(targets, dtype=np.float64)
+    # Index of the first knot reaching the target: the end of its segment
+    end = np.searchsorted(ys, targets, side="left")
+    segment_end = np.clip(end, 1, len(xs) - 1)
+    x0, y0, x1, y1 = xs[segment_end - 1], ys[segment_end - 1], xs[segment_end], ys[segment_end]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inside = np.where(y1 == y0, x0, x0 + (targets - y0) * (x1 - x0) / (y1 - y0))
+        beyond = x1 + (targets - y1) * (x1 - x0) / (y1 - y0)
+    result = np.where(end < len(xs), inside, beyond if extrapolate and len(xs) >= 2 else np.nan)
+    result = np.where(end == 0, xs[0], result)
+    result[targets < ys[0]] = xs[0] if clamp_below else np.nan
+    return result
+
+
+def _tax_covers_credits(p: TaxParams, other_annual_tax_credits: float) -> float:
+    """Tax base at which the income tax before credits equals the credits."""
+    total_tax_credits = p.personal_tax_credit_annual + other_annual_tax_credits
+    if total_tax_credits <= p.income_tax_at_threshold:
+        return total_tax_credits / p.income_tax_rate_lower
+    return p.income_tax_threshold_annual + (total_tax_credits - p.income_tax_at_threshold) / p.income_tax_rate_higher
+
+
+def _profit_for_tax_purposes(p: TaxParams, revenue: float, expense_percentage: float) -> float:
+    applicable_revenue_for_lump_sum = min(revenue, p.max_revenue_for_lump_sum)
+    return revenue - min(applicable_revenue_for_lump_sum * expense_percentage, p.expense_caps[expense_percentage])
+
+
+def _profit_kinks(p: TaxParams, other_annual_tax_credits: float) -> list:
+    """Profits where insurance floors/minimums or the income tax change slope."""
+    factor = p.ico_profit_assessment_base_factor
+    return [
+        p.min_social_assessment_base_annual / factor,
+        p.ico_min_social_annual / (p.ico_social_security_rate * factor),
+        p.min_health_assessment_base_annual / factor,
+        p.ico_min_health_annual / (p.ico_health_insurance_rate * factor),
+        p.income_tax_threshold_annual,
+        _tax_covers_credits(p, other_annual_tax_credits),
+    ]
+
+
+def _revenue_kinks_pausalni_vydaje(p: TaxParams, expense_percentage: float, other_annual_tax_credits: float) -> list:
+    revenue_kinks = [
+        MIN_REVENUE,
+        p.max_revenue_for_lump_sum,
+        p.expense_caps[expense_percentage] / expense_percentage,
+    ]
+    profit_knots = revenue_kinks + [max(revenue_kinks) * 2]
+    for profit in _profit_kinks(p, other_annual_tax_credits):
+        revenue = solve_increasing_piecewise_linear(
+            lambda r: _profit_for_tax_purposes(p, r, expense_percentage), profit_knots, profit
+        )
+        if revenue is not None:
+            revenue_kinks.append(revenue)
+    # One point past the last kink fixes the slope of the final segment
+    revenue_kinks.append(max(revenue_kinks) * 2)
+    return revenue_kinks
+
+
+def _ceil_to_halere(amount: float) -> float:
+    return math.ceil(round(amount * 100, 6)) / 100
+
+
+def _settle_on_halere(reported, amount: float, target: float, upper_bound: float = math.inf) -> float | None:
+    """Smallest haléř amount near the interpolated ``amount`` whose reported (rounded) value reaches the target.
+
+    Interpolation gives the exact root of the unrounded function; rounding the
+    reported value can move the answer by a haléř either way. None when no
+    amount up to ``upper_bound`` reaches the target.
+    """
+    amount = min(_ceil_to_halere(amount), upper_bound)
+    while reported(amount) < target:
+        amount = round(amount + 0.01, 2)
+        if amount > upper_bound:
+            return None
+    while amount >= 0.02 and reported(round(amount - 0.01, 2)) >= target:
+        amount = round(amount - 0.01, 2)
+    return amount
+
+
+def _settle_on_halere_batch(reported, amounts: np.ndarray, targets: np.ndarray, upper_bound: float = math.inf) -> np.ndarray:
+    """_settle_on_halere for every finite amount; NaN where it returns None."""
+    settled = np.full(amounts.shape, np.nan)
+    for i in np.flatnonzero(np.isfinite(amounts)):
+        amount = _settle_on_halere(reported, float(amounts[i]), float(targets[i]), upper_bound)
+        if amount is not None:
+            settled[i] = amount
+    return settled
+
+
+def _hpp_gross_monthly_kinks(p: TaxParams, other_annual_tax_credits: float) -> list:
+    kinks = [MIN_REVENUE, p.income_tax_threshold_annual / 12, _tax_covers_credits(p, other_annual_tax_credits) / 12]
+    kinks.append(max(kinks) * 2)
+    return kinks
+
+
+def _hpp_net_annual_income(other_annual_tax_credits: float, work_days_per_year_input: int, tax_year: int, rounded: bool = False):
+    """Net annual HPP income as a function of the gross monthly salary: unrounded, or as calculate_hpp_income reports it."""
+    def net_annual_income(gross_monthly_income):
+        record = calculate_hpp_income_record(gross_monthly_income, other_annual_tax_credits, work_days_per_year_input, tax_year)
+        return record["cisty_rocni_prijem_zamestnanec"] if rounded else record.cisty_rocni_prijem_zamestnanec
+    return net_annual_income
+
+
+def break_even_gross_monthly_hpp(
+    target_net_monthly_income: float,
+    other_annual_tax_credits: float = 0.0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> float:
+    """Lowest gross monthly HPP salary (in haléře) whose reported net annual income reaches 12 × the target."""
+    if target_net_monthly_income <= 0:
+        return 0.0
+    p = get_tax_params(tax_year)
+    target = target_net_monthly_income * 12
+    gross = solve_increasing_piecewise_linear(
+        _hpp_net_annual_income(other_annual_tax_credits, work_days_per_year_input, tax_year),
+        _hpp_gross_monthly_kinks(p, other_annual_tax_credits),
+        target, clamp_below=True,
+    )
+    return _settle_on_halere(_hpp_net_annual_income(other_annual_tax_credits, work_days_per_year_input, tax_year, rounded=True), gross, target)
+
+
+def break_even_gross_monthly_hpp_batch(
+    target_net_monthly_incomes,
+    other_annual_tax_credits: float = 0.0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> np.ndarray:
+    """break_even_gross_monthly_hpp for an array of target net monthly incomes."""
+    p = get_tax_params(tax_year)
+    targets = np.asarray(target_net_monthly_incomes, dtype=np.float64)
+    gross = solve_increasing_piecewise_linear_batch(
+        _hpp_net_annual_income(other_annual_tax_credits, work_days_per_year_input, tax_year),
+        _hpp_gross_monthly_kinks(p, other_annual_tax_credits),
+        targets * 12, clamp_below=True,
+    )
+    gross[targets <= 0] = np.nan
+    gross = _settle_on_halere_batch(
+        _hpp_net_annual_income(other_annual_tax_credits, work_days_per_year_input, tax_year, rounded=True), gross, targets * 12,
+    )
+    return np.where(targets <= 0, 0.0, gross)
+
+
+def _pausalni_vydaje_net_annual_income(
+    expense_percentage, realne_rocni_provozni_naklady, other_annual_tax_credits,
+    participate_sickness_insurance, sickness_insurance_assessment_base_monthly,
+    actual_unpaid_vacation_days_taken, actual_unpaid_sick_days_taken, work_days_per_year_input, tax_year, rounded=False,
+):
+    """Disposable net annual income (after real costs) as a function of revenue: unrounded, or as reported."""
+    def net_annual_income(revenue):
+        result = calculate_ico_pausalni_vydaje_income_record(
+            gross_annual_revenue=revenue,
+            expense_percentage=expense_percentage,
+            realne_rocni_provozni_naklady=realne_rocni_provozni_naklady,
+            other_annual_tax_credits=other_annual_tax_credits,
+            participate_sickness_insurance=participate_sickness_insurance,
+            sickness_insurance_assessment_base_monthly=sickness_insurance_assessment_base_monthly,
+            actual_unpaid_vacation_days_taken=actual_unpaid_vacation_days_taken,
+            actual_unpaid_sick_days_taken=actual_unpaid_sick_days_taken,
+            work_days_per_year_input=work_days_per_year_input,
+            tax_year=tax_year,
+        )
+        if rounded:
+            return result["info_k_realnym_nakladum"]["cisty_rocni_prijem_disponibilni_po_realnych_nakladech"]
+        return result.cisty_rocni_prijem_disponibilni_po_realnych_nakladech
+    return net_annual_income
+
+
+def _pausalni_dan_net_annual_income(
+    pausalni_dan_band, actual_unpaid_vacation_days_taken, actual_unpaid_sick_days_taken, work_days_per_year_input, tax_year,
+    rounded=False,
+):
+    """Net annual income under paušální daň as a function of revenue: unrounded, or as reported."""
+    def net_annual_income(revenue):
+        result = calculate_ico_pausalni_dan_income_record(
+            gross_annual_revenue=revenue,
+            pausalni_dan_band=pausalni_dan_band,
+            actual_unpaid_vacation_days_taken=actual_unpaid_vacation_days_taken,
+            actual_unpaid_sick_days_taken=actual_unpaid_sick_days_taken,
+            work_days_per_year_input=work_days_per_year_input,
+            tax_year=tax_year,
+        )
+        return result["cisty_rocni_prijem"] if rounded else result.cisty_rocni_prijem
+    return net_annual_income
+
+
+def break_even_revenue_pausalni_vydaje(
+    target_net_annual_income: float,
+    expense_percentage: float,
+    realne_rocni_provozni_naklady: float = 0.0,
+    other_annual_tax_credits: float = 0.0,
+    participate_sickness_insurance: bool = False,
+    sickness_insurance_assessment_base_monthly: float | None = None,
+    actual_unpaid_vacation_days_taken: int = 0,
+    actual_unpaid_sick_days_taken: int = 0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> float | None:
+    """Annual revenue whose disposable net income (after real costs) is the target."""
+    p = get_tax_params(tax_year)
+    if target_net_annual_income <= 0:
+        return 0.0
+    if expense_percentage not in p.expense_caps:
+        return None
+
+    inputs = (
+        expense_percentage, realne_rocni_provozni_naklady, other_annual_tax_credits,
+        participate_sickness_insurance, sickness_insurance_assessment_base_monthly,
+        actual_unpaid_vacation_days_taken, actual_unpaid_sick_days_taken, work_days_per_year_input, tax_year,
+    )
+    revenue = solve_increasing_piecewise_linear(
+        _pausalni_vydaje_net_annual_income(*inputs),
+        _revenue_kinks_pausalni_vydaje(p, expense_percentage, other_annual_tax_credits),
+        target_net_annual_income, clamp_below=True,
+    )
+    return _settle_on_halere(_pausalni_vydaje_net_annual_income(*inputs, rounded=True), revenue, target_net_annual_income)
+
+
+def break_even_revenue_pausalni_dan(
+    target_net_annual_income: float,
+    pausalni_dan_band: int,
+    actual_unpaid_vacation_days_taken: int = 0,
+    actual_unpaid_sick_days_taken: int = 0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> float | None:
+    """Annual revenue whose paušální daň net income is the target, None above the revenue limit."""
+    p = get_tax_params(tax_year)
+    if target_net_annual_income <= 0:
+        return 0.0
+    if pausalni_dan_band not in p.pausalni_dan_bands_monthly:
+        return None
+
+    inputs = (pausalni_dan_band, actual_unpaid_vacation_days_taken, actual_unpaid_sick_days_taken, work_days_per_year_input, tax_year)
+    revenue = solve_increasing_piecewise_linear(
+        _pausalni_dan_net_annual_income(*inputs),
+        [MIN_REVENUE, p.pausalni_dan_max_revenue], target_net_annual_income, extrapolate=False, clamp_below=True,
+    )
+    if revenue is None:
+        return None
+    return _settle_on_halere(
+        _pausalni_dan_net_annual_income(*inputs, rounded=True), revenue, target_net_annual_income, p.pausalni_dan_max_revenue,
+    )
+
+
+def break_even_revenue_pausalni_vydaje_batch(
+    target_net_annual_incomes,
+    expense_percentage: float,
+    realne_rocni_provozni_naklady: float = 0.0,
+    other_annual_tax_credits: float = 0.0,
+    participate_sickness_insurance: bool = False,
+    sickness_insurance_assessment_base_monthly: float | None = None,
+    actual_unpaid_vacation_days_taken: int = 0,
+    actual_unpaid_sick_days_taken: int = 0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> np.ndarray:
+    """break_even_revenue_pausalni_vydaje for an array of targets; NaN where it returns None."""
+    p = get_tax_params(tax_year)
+    targets = np.asarray(target_net_annual_incomes, dtype=np.float64)
+    if expense_percentage not in p.expense_caps:
+        return np.where(targets <= 0, 0.0, np.nan)
+    inputs = (
+        expense_percentage, realne_rocni_provozni_naklady, other_annual_tax_credits,
+        participate_sickness_insurance, sickness_insurance_assessment_base_monthly,
+        actual_unpaid_vacation_days_taken, actual_unpaid_sick_days_taken, work_days_per_year_input, tax_year,
+    )
+    revenue = solve_increasing_piecewise_linear_batch(
+        _pausalni_vydaje_net_annual_income(*inputs),
+        _revenue_kinks_pausalni_vydaje(p, expense_percentage, other_annual_tax_credits),
+        targets, clamp_below=True,
+    )
+    revenue[targets <= 0] = np.nan
+    revenue = _settle_on_halere_batch(_pausalni_vydaje_net_annual_income(*inputs, rounded=True), revenue, targets)
+    return np.where(targets <= 0, 0.0, revenue)
+
+
+def break_even_revenue_pausalni_dan_batch(
+    target_net_annual_incomes,
+    pausalni_dan_band: int,
+    actual_unpaid_vacation_days_taken: int = 0,
+    actual_unpaid_sick_days_taken: int = 0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> np.ndarray:
+    """break_even_revenue_pausalni_dan for an array of targets; NaN where it returns None."""
+    p = get_tax_params(tax_year)
+    targets = np.asarray(target_net_annual_incomes, dtype=np.float64)
+    if pausalni_dan_band not in p.pausalni_dan_bands_monthly:
+        return np.where(targets <= 0, 0.0, np.nan)
+    inputs = (pausalni_dan_band, actual_unpaid_vacation_days_taken, actual_unpaid_sick_days_taken, work_days_per_year_input, tax_year)
+    revenue = solve_increasing_piecewise_linear_batch(
+        _pausalni_dan_net_annual_income(*inputs),
+        [MIN_REVENUE, p.pausalni_dan_max_revenue], targets, extrapolate=False, clamp_below=True,
+    )
+    revenue[targets <= 0] = np.nan
+    revenue = _settle_on_halere_batch(
+        _pausalni_dan_net_annual_income(*inputs, rounded=True), revenue, targets, p.pausalni_dan_max_revenue,
+    )
+    return np.where(targets <= 0, 0.0, revenue)
+
+
+def break_even_table(
+    target_net_monthly_income: float,
+    realne_rocni_provozni_naklady: float = 0.0,
+    other_annual_tax_credits: float = 0.0,
+    participate_sickness_insurance: bool = False,
+    sickness_insurance_assessment_base_monthly: float | None = None,
+    actual_unpaid_vacation_days_taken: int = 0,
+    actual_unpaid_sick_days_taken: int = 0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    mandays_per_year: int = DEFAULT_MANDAYS_PER_YEAR_ICO,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> list:
+    """Break-even revenue, monthly billing and day rate for every IČO mode.
+
+    ``skutecny_rocni_obrat`` is the revenue actually earned; the planned
+    revenue, billing and day rate are grossed up for the unpaid days the same
+    way the app reduces the planned revenue. Unreachable modes (paušální daň
+    above its revenue limit) have None values.
+    """
+    p = get_tax_params(tax_year)
+    target_net_annual_income = target_net_monthly_income * 12
+    days_not_earning = actual_unpaid_vacation_days_taken + actual_unpaid_sick_days_taken
+    earning_days_ratio = max(0, work_days_per_year_input - days_not_earning) / work_days_per_year_input if work_days_per_year_input > 0 else 0
+    days = dict(
+        actual_unpaid_vacation_days_taken=actual_unpaid_vacation_days_taken,
+        actual_unpaid_sick_days_taken=actual_unpaid_sick_days_taken,
+        work_days_per_year_input=work_days_per_year_input,
+        tax_year=tax_year,
+    )
+
+    rows = []
+    for expense_percentage in sorted(p.expense_caps, reverse=True):
+        revenue = break_even_revenue_pausalni_vydaje(
+            target_net_annual_income, expense_percentage,
+            realne_rocni_provozni_naklady=realne_rocni_provozni_naklady,
+            other_annual_tax_credits=other_annual_tax_credits,
+            participate_sickness_insurance=participate_sickness_insurance,
+            sickness_insurance_assessment_base_monthly=sickness_insurance_assessment_base_monthly,
+            **days,
+        )
+        rows.append((f"Paušální výdaje {int(expense_percentage * 100)}%", revenue))
+    for band in sorted(p.pausalni_dan_bands_monthly):
+        rows.append((f"Paušální daň {band}. pásmo", break_even_revenue_pausalni_dan(target_net_annual_income, band, **days)))
+
+    table = []
+    for mode, revenue in rows:
+        planned_revenue = revenue / earning_days_ratio if revenue is not None and earning_days_ratio > 0 else None
+        table.append({
+            "rezim": mode,
+            "skutecny_rocni_obrat": revenue,
+            "cilovy_rocni_obrat": planned_revenue,
+            "mesicni_fakturace": planned_revenue / 12 if planned_revenue is not None else None,
+            "denni_sazba": planned_revenue / mandays_per_year if planned_revenue is not None and mandays_per_year > 0 else None,
+        })
+    return table
+
+
+def break_even_table_batch(
+    target_net_monthly_incomes,
+    realne_rocni_provozni_naklady: float = 0.0,
+    other_annual_tax_credits: float = 0.0,
+    participate_sickness_insurance: bool = False,
+    sickness_insurance_assessment_base_monthly: float | None = None,
+    actual_unpaid_vacation_days_taken: int = 0,
+    actual_unpaid_sick_days_taken: int = 0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    mandays_per_year: int = DEFAULT_MANDAYS_PER_YEAR_ICO,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> dict:
+    """Gross HPP salary and break_even_table columns for a whole array of target net monthly incomes.
+
+    Returns ``{"cisty_mesicni_prijem": targets, "hruba_mesicni_mzda_hpp": ...,
+    "rezimy": {mode: {"skutecny_rocni_obrat": ..., "cilovy_rocni_obrat": ...,
+    "mesicni_fakturace": ..., "denni_sazba": ...}}}`` with NaN where
+    break_even_table has None.
+    """
+    p = get_tax_params(tax_year)
+    targets = np.asarray(target_net_monthly_incomes, dtype=np.float64)
+    target_net_annual_incomes = targets * 12
+    days_not_earning = actual_unpaid_vacation_days_taken + actual_unpaid_sick_days_taken
+    earning_days_ratio = max(0, work_days_per_year_input - days_not_earning) / work_days_per_year_input if work_days_per_year_input > 0 else 0
+    days = dict(
+        actual_unpaid_vacation_days_taken=actual_unpaid_vacation_days_taken,
+        actual_unpaid_sick_days_taken=actual_unpaid_sick_days_taken,
+        work_days_per_year_input=work_days_per_year_input,
+        tax_year=tax_year,
+    )
+
+    revenues = {}
+    for expense_percentage in sorted(p.expense_caps, reverse=True):
+        revenues[f"Paušální výdaje {int(expense_percentage * 100)}%"] = break_even_revenue_pausalni_vydaje_batch(
+            target_net_annual_incomes, expense_percentage,
+            realne_rocni_provozni_naklady=realne_rocni_provozni_naklady,
+            other_annual_tax_credits=other_annual_tax_credits,
+            participate_sickness_insurance=participate_sickness_insurance,
+            sickness_insurance_assessment_base_monthly=sickness_insurance_assessment_base_monthly,
+            **days,
+        )
+    for band in sorted(p.pausalni_dan_bands_monthly):
+        revenues[f"Paušální daň {band}. pásmo"] = break_even_revenue_pausalni_dan_batch(target_net_annual_incomes, band, **days)
+
+    modes = {}
+    for mode, revenue in revenues.items():
+        planned_revenue = revenue / earning_days_ratio if earning_days_ratio > 0 else np.full(revenue.shape, np.nan)
+        modes[mode] = {
+            "skutecny_rocni_obrat": revenue,
+            "cilovy_rocni_obrat": planned_revenue,
+            "mesicni_fakturace": planned_revenue / 12,
+            "denni_sazba": planned_revenue / mandays_per_year if mandays_per_year > 0 else np.full(revenue.shape, np.nan),
+        }
+    return {
+        "cisty_mesicni_prijem": targets,
+        "hruba_mesicni_mzda_hpp": break_even_gross_monthly_hpp_batch(
+            targets, other_annual_tax_credits, work_days_per_year_input, tax_year=tax_year
+        ),
+        "rezimy": modes,
+    }
+
+
+def break_even_vs_hpp(
+    hpp_gross_monthly_income: float,
+    other_annual_tax_credits: float = 0.0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+    **ico_inputs,
+) -> list:
+    """break_even_table for the net income of the given HPP gross salary."""
+    results_hpp = calculate_hpp_income_record(
+        hpp_gross_monthly_income, other_annual_tax_credits, work_days_per_year_input, tax_year=tax_year
+    )
+    if "error" in results_hpp:
+        raise ValueError(results_hpp["error"])
+    return break_even_table(
+        results_hpp["cisty_mesicni_prijem_zamestnanec"],
+        other_annual_tax_credits=other_annual_tax_credits,
+        work_days_per_year_input=work_days_per_year_input,
+        tax_year=tax_year,
+        **ico_inputs,
+    )
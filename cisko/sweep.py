@@ -0,0 +1,117 @@
+"""Sensitivity sweep: net monthly income of HPP and every IČO variant over a grid.
+
+The x axis is one gross monthly amount, used both as the HPP gross salary and
+as the planned IČO monthly billing. The IČO revenue is reduced for unpaid days
+as on the main page. All variants are evaluated in one broadcast call per
+batch function: every expense percentage with and without sickness insurance,
+and every paušální daň band. The sweep is cached per parameter set and its
+arrays are read-only, so UI interactions only slice them (``slice_sweep``).
+"""
+
+import functools
+
+import numpy as np
+
+from cisko.batch import (
+    calculate_hpp_income_batch,
+    calculate_ico_pausalni_dan_income_batch,
+    calculate_ico_pausalni_vydaje_income_batch,
+)
+from cisko.engine import DEFAULT_WORK_DAYS_PER_YEAR
+from cisko.params import DEFAULT_TAX_YEAR, get_tax_params
+
+HPP_CURVE = "HPP"
+DEFAULT_MAX_GROSS_MONTHLY = 250000.0
+DEFAULT_GRID_POINTS = 1001
+
+
+@functools.lru_cache(maxsize=32)
+def build_sweep(
+    max_gross_monthly: float = DEFAULT_MAX_GROSS_MONTHLY,
+    grid_points: int = DEFAULT_GRID_POINTS,
+    other_annual_tax_credits: float = 0.0,
+    realne_rocni_provozni_naklady: float = 0.0,
+    sickness_insurance_assessment_base_monthly: float | None = None,
+    actual_unpaid_vacation_days_taken: int = 0,
+    actual_unpaid_sick_days_taken: int = 0,
+    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+    tax_year: int = DEFAULT_TAX_YEAR,
+) -> dict:
+    """Return ``{"hruby_mesicni_prijem": grid, "krivky": {name: net monthly}, "pruseciky": ...}``.
+
+    Curves are NaN where a mode is not applicable (paušální daň above its
+    revenue limit). ``pruseciky`` lists, per IČO curve, the gross amounts
+    where it crosses the HPP curve.
+    """
+    p = get_tax_params(tax_year)
+    gross_monthly = np.linspace(0.0, max_gross_monthly, grid_points)
+    days_not_earning = actual_unpaid_vacation_days_taken + actual_unpaid_sick_days_taken
+    earning_days_ratio = max(0, work_days_per_year_input - days_not_earning) / work_days_per_year_input if work_days_per_year_input > 0 else 0
+    ico_revenue = gross_monthly * 12 * earning_days_ratio
+    days = dict(
+        actual_unpaid_vacation_days_taken=actual_unpaid_vacation_days_taken,
+        actual_unpaid_sick_days_taken=actual_unpaid_sick_days_taken,
+        work_days_per_year_input=work_days_per_year_input,
+        tax_year=tax_year,
+    )
+
+    curves = {}
+    hpp = calculate_hpp_income_batch(gross_monthly, other_annual_tax_credits, work_days_per_year_input, tax_year=tax_year)
+    curves[HPP_CURVE] = hpp["cisty_mesicni_prijem_zamestnanec"]
+
+    expense_percentages = np.array(sorted(p.expense_caps, reverse=True))
+    sickness_options = np.array([False, True])
+    vydaje = calculate_ico_pausalni_vydaje_income_batch(
+        ico_revenue,
+        expense_percentages[:, None, None],
+        realne_rocni_provozni_naklady=realne_rocni_provozni_naklady,
+        other_annual_tax_credits=other_annual_tax_credits,
+        participate_sickness_insurance=sickness_options[None, :, None],
+        sickness_insurance_assessment_base_monthly=sickness_insurance_assessment_base_monthly,
+        **days,
+    )
+    net_vydaje = vydaje["cisty_mesicni_prijem_disponibilni_po_realnych_nakladech"]
+    for i, expense_percentage in enumerate(expense_percentages):
+        for j, participate_sickness in enumerate(sickness_options):
+            name = f"Paušální výdaje {int(expense_percentage * 100)}%" + (" + nemocenské" if participate_sickness else "")
+            curves[name] = net_vydaje[i, j]
+
+    bands = np.array(sorted(p.pausalni_dan_bands_monthly))
+    dan = calculate_ico_pausalni_dan_income_batch(ico_revenue, bands[:, None], **days)
+    for i, band in enumerate(bands):
+        curves[f"Paušální daň {band}. pásmo"] = dan["cisty_mesicni_prijem"][i]
+
+    for values in curves.values():
+        values.flags.writeable = False
+    gross_monthly.flags.writeable = False
+
+    return {
+        "hruby_mesicni_prijem": gross_monthly,
+        "krivky": curves,
+        "pruseciky": {
+            name: find_crossovers(gross_monthly, values, curves[HPP_CURVE])
+            for name, values in curves.items() if name != HPP_CURVE
+        },
+    }
+
+
+def find_crossovers(x: np.ndarray, a: np.ndarray, b: np.ndarray) -> list:
+    """x positions where curve ``a`` crosses ``b``, linearly interpolated between grid points."""
+    diff = a - b
+    d0, d1 = diff[:-1], diff[1:]
+    crossing = np.flatnonzero((np.sign(d0) != np.sign(d1)) & ~np.isnan(d0) & ~np.isnan(d1) & (d0 != 0))
+    return [float(x[i] + (x[i + 1] - x[i]) * d0[i] / (d0[i] - d1[i])) for i in crossing]
+
+
+def slice_sweep(sweep: dict, gross_from: float, gross_to: float) -> dict:
+    """Views of the sweep curves restricted to ``gross_from <= x <= gross_to``."""
+    x = sweep["hruby_mesicni_prijem"]
+    start, stop = np.searchsorted(x, gross_from, side="left"), np.searchsorted(x, gross_to, side="right")
+    return {
+        "hruby_mesicni_prijem": x[start:stop],
+        "krivky": {name: values[start:stop] for name, values in sweep["krivky"].items()},
+        "pruseciky": {
+            name: [c for c in crossings if gross_from <= c <= gross_to]
+            for name, crossings in sweep["pruseciky"].items()
+        },
+    }
@@ -0,0 +1,373 @@
+"""Employer-side cost model of a whole team roster: ``python -m cisko.team ROSTER``.
+
+A roster lists positions, one row each, with the columns ``team``, ``role``,
+``count`` (headcount, default 1) and either ``gross_monthly_income`` for HPP
+employees or ``day_rate`` for IČO contractors. Contractors invoice
+``day_rate * mandays_per_year`` (default DEFAULT_MANDAYS_PER_YEAR_ICO) and
+are taxed by ``expense_percentage`` or ``pausalni_dan_band`` (paušální
+výdaje 60 % when neither is given). ``other_annual_tax_credits`` is optional.
+Empty optional cells fall back to these defaults.
+
+Per person the model keeps, in flat NumPy arrays over the positions:
+
+* employer cost: zamestnavatel_celkove_rocni_naklady_na_zamestnance for HPP;
+* contractor invoice cost: the annual invoicing of an IČO contractor;
+* worker net income: the employee's net annual income, or the contractor's
+  net annual income left from the invoicing.
+
+Each team's headcounts and costs are kept as sums of ``count`` times the per
+person values. What-if edits (``set_salary``, ``raise_salary``,
+``convert_to_ico``) recompute only the positions they touch, with the batch
+functions, and add the difference to the team sums instead of recomputing the
+whole roster.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from cisko.batch import (
+    calculate_hpp_income_arrays,
+    calculate_ico_pausalni_dan_income_arrays,
+    calculate_ico_pausalni_vydaje_income_arrays,
+)
+from cisko.engine import DEFAULT_MANDAYS_PER_YEAR_ICO
+from cisko.params import DEFAULT_TAX_YEAR
+
+DEFAULT_EXPENSE_PERCENTAGE = 0.6
+
+# Optional roster columns and the value used when a column or cell is missing
+OPTIONAL_COLUMNS = {
+    "count": 1,
+    "gross_monthly_income": np.nan,
+    "day_rate": np.nan,
+    "mandays_per_year": DEFAULT_MANDAYS_PER_YEAR_ICO,
+    "expense_percentage": np.nan,
+    "pausalni_dan_band": np.nan,
+    "other_annual_tax_credits": 0.0,
+}
+
+# Per-position arrays an update may change, restored when it fails
+POSITION_ARRAYS = (
+    "count", "is_ico", "gross_monthly_income", "day_rate", "mandays_per_year", "expense_percentage",
+    "pausalni_dan_band", "employer_cost", "invoice_cost", "net_income",
+)
+
+# Columns of the per-team sums, in the order of TeamCostModel._team_totals
+TOTAL_COLUMNS = (
+    "pocet_hpp",
+    "pocet_ico",
+    "naklady_zamestnavatele",
+    "naklady_na_fakturace",
+    "cisty_prijem_pracovniku",
+)
+
+
+def load_roster(path: Path):
+    """Read a CSV or Parquet roster into a DataFrame."""
+    import pandas as pd
+    path = Path(path)
+    if path.suffix.lower() in (".pq", ".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def _roster_column(roster, name: str, rows: int) -> np.ndarray:
+    default = OPTIONAL_COLUMNS[name]
+    if name not in roster:
+        return np.full(rows, default, dtype=float)
+    values = np.array(roster[name], dtype=float)
+    values[np.isnan(values)] = default
+    return values
+
+
+class TeamCostModel:
+    """Costs and net incomes of a roster, aggregated per team, with incremental what-if edits."""
+
+    def __init__(self, roster, tax_year: int = DEFAULT_TAX_YEAR):
+        for name in ("team", "role"):
+            if name not in roster:
+                raise ValueError(f"Soupiska musí obsahovat sloupec '{name}'.")
+        self.tax_year = tax_year
+        self.team = np.array([str(team) for team in roster["team"]], dtype=object)
+        self.role = np.array([str(role) for role in roster["role"]], dtype=object)
+        n = len(self.team)
+        self.count = _roster_column(roster, "count", n)
+        self.gross_monthly_income = _roster_column(roster, "gross_monthly_income", n)
+        self.day_rate = _roster_column(roster, "day_rate", n)
+        self.mandays_per_year = _roster_column(roster, "mandays_per_year", n)
+        self.expense_percentage = _roster_column(roster, "expense_percentage", n)
+        self.pausalni_dan_band = _roster_column(roster, "pausalni_dan_band", n)
+        self.other_annual_tax_credits = _roster_column(roster, "other_annual_tax_credits", n)
+
+        self.is_ico = ~np.isnan(self.day_rate)
+        if np.any(self.is_ico == ~np.isnan(self.gross_monthly_income)):
+            row = int(np.flatnonzero(self.is_ico == ~np.isnan(self.gross_monthly_income))[0])
+            raise ValueError(f"Řádek {row + 1}: zadejte buď hrubou měsíční mzdu (HPP), nebo denní sazbu (IČO).")
+        if np.any(self.count < 0) or np.any(self.count != np.floor(self.count)):
+            raise ValueError("Počet lidí na pozici musí být nezáporné celé číslo.")
+        no_regime = self.is_ico & np.isnan(self.expense_percentage) & np.isnan(self.pausalni_dan_band)
+        self.expense_percentage[no_regime] = DEFAULT_EXPENSE_PERCENTAGE
+
+        self.employer_cost = np.zeros(n)
+        self.invoice_cost = np.zeros(n)
+        self.net_income = np.zeros(n)
+
+        self.teams = list(dict.fromkeys(self.team))
+        self._team_codes = {team: i for i, team in enumerate(self.teams)}
+        self.team_code = np.array([self._team_codes[team] for team in self.team], dtype=np.intp)
+        self._team_totals = np.zeros((len(self.teams), len(TOTAL_COLUMNS)))
+        # Positions recomputed by the most recent update; handy for checking incrementality
+        self.last_recomputed_positions = list(range(n))
+
+        self._calculate(np.arange(n))
+        np.add.at(self._team_totals, self.team_code, self._contributions(np.arange(n)))
+
+    @classmethod
+    def from_file(cls, path: Path, tax_year: int = DEFAULT_TAX_YEAR) -> "TeamCostModel":
+        return cls(load_roster(path), tax_year=tax_year)
+
+    # --- Public API ---
+
+    def positions(self, role: str | None = None, team: str | None = None) -> np.ndarray:
+        """Indices of the positions with the given role and / or team."""
+        mask = np.ones(len(self.team), dtype=bool)
+        if role is not None:
+            mask &= self.role == role
+        if team is not None:
+            mask &= self.team == team
+        return np.flatnonzero(mask)
+
+    def set_salary(self, role: str, gross_monthly_income: float, team: str | None = None) -> None:
+        """Set the gross monthly salary of the role's HPP positions."""
+        indices = self._hpp_positions(role, team)
+        self._update(indices, lambda: self.gross_monthly_income.__setitem__(indices, gross_monthly_income))
+
+    def raise_salary(self, role: str, percent: float, team: str | None = None) -> None:
+        """Raise the gross monthly salary of the role's HPP positions by ``percent`` %."""
+        indices = self._hpp_positions(role, team)
+        self._update(indices, lambda: self.gross_monthly_income.__setitem__(
+            indices, self.gross_monthly_income[indices] * (1 + percent / 100)
+        ))
+
+    def convert_to_ico(
+        self,
+        role: str,
+        people: int,
+        day_rate: float | None = None,
+        mandays_per_year: int = DEFAULT_MANDAYS_PER_YEAR_ICO,
+        expense_percentage: float | None = None,
+        pausalni_dan_band: int | None = None,
+        team: str | None = None,
+    ) -> None:
+        """Turn ``people`` HPP employees of the role into IČO contractors.
+
+        People are taken from the role's HPP positions in roster order. A
+        position converted only in part is split: the contractors get a new
+        position of the same team and role. Without ``day_rate`` each
+        contractor invoices what the employee cost the employer.
+        """
+        if pausalni_dan_band is None and expense_percentage is None:
+            expense_percentage = DEFAULT_EXPENSE_PERCENTAGE
+        indices = self._hpp_positions(role, team)
+        available = int(self.count[indices].sum())
+        if not 0 <= people <= available:
+            raise ValueError(f"Role '{role}' má jen {available} zaměstnanců na HPP.")
+
+        converted = []
+        remaining = people
+        for i in indices:
+            if remaining == 0:
+                break
+            moved = min(remaining, int(self.count[i]))
+            if moved:
+                converted.append((i, moved))
+                remaining -= moved
+        new_positions = self._append_positions([i for i, _ in converted])
+
+        def convert():
+            for (i, moved), new in zip(converted, new_positions):
+                self.count[i] -= moved
+                self.count[new] = moved
+                self.is_ico[new] = True
+                rate = day_rate if day_rate is not None else self.employer_cost[i] / mandays_per_year
+                self.day_rate[new] = rate
+                self.gross_monthly_income[new] = np.nan
+                self.mandays_per_year[new] = mandays_per_year
+                self.expense_percentage[new] = np.nan if expense_percentage is None else expense_percentage
+                self.pausalni_dan_band[new] = np.nan if pausalni_dan_band is None else pausalni_dan_band
+
+        try:
+            self._update(np.concatenate([[i for i, _ in converted], new_positions]).astype(np.intp), convert)
+        except ValueError:
+            self._truncate_positions(len(self.team) - len(new_positions))
+            raise
+
+    def team_summary(self) -> list:
+        """One dict per team, in roster order: headcounts and annual costs and net incomes."""
+        return [self._summary_row({"tym": team}, totals) for team, totals in zip(self.teams, self._team_totals)]
+
+    def totals(self) -> dict:
+        return self._summary_row({"tym": "Celkem"}, self._team_totals.sum(axis=0))
+
+    def as_arrays(self) -> dict:
+        """Per-position arrays keyed by Czech column names; costs and income are per person and year."""
+        return {
+            "tym": self.team,
+            "role": self.role,
+            "pocet": self.count,
+            "ico": self.is_ico,
+            "hruba_mesicni_mzda": self.gross_monthly_income,
+            "denni_sazba": self.day_rate,
+            "naklady_zamestnavatele": self.employer_cost,
+            "naklady_na_fakturace": self.invoice_cost,
+            "cisty_prijem_pracovnika": self.net_income,
+        }
+
+    # --- Internals ---
+
+    def _hpp_positions(self, role: str, team: str | None) -> np.ndarray:
+        indices = self.positions(role, team)
+        indices = indices[~self.is_ico[indices]]
+        if indices.size == 0:
+            raise ValueError(f"Role '{role}' nemá žádné pozice na HPP.")
+        return indices
+
+    def _append_positions(self, sources: list) -> np.ndarray:
+        """Copy the given positions to new empty (count 0) positions at the end and return their indices."""
+        start = len(self.team)
+        sources = np.asarray(sources, dtype=np.intp)
+        for name in ("team", "role", "team_code", "is_ico", "gross_monthly_income", "day_rate", "mandays_per_year",
+                     "expense_percentage", "pausalni_dan_band", "other_annual_tax_credits"):
+            values = getattr(self, name)
+            setattr(self, name, np.concatenate([values, values[sources]]))
+        for name in ("count", "employer_cost", "invoice_cost", "net_income"):
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(sources.size)]))
+        return np.arange(start, start + sources.size)
+
+    def _truncate_positions(self, size: int) -> None:
+        for name in POSITION_ARRAYS + ("team", "role", "team_code", "other_annual_tax_credits"):
+            setattr(self, name, getattr(self, name)[:size].copy())
+
+    def _contributions(self, indices: np.ndarray) -> np.ndarray:
+        """Each position's share of the team sums, in TOTAL_COLUMNS order."""
+        count = self.count[indices]
+        is_ico = self.is_ico[indices]
+        return np.column_stack([
+            np.where(is_ico, 0.0, count),
+            np.where(is_ico, count, 0.0),
+            count * self.employer_cost[indices],
+            count * self.invoice_cost[indices],
+            count * self.net_income[indices],
+        ])
+
+    def _update(self, indices: np.ndarray, change=None) -> None:
+        """Apply ``change`` to the inputs of the positions and move the team sums by the difference."""
+        before = self._contributions(indices)
+        saved = {name: getattr(self, name)[indices].copy() for name in POSITION_ARRAYS}
+        try:
+            if change is not None:
+                change()
+            self._calculate(indices)
+        except ValueError:
+            for name, values in saved.items():
+                getattr(self, name)[indices] = values
+            raise
+        np.add.at(self._team_totals, self.team_code[indices], self._contributions(indices) - before)
+        self.last_recomputed_positions = indices.tolist()
+
+    def _calculate(self, indices: np.ndarray) -> None:
+        hpp = indices[~self.is_ico[indices]]
+        if hpp.size:
+            results = calculate_hpp_income_arrays(
+                self.gross_monthly_income[hpp], self.other_annual_tax_credits[hpp], tax_year=self.tax_year
+            )
+            self._check(hpp, results.error)
+            self.employer_cost[hpp] = results["zamestnavatel_celkove_rocni_naklady_na_zamestnance"]
+            self.invoice_cost[hpp] = 0.0
+            self.net_income[hpp] = results["cisty_rocni_prijem_zamestnanec"]
+
+        ico = indices[self.is_ico[indices]]
+        revenue = self.day_rate[ico] * self.mandays_per_year[ico]
+        pausalni_dan = ~np.isnan(self.pausalni_dan_band[ico])
+        for positions, revenue_of_positions, use_band in (
+            (ico[~pausalni_dan], revenue[~pausalni_dan], False),
+            (ico[pausalni_dan], revenue[pausalni_dan], True),
+        ):
+            if positions.size == 0:
+                continue
+            if use_band:
+                results = calculate_ico_pausalni_dan_income_arrays(
+                    revenue_of_positions, self.pausalni_dan_band[positions], tax_year=self.tax_year
+                )
+                net_income = results["cisty_rocni_prijem"]
+            else:
+                results = calculate_ico_pausalni_vydaje_income_arrays(
+                    revenue_of_positions, self.expense_percentage[positions],
+                    other_annual_tax_credits=self.other_annual_tax_credits[positions], tax_year=self.tax_year,
+                )
+                net_income = results["cisty_rocni_prijem_disponibilni_po_realnych_nakladech"]
+            self._check(positions, results.error)
+            self.employer_cost[positions] = 0.0
+            self.invoice_cost[positions] = revenue_of_positions
+            self.net_income[positions] = net_income
+
+    def _check(self, positions: np.ndarray, error: np.ndarray) -> None:
+        failed = np.flatnonzero(np.not_equal(error, None))
+        if failed.size:
+            i = positions[failed[0]]
+            raise ValueError(f"{self.team[i]} / {self.role[i]}: {error[failed[0]]}")
+
+    @staticmethod
+    def _summary_row(row: dict, totals: np.ndarray) -> dict:
+        values = dict(zip(TOTAL_COLUMNS, totals.tolist()))
+        row["pocet_hpp"] = int(round(values["pocet_hpp"]))
+        row["pocet_ico"] = int(round(values["pocet_ico"]))
+        for key in ("naklady_zamestnavatele", "naklady_na_fakturace", "cisty_prijem_pracovniku"):
+            row[key] = round(values[key], 2)
+        total_cost = values["naklady_zamestnavatele"] + values["naklady_na_fakturace"]
+        row["celkove_naklady"] = round(total_cost, 2)
+        row["podil_cisteho_prijmu"] = round(values["cisty_prijem_pracovniku"] / total_cost, 4) if total_cost > 0 else 0.0
+        return row
+
+
+def _role_value(text: str, option: str):
+    role, separator, value = text.rpartition("=")
+    if not separator or not role:
+        raise argparse.ArgumentTypeError(f"{option} očekává ROLE=HODNOTA, dostal '{text}'.")
+    return role, float(value)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cisko.team", description="Roční náklady týmu: HPP zaměstnanci a IČO dodavatelé.")
+    parser.add_argument("roster", type=Path, help="Soupiska pozic (.csv nebo .parquet).")
+    parser.add_argument("--tax-year", type=int, default=DEFAULT_TAX_YEAR, help="Daňový rok (výchozí %(default)s).")
+    parser.add_argument("--raise", dest="raises", action="append", default=[], metavar="ROLE=PROCENTA",
+                        type=lambda text: _role_value(text, "--raise"), help="Co když: zvýšit mzdu role o daná procenta.")
+    parser.add_argument("--convert", action="append", default=[], metavar="ROLE=POCET",
+                        type=lambda text: _role_value(text, "--convert"), help="Co když: převést daný počet lidí z role na IČO.")
+    args = parser.parse_args(argv)
+
+    try:
+        model = TeamCostModel.from_file(args.roster, tax_year=args.tax_year)
+        for role, percent in args.raises:
+            model.raise_salary(role, percent)
+        for role, people in args.convert:
+            model.convert_to_ico(role, int(people))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    header = ("Tým", "HPP", "IČO", "Zaměstnavatel", "Fakturace", "Celkem", "Čistý příjem")
+    print("\t".join(header))
+    for row in model.team_summary() + [model.totals()]:
+        print("\t".join([row["tym"], str(row["pocet_hpp"]), str(row["pocet_ico"])] + [
+            f"{row[key]:,.0f}" for key in ("naklady_zamestnavatele", "naklady_na_fakturace", "celkove_naklady", "cisty_prijem_pracovniku")
+        ]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
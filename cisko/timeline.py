@@ -0,0 +1,298 @@
+"""Month-by-month IČO cash flow over one or more years.
+
+The timeline keeps one entry per month in flat NumPy arrays: invoicing, real
+costs, social / health insurance advances (zálohy), sickness insurance,
+paušální daň payments and the settlement payments (doplatky / přeplatky) from
+the previous year's tax return and insurance reports (přehledy).
+
+Each month's planned invoicing is reduced by the unpaid vacation and sick days
+that fall in that month (see ``invoicing_after_unpaid_days``); a month with a
+tenth of its working days unpaid invoices a tenth less.
+
+Each year's annual liabilities come from calculate_ico_pausalni_vydaje_income
+or calculate_ico_pausalni_dan_income on that year's totals. A simplified
+schedule is used:
+
+* social and health advances are the year's minimum in the first year; after
+  each settlement they become 1/12 of the previous year's insurance, but never
+  less than the new year's minimum;
+* income tax is paid in full with the annual return, no tax advances;
+* the settlement of year Y is paid (or refunded) in ``SETTLEMENT_MONTH`` of
+  year Y + 1. The last year's settlement falls outside the timeline and is
+  reported separately;
+* paušální daň is a fixed monthly payment with no settlement;
+* voluntary sickness insurance is paid monthly in the amount the year's result
+  charges, so nothing in a year without profit.
+
+Editing one month only recomputes that year's settlement and the months and
+years downstream of it. Later years are recomputed only when their advances
+actually change.
+"""
+
+import numpy as np
+
+from cisko.engine import (
+    DEFAULT_WORK_DAYS_PER_YEAR,
+    calculate_ico_pausalni_dan_income,
+    calculate_ico_pausalni_vydaje_income,
+)
+from cisko.params import DEFAULT_TAX_YEAR, get_tax_params
+
+MONTHS_PER_YEAR = 12
+SETTLEMENT_MONTH = 4  # květen (0-based), after the April deadlines for the tax return and přehledy
+# Per-month inputs set_month can change, restored together when a change is rejected
+MONTH_INPUTS = ("planned_invoicing", "invoicing", "real_costs", "unpaid_vacation_days", "unpaid_sick_days")
+
+
+def invoicing_after_unpaid_days(planned_monthly_invoicing, unpaid_days, work_days_per_year: int = DEFAULT_WORK_DAYS_PER_YEAR) -> np.ndarray:
+    """Reduce each month's planned invoicing by the unpaid days that fall in it."""
+    planned = np.asarray(planned_monthly_invoicing, dtype=float)
+    if work_days_per_year <= 0:
+        return np.zeros_like(planned)
+    work_days_per_month = work_days_per_year / MONTHS_PER_YEAR
+    earning_ratio = np.clip(1 - np.asarray(unpaid_days, dtype=float) / work_days_per_month, 0.0, 1.0)
+    return planned * earning_ratio
+
+
+class CashFlowTimeline:
+    """Monthly IČO cash flow with incremental recomputation on edits."""
+
+    def __init__(
+        self,
+        monthly_invoicing,
+        expense_percentage: float | None = None,
+        pausalni_dan_band: int | None = None,
+        monthly_real_costs=0.0,
+        other_annual_tax_credits: float = 0.0,
+        participate_sickness_insurance: bool = False,
+        sickness_insurance_assessment_base_monthly: float | None = None,
+        monthly_unpaid_vacation_days=0,
+        monthly_unpaid_sick_days=0,
+        work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR,
+        first_tax_year: int = DEFAULT_TAX_YEAR,
+        initial_social_advance: float | None = None,
+        initial_health_advance: float | None = None,
+    ):
+        if (expense_percentage is None) == (pausalni_dan_band is None):
+            raise ValueError("Zadejte buď procento paušálních výdajů, nebo pásmo paušální daně.")
+        self.planned_invoicing = np.array(monthly_invoicing, dtype=float)
+        if self.planned_invoicing.ndim != 1 or len(self.planned_invoicing) == 0 or len(self.planned_invoicing) % MONTHS_PER_YEAR:
+            raise ValueError("Fakturace musí obsahovat 12 měsíčních hodnot za každý rok.")
+        n = len(self.planned_invoicing)
+        self.years = n // MONTHS_PER_YEAR
+        self.tax_years = [first_tax_year + i for i in range(self.years)]
+        self._params = [get_tax_params(year) for year in self.tax_years]
+
+        self.expense_percentage = expense_percentage
+        self.pausalni_dan_band = pausalni_dan_band
+        self.other_annual_tax_credits = other_annual_tax_credits
+        self.participate_sickness_insurance = participate_sickness_insurance
+        self.sickness_insurance_assessment_base_monthly = sickness_insurance_assessment_base_monthly
+        self.work_days_per_year_input = work_days_per_year_input
+        self.initial_social_advance = initial_social_advance
+        self.initial_health_advance = initial_health_advance
+
+        self.real_costs = np.broadcast_to(np.asarray(monthly_real_costs, dtype=float), n).copy()
+        self.unpaid_vacation_days = np.broadcast_to(np.asarray(monthly_unpaid_vacation_days, dtype=float), n).copy()
+        self.unpaid_sick_days = np.broadcast_to(np.asarray(monthly_unpaid_sick_days, dtype=float), n).copy()
+        # Invoicing actually billed: the plan less the month's unpaid days
+        self.invoicing = invoicing_after_unpaid_days(
+            self.planned_invoicing, self.unpaid_vacation_days + self.unpaid_sick_days, work_days_per_year_input
+        )
+        self.social_advance = np.zeros(n)
+        self.health_advance = np.zeros(n)
+        self.sickness_payment = np.zeros(n)
+        self.pausalni_dan_payment = np.zeros(n)
+        self.social_settlement = np.zeros(n)
+        self.health_settlement = np.zeros(n)
+        self.income_tax_payment = np.zeros(n)
+        self.net_cash_flow = np.zeros(n)
+        self.cumulative_cash_flow = np.zeros(n)
+
+        self.annual_results = [None] * self.years
+        # Settlement of the last year, due after the end of the timeline
+        self.settlement_after_timeline = {"socialni": 0.0, "zdravotni": 0.0, "dan_z_prijmu": 0.0}
+        # Years recomputed by the most recent update; handy for checking incrementality
+        self.last_recomputed_years = []
+
+        self._set_fixed_payments()
+        self._recompute_from_year(0, force=True)
+
+    # --- Public API ---
+
+    def set_month(self, month: int, invoicing: float | None = None, real_costs: float | None = None,
+                  unpaid_vacation_days: float | None = None, unpaid_sick_days: float | None = None) -> None:
+        """Change one month's inputs and recompute only what depends on them.
+
+        ``invoicing`` is the planned invoicing, before the month's unpaid days.
+        When a year's calculation rejects the change, the month's previous
+        inputs and results are restored and the ValueError is re-raised.
+        """
+        if not 0 <= month < len(self.invoicing):
+            raise IndexError(f"Měsíc {month} je mimo časovou osu.")
+        saved = {name: getattr(self, name)[month] for name in MONTH_INPUTS}
+        if invoicing is not None:
+            self.planned_invoicing[month] = invoicing
+        if real_costs is not None:
+            self.real_costs[month] = real_costs
+        if unpaid_vacation_days is not None:
+            self.unpaid_vacation_days[month] = unpaid_vacation_days
+        if unpaid_sick_days is not None:
+            self.unpaid_sick_days[month] = unpaid_sick_days
+        self.invoicing[month] = invoicing_after_unpaid_days(
+            self.planned_invoicing[month], self.unpaid_vacation_days[month] + self.unpaid_sick_days[month],
+            self.work_days_per_year_input,
+        )
+        try:
+            self._recompute_from_year(month // MONTHS_PER_YEAR, first_changed_month=month)
+        except ValueError:
+            for name, value in saved.items():
+                getattr(self, name)[month] = value
+            # The previous inputs were valid, so this brings back the previous results
+            self._recompute_from_year(month // MONTHS_PER_YEAR, first_changed_month=month)
+            raise
+
+    def as_arrays(self) -> dict:
+        """Per-month arrays keyed by Czech column names (read-only views)."""
+        arrays = {
+            "planovana_fakturace": self.planned_invoicing,
+            "fakturace": self.invoicing,
+            "realne_naklady": self.real_costs,
+            "zaloha_socialni": self.social_advance,
+            "zaloha_zdravotni": self.health_advance,
+            "nemocenske": self.sickness_payment,
+            "pausalni_dan": self.pausalni_dan_payment,
+            "doplatek_socialni": self.social_settlement,
+            "doplatek_zdravotni": self.health_settlement,
+            "dan_z_prijmu": self.income_tax_payment,
+            "cisty_tok": self.net_cash_flow,
+            "kumulovany_tok": self.cumulative_cash_flow,
+        }
+        views = {}
+        for key, values in arrays.items():
+            view = values.view()
+            view.flags.writeable = False
+            views[key] = view
+        return views
+
+    def month_labels(self) -> list:
+        return [f"{year}-{month + 1:02d}" for year in self.tax_years for month in range(MONTHS_PER_YEAR)]
+
+    # --- Internals ---
+
+    def _year_slice(self, year_index: int) -> slice:
+        return slice(year_index * MONTHS_PER_YEAR, (year_index + 1) * MONTHS_PER_YEAR)
+
+    def _set_fixed_payments(self) -> None:
+        for i, p in enumerate(self._params):
+            months = self._year_slice(i)
+            if self.pausalni_dan_band is not None:
+                payment = p.pausalni_dan_bands_monthly.get(self.pausalni_dan_band)
+                if payment is None:
+                    raise ValueError("Neplatné pásmo paušální daně.")
+                self.pausalni_dan_payment[months] = payment
+
+    def _advances_for_year(self, year_index: int) -> tuple:
+        """(social, health) monthly advances for a year, before and after its settlement month."""
+        p = self._params[year_index]
+        if year_index == 0:
+            social = max(self.initial_social_advance or 0.0, p.ico_min_social_monthly_main_activity)
+            health = max(self.initial_health_advance or 0.0, p.ico_min_health_monthly)
+            return (social, health), (social, health)
+        previous = self.annual_results[year_index - 1]
+        before = (
+            max(self.social_advance[self._year_slice(year_index - 1)][-1], p.ico_min_social_monthly_main_activity),
+            max(self.health_advance[self._year_slice(year_index - 1)][-1], p.ico_min_health_monthly),
+        )
+        after = (
+            max(previous["rocni_socialni_pojisteni"] / MONTHS_PER_YEAR, p.ico_min_social_monthly_main_activity),
+            max(previous["rocni_zdravotni_pojisteni"] / MONTHS_PER_YEAR, p.ico_min_health_monthly),
+        )
+        return before, after
+
+    def _calculate_year(self, year_index: int) -> dict:
+        months = self._year_slice(year_index)
+        common = dict(
+            gross_annual_revenue=float(self.invoicing[months].sum()),
+            actual_unpaid_vacation_days_taken=float(self.unpaid_vacation_days[months].sum()),
+            actual_unpaid_sick_days_taken=float(self.unpaid_sick_days[months].sum()),
+            work_days_per_year_input=self.work_days_per_year_input,
+            tax_year=self.tax_years[year_index],
+        )
+        if self.pausalni_dan_band is not None:
+            result = calculate_ico_pausalni_dan_income(pausalni_dan_band=self.pausalni_dan_band, **common)
+        else:
+            result = calculate_ico_pausalni_vydaje_income(
+                expense_percentage=self.expense_percentage,
+                realne_rocni_provozni_naklady=float(self.real_costs[months].sum()),
+                other_annual_tax_credits=self.other_annual_tax_credits,
+                participate_sickness_insurance=self.participate_sickness_insurance,
+                sickness_insurance_assessment_base_monthly=self.sickness_insurance_assessment_base_monthly,
+                **common,
+            )
+        if "error" in result:
+            raise ValueError(f"{self.tax_years[year_index]}: {result['error']}")
+        return result
+
+    def _recompute_from_year(self, start_year: int, first_changed_month: int | None = None, force: bool = False) -> None:
+        self.last_recomputed_years = []
+        first_changed_month = start_year * MONTHS_PER_YEAR if first_changed_month is None else first_changed_month
+        cash_flow_start = first_changed_month
+        year_index = start_year
+        while year_index < self.years:
+            months = self._year_slice(year_index)
+            if self.pausalni_dan_band is None:
+                before, after = self._advances_for_year(year_index)
+                social = np.where(np.arange(MONTHS_PER_YEAR) < SETTLEMENT_MONTH, before[0], after[0])
+                health = np.where(np.arange(MONTHS_PER_YEAR) < SETTLEMENT_MONTH, before[1], after[1])
+                advances_changed = not (np.array_equal(self.social_advance[months], social)
+                                        and np.array_equal(self.health_advance[months], health))
+                if not (force or advances_changed or year_index == start_year):
+                    break
+                self.social_advance[months] = social
+                self.health_advance[months] = health
+            elif not (force or year_index == start_year):
+                break
+
+            self.annual_results[year_index] = self._calculate_year(year_index)
+            self.last_recomputed_years.append(self.tax_years[year_index])
+            if self.pausalni_dan_band is None:
+                # The year's result decides the sickness insurance of all its months, also those before the edit
+                sickness = self.annual_results[year_index]["rocni_nemocenske_pojisteni"] / MONTHS_PER_YEAR
+                if not np.all(self.sickness_payment[months] == sickness):
+                    self.sickness_payment[months] = sickness
+                    cash_flow_start = min(cash_flow_start, months.start)
+            self._settle_year(year_index)
+            year_index += 1
+
+        # Apart from the sickness insurance, everything recomputed above lies at or after the edited month
+        self._update_cash_flow(cash_flow_start)
+
+    def _settle_year(self, year_index: int) -> None:
+        if self.pausalni_dan_band is not None:
+            return
+        result = self.annual_results[year_index]
+        months = self._year_slice(year_index)
+        settlement = {
+            "socialni": result["rocni_socialni_pojisteni"] - self.social_advance[months].sum(),
+            "zdravotni": result["rocni_zdravotni_pojisteni"] - self.health_advance[months].sum(),
+            "dan_z_prijmu": result["konecna_rocni_dan_z_prijmu"],
+        }
+        if year_index + 1 < self.years:
+            month = (year_index + 1) * MONTHS_PER_YEAR + SETTLEMENT_MONTH
+            self.social_settlement[month] = settlement["socialni"]
+            self.health_settlement[month] = settlement["zdravotni"]
+            self.income_tax_payment[month] = settlement["dan_z_prijmu"]
+        else:
+            self.settlement_after_timeline = {key: float(value) for key, value in settlement.items()}
+
+    def _update_cash_flow(self, start: int) -> None:
+        tail = slice(start, None)
+        self.net_cash_flow[tail] = (
+            self.invoicing[tail] - self.real_costs[tail]
+            - self.social_advance[tail] - self.health_advance[tail] - self.sickness_payment[tail]
+            - self.pausalni_dan_payment[tail]
+            - self.social_settlement[tail] - self.health_settlement[tail] - self.income_tax_payment[tail]
+        )
+        offset = self.cumulative_cash_flow[start - 1] if start > 0 else 0.0
+        self.cumulative_cash_flow[tail] = offset + np.cumsum(self.net_cash_flow[tail])
@@ -1,481 +1,882 @@
-import streamlit as st
-import json # For potential debugging or displaying raw dicts, not primary for UI
-
-# --- Streamlit App UI ---
-st.set_page_config(page_title="CISKO - Kalkulátor Příjmů", layout="wide", initial_sidebar_state="expanded") 
-
-# --- Constants for 2024 (Czech Republic) ---
-# Sources for updates: Ministry of Finance CZ (mfcr.cz),
-# Czech Social Security Administration (cssz.cz), Health Insurance Companies (e.g., VZP).
-
-# --- General ---
-PERSONAL_TAX_CREDIT_ANNUAL_2024 = 30840.0  # Sleva na poplatníka (2570 CZK/month)
-INCOME_TAX_THRESHOLD_ANNUAL_2024 = 1582812.0 # Threshold for 23% tax rate
-INCOME_TAX_RATE_LOWER_2024 = 0.15
-INCOME_TAX_RATE_HIGHER_2024 = 0.23
-DEFAULT_WORK_DAYS_PER_YEAR = 252 # Approximate, can be adjusted by user in advanced settings
-DEFAULT_MANDAYS_PER_YEAR_ICO = 220 # Default for man-day calculation
-
-# --- HPP (Zaměstnanec - Employee) Constants 2024 ---
-HPP_HEALTH_INSURANCE_RATE_EMPLOYEE_2024 = 0.045
-HPP_SOCIAL_SECURITY_RATE_EMPLOYEE_2024 = 0.071 
-HPP_HEALTH_INSURANCE_RATE_EMPLOYER_2024 = 0.09
-HPP_SOCIAL_SECURITY_RATE_EMPLOYER_2024 = 0.248 
-
-# --- IČO (OSVČ - Self-Employed) Constants 2024 ---
-ICO_SOCIAL_SECURITY_RATE_2024 = 0.292
-ICO_HEALTH_INSURANCE_RATE_2024 = 0.135
-ICO_SICKNESS_INSURANCE_RATE_2024 = 0.021 
-ICO_PROFIT_ASSESSMENT_BASE_FACTOR_2024 = 0.50 
-ICO_MIN_SOCIAL_MONTHLY_MAIN_ACTIVITY_2024 = 3852.0
-ICO_MIN_HEALTH_MONTHLY_2024 = 2968.0
-ICO_MIN_SICKNESS_MONTHLY_2024 = 168.0 
-MIN_ICO_SICKNESS_ASSESSMENT_BASE_MONTHLY_2024 = 8000.0 
-PAUSALNI_DAN_BAND_1_MONTHLY_2024 = 7498.0
-PAUSALNI_DAN_BAND_2_MONTHLY_2024 = 16745.0
-PAUSALNI_DAN_BAND_3_MONTHLY_2024 = 27139.0
-PAUSALNI_DAN_MAX_REVENUE_2024 = 2000000.0
-
-# --- Calculation Functions ---
-def calculate_hpp_income(
-    gross_monthly_income: float, 
-    other_annual_tax_credits: float = 0.0,
-    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR
-) -> dict:
-    gross_annual_income = gross_monthly_income * 12
-    # Initialize values for zero income case
-    net_annual_income = 0
-    net_monthly_income = 0
-    net_daily_income = 0
-    health_insurance_employee = 0
-    social_security_employee = 0
-    final_income_tax = 0
-    total_employer_cost_annual = 0
-
-    if gross_monthly_income < 0:
-         return {"error": "Hrubý měsíční příjem nemůže být záporný."}
-    elif gross_monthly_income > 0:
-        health_insurance_employee = gross_annual_income * HPP_HEALTH_INSURANCE_RATE_EMPLOYEE_2024
-        social_security_employee = gross_annual_income * HPP_SOCIAL_SECURITY_RATE_EMPLOYEE_2024
-        health_insurance_employer = gross_annual_income * HPP_HEALTH_INSURANCE_RATE_EMPLOYER_2024
-        social_security_employer = gross_annual_income * HPP_SOCIAL_SECURITY_RATE_EMPLOYER_2024
-        total_employer_contributions = health_insurance_employer + social_security_employer
-        total_employer_cost_annual = gross_annual_income + total_employer_contributions
-        taxable_income_for_tax_calc = gross_annual_income
-        income_tax_before_credits = 0
-        if taxable_income_for_tax_calc <= INCOME_TAX_THRESHOLD_ANNUAL_2024:
-            income_tax_before_credits = taxable_income_for_tax_calc * INCOME_TAX_RATE_LOWER_2024
-        else:
-            income_tax_before_credits = (INCOME_TAX_THRESHOLD_ANNUAL_2024 * INCOME_TAX_RATE_LOWER_2024) + \
-                                      ((taxable_income_for_tax_calc - INCOME_TAX_THRESHOLD_ANNUAL_2024) * INCOME_TAX_RATE_HIGHER_2024)
-        total_tax_credits = PERSONAL_TAX_CREDIT_ANNUAL_2024 + other_annual_tax_credits
-        final_income_tax = max(0, income_tax_before_credits - total_tax_credits)
-        net_annual_income = gross_annual_income - health_insurance_employee - social_security_employee - final_income_tax
-        net_monthly_income = net_annual_income / 12 
-        net_daily_income = net_annual_income / work_days_per_year_input if work_days_per_year_input > 0 else 0
-
-    return {
-        "typ": "HPP (Zaměstnanec)", "rok_kalkulace": 2024,
-        "hruby_mesicni_prijem": round(gross_monthly_income, 2),
-        "hruby_rocni_prijem": round(gross_annual_income, 2),
-        "zamestnanec_rocni_zdravotni_pojisteni": round(health_insurance_employee, 2),
-        "zamestnanec_rocni_socialni_pojisteni": round(social_security_employee, 2),
-        "zamestnanec_konecna_rocni_dan_z_prijmu": round(final_income_tax, 2),
-        "cisty_rocni_prijem_zamestnanec": round(net_annual_income, 2),
-        "cisty_mesicni_prijem_zamestnanec": round(net_monthly_income, 2),
-        "cisty_denni_prijem_zamestnanec": round(net_daily_income, 2),
-        "zamestnavatel_celkove_rocni_naklady_na_zamestnance": round(total_employer_cost_annual, 2),
-        "zamestnavatel_celkove_mesicni_naklady_na_zamestnance": round(total_employer_cost_annual / 12 if gross_annual_income > 0 else 0, 2),
-    }
-
-def calculate_ico_pausalni_vydaje_income(
-    gross_annual_revenue: float, 
-    expense_percentage: float, 
-    realne_rocni_provozni_naklady: float = 0.0, 
-    other_annual_tax_credits: float = 0.0, 
-    participate_sickness_insurance: bool = False, 
-    sickness_insurance_assessment_base_monthly: float = MIN_ICO_SICKNESS_ASSESSMENT_BASE_MONTHLY_2024,
-    paid_vacation_days_by_client: int = 0, 
-    paid_sick_days_by_client: int = 0,    
-    actual_unpaid_vacation_days_taken: int = 0,
-    actual_unpaid_sick_days_taken: int = 0,
-    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR
-) -> dict:
-    # Initialize values for zero revenue case
-    net_annual_income_tax_method = 0
-    net_monthly_income_tax_method = 0
-    net_daily_income_tax_method_effective = 0
-    net_annual_disposable_income = 0
-    net_monthly_disposable_income = 0
-    net_daily_disposable_income_effective = 0
-    annual_expenses_for_tax = 0
-    profit_for_tax_purposes = 0
-    annual_social_security = 0
-    annual_health_insurance = 0
-    annual_sickness_insurance = 0
-    final_income_tax = 0
-    # Calculate effective work days based on all day inputs for the daily rate of *achieved* revenue
-    effective_work_days_for_achieved_revenue_rate = work_days_per_year_input - actual_unpaid_vacation_days_taken - actual_unpaid_sick_days_taken
-
-
-    if gross_annual_revenue < 0:
-        return {"error": "Hrubý roční příjem (obrat) nemůže být záporný."}
-    elif gross_annual_revenue > 0:
-        max_revenue_for_lump_sum_application = 2000000.0
-        applicable_revenue_for_lump_sum = min(gross_annual_revenue, max_revenue_for_lump_sum_application)
-        max_expense_claim_amount = 0
-        if expense_percentage == 0.80: max_expense_claim_amount = 1600000.0
-        elif expense_percentage == 0.60: max_expense_claim_amount = 1200000.0
-        elif expense_percentage == 0.40: max_expense_claim_amount = 800000.0
-        elif expense_percentage == 0.30: max_expense_claim_amount = 600000.0
-        else: return {"error": "Neplatné procento paušálních výdajů."}
-
-        calculated_expenses_for_tax = applicable_revenue_for_lump_sum * expense_percentage
-        annual_expenses_for_tax = min(calculated_expenses_for_tax, max_expense_claim_amount)
-        profit_for_tax_purposes = (gross_annual_revenue - annual_expenses_for_tax) if gross_annual_revenue <= max_revenue_for_lump_sum_application \
-                                    else (applicable_revenue_for_lump_sum - annual_expenses_for_tax) + (gross_annual_revenue - max_revenue_for_lump_sum_application)
-        assessment_base_insurance = profit_for_tax_purposes * ICO_PROFIT_ASSESSMENT_BASE_FACTOR_2024
-        min_annual_social_payment = ICO_MIN_SOCIAL_MONTHLY_MAIN_ACTIVITY_2024 * 12
-        effective_social_assessment_base = max(assessment_base_insurance, 131901.0 if profit_for_tax_purposes > 0 else 0)
-        annual_social_security = effective_social_assessment_base * ICO_SOCIAL_SECURITY_RATE_2024
-        annual_social_security = max(annual_social_security, min_annual_social_payment if profit_for_tax_purposes > 0 else 0)
-        min_annual_health_payment = ICO_MIN_HEALTH_MONTHLY_2024 * 12
-        effective_health_assessment_base = max(assessment_base_insurance, 226800.0 if profit_for_tax_purposes > 0 else 0)
-        annual_health_insurance = effective_health_assessment_base * ICO_HEALTH_INSURANCE_RATE_2024
-        annual_health_insurance = max(annual_health_insurance, min_annual_health_payment if profit_for_tax_purposes > 0 else 0)
-        annual_sickness_insurance = 0
-        if participate_sickness_insurance and profit_for_tax_purposes > 0:
-            actual_sickness_assessment_base_monthly = max(sickness_insurance_assessment_base_monthly, MIN_ICO_SICKNESS_ASSESSMENT_BASE_MONTHLY_2024)
-            monthly_sickness_payment = actual_sickness_assessment_base_monthly * ICO_SICKNESS_INSURANCE_RATE_2024
-            annual_sickness_insurance = max(monthly_sickness_payment, ICO_MIN_SICKNESS_MONTHLY_2024) * 12
-        tax_base_for_income_tax = profit_for_tax_purposes
-        income_tax_before_credits = 0
-        if tax_base_for_income_tax <= INCOME_TAX_THRESHOLD_ANNUAL_2024:
-            income_tax_before_credits = tax_base_for_income_tax * INCOME_TAX_RATE_LOWER_2024
-        else:
-            income_tax_before_credits = (INCOME_TAX_THRESHOLD_ANNUAL_2024 * INCOME_TAX_RATE_LOWER_2024) + \
-                                      ((tax_base_for_income_tax - INCOME_TAX_THRESHOLD_ANNUAL_2024) * INCOME_TAX_RATE_HIGHER_2024)
-        total_tax_credits = PERSONAL_TAX_CREDIT_ANNUAL_2024 + other_annual_tax_credits
-        final_income_tax = max(0, income_tax_before_credits - total_tax_credits)
-        net_annual_income_tax_method = profit_for_tax_purposes - annual_social_security - annual_health_insurance - annual_sickness_insurance - final_income_tax
-        net_monthly_income_tax_method = net_annual_income_tax_method / 12
-        total_annual_deductions_tax_method = annual_social_security + annual_health_insurance + annual_sickness_insurance + final_income_tax
-        net_annual_disposable_income = gross_annual_revenue - realne_rocni_provozni_naklady - total_annual_deductions_tax_method
-        net_monthly_disposable_income = net_annual_disposable_income / 12
-        
-        net_daily_income_tax_method_effective = net_annual_income_tax_method / effective_work_days_for_achieved_revenue_rate if effective_work_days_for_achieved_revenue_rate > 0 else 0
-        net_daily_disposable_income_effective = net_annual_disposable_income / effective_work_days_for_achieved_revenue_rate if effective_work_days_for_achieved_revenue_rate > 0 else 0
-
-    return {
-        "typ": "IČO (Paušální výdaje)", "rok_kalkulace": 2024,
-        "hruby_rocni_prijem_obrat": round(gross_annual_revenue, 2),
-        "hruby_mesicni_prijem_obrat_prumer": round(gross_annual_revenue / 12 if gross_annual_revenue > 0 else 0, 2),
-        "procento_pausalnich_vydaju": expense_percentage if gross_annual_revenue > 0 else 0,
-        "rocni_pausalni_vydaje_pro_dane": round(annual_expenses_for_tax, 2),
-        "zisk_pro_danove_ucely": round(profit_for_tax_purposes, 2),
-        "rocni_socialni_pojisteni": round(annual_social_security, 2),
-        "rocni_zdravotni_pojisteni": round(annual_health_insurance, 2),
-        "rocni_nemocenske_pojisteni": round(annual_sickness_insurance, 2),
-        "konecna_rocni_dan_z_prijmu": round(final_income_tax, 2),
-        "cisty_rocni_prijem_dle_pausalu": round(net_annual_income_tax_method, 2),
-        "cisty_mesicni_prijem_dle_pausalu": round(net_monthly_income_tax_method, 2),
-        "cisty_denni_prijem_dle_pausalu_efektivni": round(net_daily_income_tax_method_effective, 2),
-        "info_k_realnym_nakladum": {
-            "vstup_realne_rocni_provozni_naklady": round(realne_rocni_provozni_naklady, 2),
-            "cisty_rocni_prijem_disponibilni_po_realnych_nakladech": round(net_annual_disposable_income, 2),
-            "cisty_mesicni_prijem_disponibilni_po_realnych_nakladech": round(net_monthly_disposable_income, 2),
-            "cisty_denni_prijem_disponibilni_efektivni": round(net_daily_disposable_income_effective, 2)
-        },
-        "info_k_efektivite_dnu": { # For the primary calculation based on achieved revenue
-            "uvazovane_pracovni_dny_pro_denni_sazbu": effective_work_days_for_achieved_revenue_rate if effective_work_days_for_achieved_revenue_rate > 0 else work_days_per_year_input,
-            "paid_vacation_days_by_client": paid_vacation_days_by_client, # Keep for context
-            "paid_sick_days_by_client": paid_sick_days_by_client # Keep for context
-        }
-    }
-
-def calculate_ico_pausalni_dan_income(
-    gross_annual_revenue: float,
-    pausalni_dan_band: int,
-    actual_unpaid_vacation_days_taken: int = 0, 
-    actual_unpaid_sick_days_taken: int = 0,    
-    work_days_per_year_input: int = DEFAULT_WORK_DAYS_PER_YEAR
-) -> dict:
-    net_annual_income = 0
-    net_monthly_income = 0
-    net_daily_income_effective = 0
-    monthly_payment = 0
-    # Calculate effective work days based on *only unpaid* days for this mode
-    effective_work_days_for_rate = work_days_per_year_input - actual_unpaid_vacation_days_taken - actual_unpaid_sick_days_taken
-
-    if gross_annual_revenue < 0:
-        return {"error": "Hrubý roční příjem (obrat) nemůže být záporný."}
-    elif gross_annual_revenue == 0:
-        pass # All values remain 0
-    elif gross_annual_revenue > PAUSALNI_DAN_MAX_REVENUE_2024: 
-        return {"error": f"Příjem přesahuje limit {PAUSALNI_DAN_MAX_REVENUE_2024:,.0f} CZK pro paušální daň."}
-    else:
-        if pausalni_dan_band == 1: monthly_payment = PAUSALNI_DAN_BAND_1_MONTHLY_2024
-        elif pausalni_dan_band == 2: monthly_payment = PAUSALNI_DAN_BAND_2_MONTHLY_2024
-        elif pausalni_dan_band == 3: monthly_payment = PAUSALNI_DAN_BAND_3_MONTHLY_2024
-        else: return {"error": "Neplatné pásmo paušální daně."}
-        
-        annual_pausalni_dan_payment = monthly_payment * 12
-        net_annual_income = gross_annual_revenue - annual_pausalni_dan_payment
-        net_monthly_income = net_annual_income / 12
-        net_daily_income_effective = net_annual_income / effective_work_days_for_rate if effective_work_days_for_rate > 0 else 0
-    
-    return {
-        "typ": "IČO (Paušální daň)", "rok_kalkulace": 2024,
-        "hruby_rocni_prijem_obrat": round(gross_annual_revenue, 2),
-        "hruby_mesicni_prijem_obrat_prumer": round(gross_annual_revenue / 12 if gross_annual_revenue > 0 else 0, 2),
-        "zvolene_pasmo_pausalni_dane": pausalni_dan_band if gross_annual_revenue > 0 else "-",
-        "mesicni_platba_pausalni_dane": round(monthly_payment, 2),
-        "cisty_rocni_prijem": round(net_annual_income, 2),
-        "cisty_mesicni_prijem": round(net_monthly_income, 2),
-        "cisty_denni_prijem_efektivni": round(net_daily_income_effective, 2),
-        "info_k_efektivite_dnu": { 
-            "uvazovane_pracovni_dny_pro_denni_sazbu": effective_work_days_for_rate if effective_work_days_for_rate > 0 else work_days_per_year_input
-        }
-    }
-
-# --- Streamlit App UI ---
-st.title("CISKO - Čistý Srovnávací Kalkulátor Osoby (pro rok 2024)")
-st.caption("Porovnání příjmů HPP vs. IČO v České republice. Výpočty jsou orientační, konzultujte s daňovým poradcem.")
-
-# --- Globální nastavení ---
-with st.sidebar.expander("⚙️ Globální nastavení", expanded=True):
-    work_days_per_year_input = st.number_input("Počet pracovních dní v roce (základ)", min_value=200, max_value=300, value=DEFAULT_WORK_DAYS_PER_YEAR, step=1, help="Celkový počet potenciálních pracovních dní v roce. Používá se pro výpočet denních sazeb a pro odhad ušlého příjmu z neplaceného volna.", key="global_work_days")
-    other_annual_tax_credits_input = st.number_input("Jiné roční slevy na dani (mimo slevy na poplatníka)", value=0.0, min_value=0.0, step=100.0, format="%.0f", key="global_other_credits", help="Např. na děti, manželku/manžela bez vlastních příjmů, školkovné, úroky z hypotéky. Základní sleva na poplatníka je již zahrnuta automaticky.")
-
-# --- Scénář 1: HPP (Zaměstnanec) ---
-st.header("👤 Scénář 1: HPP (Zaměstnanec)")
-hpp_gross_monthly_income = st.number_input("Hrubá měsíční mzda (HPP)", value=50000.0, min_value=0.0, step=1000.0, format="%.0f", key="hpp_gross", help="Zadejte vaši hrubou měsíční mzdu.")
-
-# --- Scénář 2: IČO (OSVČ) ---
-st.header("💼 Scénář 2: IČO (OSVČ)")
-st.markdown("Zadejte váš **očekávaný/cílový hrubý roční obrat**, pokud byste pracoval(a) všechny plánované dny.")
-col_ico_input_type, col_ico_input_value = st.columns([1,2])
-with col_ico_input_type:
-    ico_input_period = st.selectbox("Zadat příjem IČO jako:", ("Roční obrat", "Měsíční fakturace", "Denní sazba (man-day rate)"), index=1, key="ico_input_period_select") # Default to Monthly
-with col_ico_input_value:
-    if ico_input_period == "Roční obrat":
-        ico_input_value_annual = st.number_input("Cílový hrubý roční obrat (IČO)", value=1200000.0, min_value=0.0, step=10000.0, format="%.0f", key="ico_revenue_annual_input", help="Celkový roční příjem před odečtením jakýchkoli výdajů, pokud byste pracoval(a) všechny plánované dny.")
-        ico_potential_gross_annual_revenue = ico_input_value_annual # This is the potential revenue
-    elif ico_input_period == "Měsíční fakturace":
-        ico_monthly_billing = st.number_input("Cílová průměrná měsíční fakturace (IČO)", value=100000.0, min_value=0.0, step=1000.0, format="%.0f", key="ico_revenue_monthly_input", help="Průměrná částka, kterou cílíte fakturovat za měsíc, pokud byste pracoval(a) všechny plánované dny.")
-        ico_potential_gross_annual_revenue = ico_monthly_billing * 12
-    elif ico_input_period == "Denní sazba (man-day rate)":
-        ico_daily_rate = st.number_input("Vaše denní sazba (man-day rate)", value=5000.0, min_value=0.0, step=100.0, format="%.0f", key="ico_daily_rate_input")
-        ico_mandays_per_year = st.number_input("Plánovaný počet fakturovaných člověkodní za rok", value=DEFAULT_MANDAYS_PER_YEAR_ICO, min_value=0, max_value=work_days_per_year_input, step=1, key="ico_mandays_input", help=f"Kolik dní v roce plánujete fakturovat. Max: {work_days_per_year_input} (dle globálního nastavení).")
-        ico_potential_gross_annual_revenue = ico_daily_rate * ico_mandays_per_year
-    else: 
-        ico_potential_gross_annual_revenue = 0.0
-
-st.markdown(f"**Cílový roční obrat IČO (před zohledněním neplaceného volna): {ico_potential_gross_annual_revenue:,.0f} CZK**")
-
-# --- Společná nastavení pro IČO - Optimalizace dnů ---
-st.subheader("Optimalizace dnů IČO")
-st.markdown("Tyto dny ovlivní váš **skutečný obrat** a **efektivní denní sazbu**.")
-col1_days_ico, col2_days_ico = st.columns(2) 
-with col1_days_ico:
-    # Removed 'paid_by_client' days from this section to simplify the "lost potential" calculation
-    # They are complex to factor into a simple reduction of potential revenue if revenue is already a target.
-    # Their main impact is on the daily rate of *achieved* revenue.
-    ico_unpaid_vacation = st.number_input("Vaše skutečná neplacená dovolená (dny)", value=20, min_value=0, max_value=work_days_per_year_input, step=1, key="ico_unpaid_vac_user_days_common", help="Dny, kdy si berete volno a nefakturujete. Snižuje váš skutečný obrat a počet dní, na které se rozpočítává čistý příjem.")
-with col2_days_ico:
-    ico_unpaid_sick = st.number_input("Vaše skutečné neplacené dny nemoci (dny)", value=5, min_value=0, max_value=work_days_per_year_input, step=1, key="ico_unpaid_sick_user_days_common", help="Dny, kdy jste nemocní a nefakturujete. Snižuje váš skutečný obrat a počet dní pro efektivní sazbu.")
-
-# Calculate the revenue adjusted for unpaid days BEFORE specific IČO mode settings
-days_not_earning = ico_unpaid_vacation + ico_unpaid_sick
-earning_days_ratio = max(0, work_days_per_year_input - days_not_earning) / work_days_per_year_input if work_days_per_year_input > 0 else 0
-ico_revenue_adjusted_for_unpaid_days = ico_potential_gross_annual_revenue * earning_days_ratio
-
-st.markdown(f"**Skutečný roční obrat IČO (po zohlednění neplaceného volna): {ico_revenue_adjusted_for_unpaid_days:,.0f} CZK**")
-
-
-ico_calculation_mode = st.radio("Režim výpočtu odvodů pro IČO:", 
-                                ("Paušální výdaje", "Paušální daň"), 
-                                key="ico_mode", horizontal=True, help="Zvolte, zda chcete počítat s procentuálními paušálními výdaji nebo se zjednodušenou paušální daní.")
-
-# --- Nastavení specifická pro režim IČO ---
-if ico_calculation_mode == "Paušální výdaje":
-    st.subheader("Nastavení pro IČO - Paušální výdaje")
-    col1_ico_pv, col2_ico_pv = st.columns(2)
-    with col1_ico_pv:
-        # Dynamic max expense display in format_func
-        current_revenue_for_expense_display = ico_revenue_adjusted_for_unpaid_days # Use adjusted revenue for this display
-        ico_expense_percentage = st.selectbox("Procento paušálních výdajů", (0.60, 0.40, 0.80, 0.30), 
-                                            format_func=lambda x: f"{int(x*100)}% (max. {min(2000000, current_revenue_for_expense_display if current_revenue_for_expense_display else 0)*x:,.0f} Kč výdajů)", 
-                                            key="ico_expense_perc", 
-                                            help="60% pro většinu živností, 40% pro některá svobodná povolání, 80% pro řemesla a zemědělství.")
-        ico_realne_rocni_naklady = st.number_input("Reálné roční provozní náklady (IČO)", value=60000.0, min_value=0.0, step=1000.0, format="%.0f", key="ico_real_costs", help="Vaše skutečné náklady na podnikání (software, nájem, telefon atd.). Používá se pro výpočet 'disponibilního' čistého příjmu, který vám reálně zbyde.")
-    with col2_ico_pv:
-        ico_participate_sickness = st.checkbox("Účastnit se dobrovolného nemocenského pojištění OSVČ?", value=False, key="ico_sickness_insurance", help="Poskytuje nárok na nemocenskou dávku v případě pracovní neschopnosti.")
-        ico_sickness_base = 0.0 
-        if ico_participate_sickness:
-            ico_sickness_base = st.number_input("Měsíční vyměřovací základ pro nemocenské", value=float(MIN_ICO_SICKNESS_ASSESSMENT_BASE_MONTHLY_2024), min_value=float(MIN_ICO_SICKNESS_ASSESSMENT_BASE_MONTHLY_2024), step=100.0, format="%.0f", key="ico_sickness_base", help=f"Minimálně {MIN_ICO_SICKNESS_ASSESSMENT_BASE_MONTHLY_2024:,.0f} CZK. Ovlivňuje výši případné nemocenské dávky.")
-
-elif ico_calculation_mode == "Paušální daň":
-    st.subheader("Nastavení pro IČO - Paušální daň")
-    ico_pausalni_dan_band = st.selectbox("Pásmo paušální daně", (1, 2, 3), key="ico_pausal_band", help="Výběr pásma závisí na výši a charakteru vašich příjmů. Ověřte si podmínky.")
-    
-    band_descriptions = {
-        1: f"**1. pásmo (cca {PAUSALNI_DAN_BAND_1_MONTHLY_2024:,.0f} Kč/měs.):** Pro OSVČ s ročními příjmy do 1 mil. Kč (bez ohledu na typ výdajového paušálu, který by jinak uplatnily), NEBO do 1,5 mil. Kč, pokud alespoň 75 % jejich příjmů by spadalo pod 80% nebo 60% výdajový paušál, NEBO do 2 mil. Kč, pokud alespoň 75 % příjmů by spadalo pod 80% výdajový paušál.",
-        2: f"**2. pásmo (cca {PAUSALNI_DAN_BAND_2_MONTHLY_2024:,.0f} Kč/měs.):** Pro OSVČ s ročními příjmy do 1,5 mil. Kč (pokud nesplňují podmínky pro 1. pásmo při tomto příjmu), NEBO do 2 mil. Kč, pokud alespoň 75 % jejich příjmů by spadalo pod 80% nebo 60% výdajový paušál.",
-        3: f"**3. pásmo (cca {PAUSALNI_DAN_BAND_3_MONTHLY_2024:,.0f} Kč/měs.):** Pro OSVČ s ročními příjmy do 2 mil. Kč (pokud nesplňují podmínky pro 1. nebo 2. pásmo při tomto příjmu)."
-    }
-    st.info(band_descriptions.get(ico_pausalni_dan_band, "Zvolte pásmo pro zobrazení popisu."))
-    st.markdown("Podmínkou pro paušální daň je také nebýt plátcem DPH (a další specifické podmínky).")
-
-
-# --- Tlačítko pro výpočet a zobrazení výsledků ---
-if st.button("📊 Spočítat a porovnat", type="primary", use_container_width=True):
-    results_hpp = {}
-    # This will store results based on revenue_adjusted_for_unpaid_days
-    results_ico_adjusted = {} 
-
-    # Výpočet HPP
-    if hpp_gross_monthly_income >= 0: 
-        results_hpp = calculate_hpp_income(
-            gross_monthly_income=hpp_gross_monthly_income,
-            other_annual_tax_credits=other_annual_tax_credits_input,
-            work_days_per_year_input=work_days_per_year_input
-        )
-    
-    # Výpočet IČO (použije se revenue_adjusted_for_unpaid_days)
-    if ico_revenue_adjusted_for_unpaid_days >= 0: 
-        if ico_calculation_mode == "Paušální výdaje":
-            sickness_base_to_pass = ico_sickness_base if ico_participate_sickness else 0.0
-            results_ico_adjusted = calculate_ico_pausalni_vydaje_income(
-                gross_annual_revenue=ico_revenue_adjusted_for_unpaid_days, # Use adjusted revenue
-                expense_percentage=ico_expense_percentage,
-                realne_rocni_provozni_naklady=ico_realne_rocni_naklady,
-                other_annual_tax_credits=other_annual_tax_credits_input,
-                participate_sickness_insurance=ico_participate_sickness,
-                sickness_insurance_assessment_base_monthly=sickness_base_to_pass,
-                # For this "true net" calculation, paid_by_client days are less relevant as we reduced gross revenue
-                actual_unpaid_vacation_days_taken=ico_unpaid_vacation, 
-                actual_unpaid_sick_days_taken=ico_unpaid_sick,
-                work_days_per_year_input=work_days_per_year_input 
-            )
-        elif ico_calculation_mode == "Paušální daň":
-            results_ico_adjusted = calculate_ico_pausalni_dan_income(
-                gross_annual_revenue=ico_revenue_adjusted_for_unpaid_days, # Use adjusted revenue
-                pausalni_dan_band=ico_pausalni_dan_band,
-                actual_unpaid_vacation_days_taken=ico_unpaid_vacation, 
-                actual_unpaid_sick_days_taken=ico_unpaid_sick,       
-                work_days_per_year_input=work_days_per_year_input
-            )
-    
-    # --- Zobrazení výsledků ---
-    st.divider()
-    st.header("📈 Výsledky porovnání")
-
-    col_hpp_res, col_ico_res = st.columns(2)
-
-    with col_hpp_res:
-        st.subheader("HPP (Zaměstnanec)")
-        if results_hpp and "error" not in results_hpp:
-            st.metric("Čistý měsíční příjem (HPP)", f"{results_hpp.get('cisty_mesicni_prijem_zamestnanec', 0):,.0f} CZK")
-            # ... (ostatní HPP detaily jako dříve) ...
-            st.markdown(f"**Hrubá měsíční mzda:** {results_hpp.get('hruby_mesicni_prijem', 0):,.0f} CZK")
-            st.markdown(f"**Roční čistý příjem:** {results_hpp.get('cisty_rocni_prijem_zamestnanec', 0):,.0f} CZK")
-            st.markdown(f"**Denní čistý příjem (průměr):** {results_hpp.get('cisty_denni_prijem_zamestnanec', 0):,.0f} CZK ({work_days_per_year_input} prac. dní)")
-            with st.expander("Více detailů pro HPP"):
-                st.write(f"Roční ZP (zaměstnanec): {results_hpp.get('zamestnanec_rocni_zdravotni_pojisteni', 0):,.0f} CZK")
-                st.write(f"Roční SP (zaměstnanec): {results_hpp.get('zamestnanec_rocni_socialni_pojisteni', 0):,.0f} CZK")
-                st.write(f"Roční daň z příjmů: {results_hpp.get('zamestnanec_konecna_rocni_dan_z_prijmu', 0):,.0f} CZK")
-                st.markdown("---")
-                st.write(f"**Celkové měsíční náklady zaměstnavatele:** {results_hpp.get('zamestnavatel_celkove_mesicni_naklady_na_zamestnance', 0):,.0f} CZK")
-                st.write(f"**Celkové roční náklady zaměstnavatele:** {results_hpp.get('zamestnavatel_celkove_rocni_naklady_na_zamestnance', 0):,.0f} CZK")
-
-        elif results_hpp and "error" in results_hpp : 
-            st.error(f"Chyba HPP: {results_hpp['error']}")
-        elif hpp_gross_monthly_income <= 0 and st.session_state.get("calculate_button_clicked", False):
-             st.info("Zadejte kladnou hrubou mzdu pro HPP.")
-        
-            
-    with col_ico_res:
-        st.subheader(f"IČO (OSVČ) - {ico_calculation_mode}")
-        # Display results based on revenue_adjusted_for_unpaid_days
-        if results_ico_adjusted and "error" not in results_ico_adjusted:
-            main_ico_metric_label = "Skutečný čistý měsíční příjem (IČO)"
-            main_ico_metric_value = 0
-            daily_ico_metric_label = "Skutečný čistý denní příjem (IČO - efektivní)"
-            daily_ico_metric_value = 0
-            
-            if ico_calculation_mode == "Paušální výdaje":
-                main_ico_metric_value = results_ico_adjusted.get('info_k_realnym_nakladum', {}).get('cisty_mesicni_prijem_disponibilni_po_realnych_nakladech', 0)
-                daily_ico_metric_value = results_ico_adjusted.get('info_k_realnym_nakladum', {}).get('cisty_denni_prijem_disponibilni_efektivni', 0)
-            elif ico_calculation_mode == "Paušální daň":
-                main_ico_metric_value = results_ico_adjusted.get('cisty_mesicni_prijem', 0)
-                daily_ico_metric_value = results_ico_adjusted.get('cisty_denni_prijem_efektivni', 0)
-
-            st.metric(main_ico_metric_label, f"{main_ico_metric_value:,.0f} CZK", help="Čistý příjem po zaplacení odvodů, vypočítaný z obratu sníženého o neplacené volno.")
-            st.markdown(f"**Cílový roční obrat (před úpravou):** {ico_potential_gross_annual_revenue:,.0f} CZK")
-            st.markdown(f"**Skutečný roční obrat (po úpravě o neplac. volno):** {results_ico_adjusted.get('hruby_rocni_prijem_obrat',0):,.0f} CZK")
-            st.markdown(f"**{daily_ico_metric_label}:** {daily_ico_metric_value:,.0f} CZK ({results_ico_adjusted.get('info_k_efektivite_dnu', {}).get('uvazovane_pracovni_dny_pro_denni_sazbu', 'N/A')} prac. dní)")
-            
-            with st.expander(f"Více detailů pro IČO ({ico_calculation_mode} - po úpravě obratu)"):
-                if ico_calculation_mode == "Paušální výdaje":
-                    st.write(f"Roční SP: {results_ico_adjusted.get('rocni_socialni_pojisteni', 0):,.0f} CZK")
-                    st.write(f"Roční ZP: {results_ico_adjusted.get('rocni_zdravotni_pojisteni', 0):,.0f} CZK")
-                    st.write(f"Roční NP: {results_ico_adjusted.get('rocni_nemocenske_pojisteni', 0):,.0f} CZK")
-                    st.write(f"Roční daň: {results_ico_adjusted.get('konecna_rocni_dan_z_prijmu', 0):,.0f} CZK")
-                    st.write(f"Zisk pro daň. účely: {results_ico_adjusted.get('zisk_pro_danove_ucely', 0):,.0f} CZK")
-                    st.write(f"Reálné roční náklady: {results_ico_adjusted.get('info_k_realnym_nakladum', {}).get('vstup_realne_rocni_provozni_naklady', 0):,.0f} CZK")
-                elif ico_calculation_mode == "Paušální daň":
-                    st.write(f"Zvolené pásmo: {results_ico_adjusted.get('zvolene_pasmo_pausalni_dane', 'N/A')}")
-                    st.write(f"Měsíční platba paušální daně: {results_ico_adjusted.get('mesicni_platba_pausalni_dane', 0):,.0f} CZK")
-                st.write(f"Efektivní pracovní dny: {results_ico_adjusted.get('info_k_efektivite_dnu', {}).get('uvazovane_pracovni_dny_pro_denni_sazbu', 'N/A')}")
-
-        elif results_ico_adjusted and "error" in results_ico_adjusted: 
-            st.error(f"Chyba IČO: {results_ico_adjusted['error']}")
-        elif ico_potential_gross_annual_revenue <= 0 and st.session_state.get("calculate_button_clicked", False):
-            st.info("Zadejte kladný cílový obrat pro IČO.")
-
-
-    # --- Grafické srovnání ---
-    if results_hpp and "error" not in results_hpp and results_ico_adjusted and "error" not in results_ico_adjusted:
-        st.divider()
-        st.subheader("📊 Grafické srovnání čistých měsíčních příjmů")
-        
-        hpp_net_monthly = results_hpp.get('cisty_mesicni_prijem_zamestnanec', 0)
-        
-        ico_net_monthly_adjusted = 0
-        if ico_calculation_mode == "Paušální výdaje":
-            info_realne_naklady = results_ico_adjusted.get('info_k_realnym_nakladum', {})
-            if isinstance(info_realne_naklady, dict):
-                 ico_net_monthly_adjusted = info_realne_naklady.get('cisty_mesicni_prijem_disponibilni_po_realnych_nakladech', 0)
-        elif ico_calculation_mode == "Paušální daň":
-            ico_net_monthly_adjusted = results_ico_adjusted.get('cisty_mesicni_prijem', 0)
-            
-        chart_data_list = [
-            {"Typ příjmu": "HPP", "Čistý měsíční příjem (CZK)": hpp_net_monthly},
-            # For the graph, we show the "true clear income" after unpaid days adjustment
-            {"Typ příjmu": f"IČO ({ico_calculation_mode}) - Skutečný", "Čistý měsíční příjem (CZK)": ico_net_monthly_adjusted}
-        ]
-        
-        try:
-            import pandas as pd
-            df_chart = pd.DataFrame(chart_data_list)
-            st.bar_chart(df_chart.set_index("Typ příjmu"))
-        except ImportError: 
-            st.bar_chart(chart_data_list, x="Typ příjmu", y="Čistý měsíční příjem (CZK)")
-
-
-    elif (results_hpp and "error" in results_hpp) or (results_ico_adjusted and "error" in results_ico_adjusted):
-        st.warning("Opravte prosím chyby ve vstupech pro zobrazení grafu.")
-    
-    st.session_state.calculate_button_clicked = True
-
-
-if "calculate_button_clicked" not in st.session_state:
-    st.session_state.calculate_button_clicked = False
-
-st.markdown("---")
-st.caption("Data a výpočty jsou platné pro rok 2024 a mají pouze orientační charakter. Pro přesné finanční plánování a daňové poradenství se vždy obraťte na kvalifikovaného daňového poradce.")
-
-# --- Footer ---
-st.markdown("---")
-st.markdown("Vytvořeno pro šišku ❤️")
+import functools
+import uuid
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import json # For potential debugging or displaying raw dicts, not primary for UI
+
+# All constants and calculation functions live in the Streamlit-free engine module
+from cisko.engine import (
+    DEFAULT_MANDAYS_PER_YEAR_ICO,
+    DEFAULT_WORK_DAYS_PER_YEAR,
+)
+# Results are memoized across reruns and sessions of this server process, as
+# compact records; .get() and [] round only the values the page displays
+from cisko.cache import (
+    cache_stats,
+    cached_calculate_hpp_income_record,
+)
+from cisko.params import DEFAULT_TAX_YEAR, available_tax_years, get_tax_params
+from cisko.montecarlo import simulate_ico_income
+from cisko.optimizer import rank_regimes
+from cisko.preload import preload_in_background, preload_status
+from cisko.profiling import PROFILER
+from cisko.scenarios import ICO_INPUT_PERIODS, ICO_MODES, ScenarioStore, decode_scenario, encode_scenario
+from cisko.solver import break_even_gross_monthly_hpp, break_even_table, break_even_table_batch
+from cisko.sweep import DEFAULT_MAX_GROSS_MONTHLY, build_sweep, slice_sweep
+from cisko.timeline import CashFlowTimeline
+
+# --- Streamlit App UI ---
+st.set_page_config(page_title="CISKO - Kalkulátor Příjmů", layout="wide", initial_sidebar_state="expanded") 
+
+# Opt-in phase timings (CISKO_PROFILE=1); the checkpoints below cost nothing when disabled
+if PROFILER.enabled and "profiling_session_id" not in st.session_state:
+    st.session_state.profiling_session_id = uuid.uuid4().hex[:8]
+rerun_timer = PROFILER.start_rerun(st.session_state.get("profiling_session_id", ""))
+
+
+def profiled_fragment(phase: str):
+    """``st.fragment`` whose reruns of only the fragment are timed as ``phase``.
+
+    Within a full rerun the fragment is timed by the page checkpoints instead.
+    """
+    def decorate(render):
+        @functools.wraps(render)
+        def run(*args, **kwargs):
+            ctx = get_script_run_ctx() if PROFILER.enabled else None
+            if ctx is None or not ctx.fragment_ids_this_run:
+                return render(*args, **kwargs)
+            with PROFILER.start_fragment_rerun(st.session_state.get("profiling_session_id", ""), phase):
+                return render(*args, **kwargs)
+        return st.fragment(run)
+    return decorate
+
+
+@st.cache_resource
+def get_scenario_store() -> ScenarioStore:
+    return ScenarioStore()
+
+
+# Scenario field -> key of the widget that edits it
+SCENARIO_WIDGETS = {
+    "tax_year": "global_tax_year",
+    "work_days_per_year_input": "global_work_days",
+    "other_annual_tax_credits": "global_other_credits",
+    "hpp_gross_monthly_income": "hpp_gross",
+    "ico_input_period": "ico_input_period_select",
+    "ico_annual_revenue": "ico_revenue_annual_input",
+    "ico_monthly_billing": "ico_revenue_monthly_input",
+    "ico_daily_rate": "ico_daily_rate_input",
+    "ico_mandays_per_year": "ico_mandays_input",
+    "ico_unpaid_vacation": "ico_unpaid_vac_user_days_common",
+    "ico_unpaid_sick": "ico_unpaid_sick_user_days_common",
+    "ico_mode": "ico_mode",
+    "expense_percentage": "ico_expense_perc",
+    "realne_rocni_provozni_naklady": "ico_real_costs",
+    "participate_sickness_insurance": "ico_sickness_insurance",
+    "sickness_insurance_assessment_base_monthly": "ico_sickness_base",
+    "pausalni_dan_band": "ico_pausal_band",
+}
+
+# --- Permalink: a session opened with scenario query parameters starts from them ---
+if "permalink_checked" not in st.session_state:
+    st.session_state.permalink_checked = True
+    permalink_scenario, permalink_invalid = decode_scenario(st.query_params)
+    for field, value in permalink_scenario.items():
+        st.session_state[SCENARIO_WIDGETS[field]] = value
+    if permalink_scenario:
+        st.session_state.permalink_autorun = True
+    if permalink_invalid:
+        st.warning(f"Některé parametry odkazu jsou neplatné a byly ignorovány: {', '.join(permalink_invalid)}")
+
+# --- Globální nastavení ---
+with st.sidebar.expander("⚙️ Globální nastavení", expanded=True):
+    tax_years = available_tax_years()
+    tax_year = st.selectbox("Daňový rok", tax_years, index=tax_years.index(DEFAULT_TAX_YEAR), key="global_tax_year", help="Sazby, minimální zálohy a limity se použijí pro zvolený rok.")
+    work_days_per_year_input = st.number_input("Počet pracovních dní v roce (základ)", min_value=200, max_value=300, value=DEFAULT_WORK_DAYS_PER_YEAR, step=1, help="Celkový počet potenciálních pracovních dní v roce. Používá se pro výpočet denních sazeb a pro odhad ušlého příjmu z neplaceného volna.", key="global_work_days")
+    other_annual_tax_credits_input = st.number_input("Jiné roční slevy na dani (mimo slevy na poplatníka)", value=0.0, min_value=0.0, step=100.0, format="%.0f", key="global_other_credits", help="Např. na děti, manželku/manžela bez vlastních příjmů, školkovné, úroky z hypotéky. Základní sleva na poplatníka je již zahrnuta automaticky.")
+tax_params = get_tax_params(tax_year)
+
+st.title(f"CISKO - Čistý Srovnávací Kalkulátor Osoby (pro rok {tax_year})")
+st.caption("Porovnání příjmů HPP vs. IČO v České republice. Výpočty jsou orientační, konzultujte s daňovým poradcem.")
+
+# --- Scénář 1: HPP (Zaměstnanec) ---
+st.header("👤 Scénář 1: HPP (Zaměstnanec)")
+hpp_gross_monthly_income = st.number_input("Hrubá měsíční mzda (HPP)", value=50000.0, min_value=0.0, step=1000.0, format="%.0f", key="hpp_gross", help="Zadejte vaši hrubou měsíční mzdu.")
+
+# --- Scénář 2: IČO (OSVČ) ---
+st.header("💼 Scénář 2: IČO (OSVČ)")
+st.markdown("Zadejte váš **očekávaný/cílový hrubý roční obrat**, pokud byste pracoval(a) všechny plánované dny.")
+col_ico_input_type, col_ico_input_value = st.columns([1,2])
+with col_ico_input_type:
+    ico_input_period = st.selectbox("Zadat příjem IČO jako:", ICO_INPUT_PERIODS, index=1, key="ico_input_period_select") # Default to Monthly
+with col_ico_input_value:
+    if ico_input_period == "Roční obrat":
+        ico_input_value_annual = st.number_input("Cílový hrubý roční obrat (IČO)", value=1200000.0, min_value=0.0, step=10000.0, format="%.0f", key="ico_revenue_annual_input", help="Celkový roční příjem před odečtením jakýchkoli výdajů, pokud byste pracoval(a) všechny plánované dny.")
+        ico_potential_gross_annual_revenue = ico_input_value_annual # This is the potential revenue
+    elif ico_input_period == "Měsíční fakturace":
+        ico_monthly_billing = st.number_input("Cílová průměrná měsíční fakturace (IČO)", value=100000.0, min_value=0.0, step=1000.0, format="%.0f", key="ico_revenue_monthly_input", help="Průměrná částka, kterou cílíte fakturovat za měsíc, pokud byste pracoval(a) všechny plánované dny.")
+        ico_potential_gross_annual_revenue = ico_monthly_billing * 12
+    elif ico_input_period == "Denní sazba (man-day rate)":
+        ico_daily_rate = st.number_input("Vaše denní sazba (man-day rate)", value=5000.0, min_value=0.0, step=100.0, format="%.0f", key="ico_daily_rate_input")
+        ico_mandays_per_year = st.number_input("Plánovaný počet fakturovaných člověkodní za rok", value=DEFAULT_MANDAYS_PER_YEAR_ICO, min_value=0, max_value=work_days_per_year_input, step=1, key="ico_mandays_input", help=f"Kolik dní v roce plánujete fakturovat. Max: {work_days_per_year_input} (dle globálního nastavení).")
+        ico_potential_gross_annual_revenue = ico_daily_rate * ico_mandays_per_year
+    else: 
+        ico_potential_gross_annual_revenue = 0.0
+
+st.markdown(f"**Cílový roční obrat IČO (před zohledněním neplaceného volna): {ico_potential_gross_annual_revenue:,.0f} CZK**")
+
+# --- Společná nastavení pro IČO - Optimalizace dnů ---
+st.subheader("Optimalizace dnů IČO")
+st.markdown("Tyto dny ovlivní váš **skutečný obrat** a **efektivní denní sazbu**.")
+col1_days_ico, col2_days_ico = st.columns(2) 
+with col1_days_ico:
+    # Removed 'paid_by_client' days from this section to simplify the "lost potential" calculation
+    # They are complex to factor into a simple reduction of potential revenue if revenue is already a target.
+    # Their main impact is on the daily rate of *achieved* revenue.
+    ico_unpaid_vacation = st.number_input("Vaše skutečná neplacená dovolená (dny)", value=20, min_value=0, max_value=work_days_per_year_input, step=1, key="ico_unpaid_vac_user_days_common", help="Dny, kdy si berete volno a nefakturujete. Snižuje váš skutečný obrat a počet dní, na které se rozpočítává čistý příjem.")
+with col2_days_ico:
+    ico_unpaid_sick = st.number_input("Vaše skutečné neplacené dny nemoci (dny)", value=5, min_value=0, max_value=work_days_per_year_input, step=1, key="ico_unpaid_sick_user_days_common", help="Dny, kdy jste nemocní a nefakturujete. Snižuje váš skutečný obrat a počet dní pro efektivní sazbu.")
+
+# Calculate the revenue adjusted for unpaid days BEFORE specific IČO mode settings
+days_not_earning = ico_unpaid_vacation + ico_unpaid_sick
+earning_days_ratio = max(0, work_days_per_year_input - days_not_earning) / work_days_per_year_input if work_days_per_year_input > 0 else 0
+ico_revenue_adjusted_for_unpaid_days = ico_potential_gross_annual_revenue * earning_days_ratio
+
+st.markdown(f"**Skutečný roční obrat IČO (po zohlednění neplaceného volna): {ico_revenue_adjusted_for_unpaid_days:,.0f} CZK**")
+
+
+ico_calculation_mode = st.radio("Režim výpočtu odvodů pro IČO:", 
+                                ICO_MODES, 
+                                key="ico_mode", horizontal=True, help="Zvolte, zda chcete počítat s procentuálními paušálními výdaji nebo se zjednodušenou paušální daní.")
+
+# --- Nastavení specifická pro režim IČO ---
+if ico_calculation_mode == "Paušální výdaje":
+    st.subheader("Nastavení pro IČO - Paušální výdaje")
+    col1_ico_pv, col2_ico_pv = st.columns(2)
+    with col1_ico_pv:
+        # Dynamic max expense display in format_func
+        current_revenue_for_expense_display = ico_revenue_adjusted_for_unpaid_days # Use adjusted revenue for this display
+        ico_expense_percentage = st.selectbox("Procento paušálních výdajů", (0.60, 0.40, 0.80, 0.30), 
+                                            format_func=lambda x: f"{int(x*100)}% (max. {min(tax_params.max_revenue_for_lump_sum, current_revenue_for_expense_display if current_revenue_for_expense_display else 0)*x:,.0f} Kč výdajů)", 
+                                            key="ico_expense_perc", 
+                                            help="60% pro většinu živností, 40% pro některá svobodná povolání, 80% pro řemesla a zemědělství.")
+        ico_realne_rocni_naklady = st.number_input("Reálné roční provozní náklady (IČO)", value=60000.0, min_value=0.0, step=1000.0, format="%.0f", key="ico_real_costs", help="Vaše skutečné náklady na podnikání (software, nájem, telefon atd.). Používá se pro výpočet 'disponibilního' čistého příjmu, který vám reálně zbyde.")
+    with col2_ico_pv:
+        ico_participate_sickness = st.checkbox("Účastnit se dobrovolného nemocenského pojištění OSVČ?", value=False, key="ico_sickness_insurance", help="Poskytuje nárok na nemocenskou dávku v případě pracovní neschopnosti.")
+        ico_sickness_base = 0.0 
+        if ico_participate_sickness:
+            ico_sickness_base = st.number_input("Měsíční vyměřovací základ pro nemocenské", value=float(tax_params.min_ico_sickness_assessment_base_monthly), min_value=float(tax_params.min_ico_sickness_assessment_base_monthly), step=100.0, format="%.0f", key="ico_sickness_base", help=f"Minimálně {tax_params.min_ico_sickness_assessment_base_monthly:,.0f} CZK. Ovlivňuje výši případné nemocenské dávky.")
+
+elif ico_calculation_mode == "Paušální daň":
+    st.subheader("Nastavení pro IČO - Paušální daň")
+    ico_pausalni_dan_band = st.selectbox("Pásmo paušální daně", (1, 2, 3), key="ico_pausal_band", help="Výběr pásma závisí na výši a charakteru vašich příjmů. Ověřte si podmínky.")
+    
+    band_descriptions = {
+        1: f"**1. pásmo (cca {tax_params.pausalni_dan_bands_monthly[1]:,.0f} Kč/měs.):** Pro OSVČ s ročními příjmy do 1 mil. Kč (bez ohledu na typ výdajového paušálu, který by jinak uplatnily), NEBO do 1,5 mil. Kč, pokud alespoň 75 % jejich příjmů by spadalo pod 80% nebo 60% výdajový paušál, NEBO do 2 mil. Kč, pokud alespoň 75 % příjmů by spadalo pod 80% výdajový paušál.",
+        2: f"**2. pásmo (cca {tax_params.pausalni_dan_bands_monthly[2]:,.0f} Kč/měs.):** Pro OSVČ s ročními příjmy do 1,5 mil. Kč (pokud nesplňují podmínky pro 1. pásmo při tomto příjmu), NEBO do 2 mil. Kč, pokud alespoň 75 % jejich příjmů by spadalo pod 80% nebo 60% výdajový paušál.",
+        3: f"**3. pásmo (cca {tax_params.pausalni_dan_bands_monthly[3]:,.0f} Kč/měs.):** Pro OSVČ s ročními příjmy do 2 mil. Kč (pokud nesplňují podmínky pro 1. nebo 2. pásmo při tomto příjmu)."
+    }
+    st.info(band_descriptions.get(ico_pausalni_dan_band, "Zvolte pásmo pro zobrazení popisu."))
+    st.markdown("Podmínkou pro paušální daň je také nebýt plátcem DPH (a další specifické podmínky).")
+
+
+current_scenario = {
+    "tax_year": tax_year,
+    "work_days_per_year_input": work_days_per_year_input,
+    "other_annual_tax_credits": other_annual_tax_credits_input,
+    "hpp_gross_monthly_income": hpp_gross_monthly_income,
+    "ico_input_period": ico_input_period,
+    "ico_annual_revenue": st.session_state.get("ico_revenue_annual_input"),
+    "ico_monthly_billing": st.session_state.get("ico_revenue_monthly_input"),
+    "ico_daily_rate": st.session_state.get("ico_daily_rate_input"),
+    "ico_mandays_per_year": st.session_state.get("ico_mandays_input"),
+    "ico_unpaid_vacation": ico_unpaid_vacation,
+    "ico_unpaid_sick": ico_unpaid_sick,
+    "ico_mode": ico_calculation_mode,
+}
+if ico_calculation_mode == "Paušální výdaje":
+    current_scenario.update(
+        expense_percentage=ico_expense_percentage,
+        realne_rocni_provozni_naklady=ico_realne_rocni_naklady,
+        participate_sickness_insurance=ico_participate_sickness,
+        sickness_insurance_assessment_base_monthly=ico_sickness_base if ico_participate_sickness else None,
+    )
+else:
+    current_scenario["pausalni_dan_band"] = ico_pausalni_dan_band
+# Inputs of the other input periods are None until their widgets are shown once
+current_scenario = {field: value for field, value in current_scenario.items() if value is not None}
+# The address bar always holds the permalink of what is on the screen
+permalink_params = encode_scenario(current_scenario)
+if st.query_params.to_dict() != permalink_params:
+    st.query_params.from_dict(permalink_params)
+
+rerun_timer.checkpoint("vstupy")
+
+# The detail breakdowns are fragments rendered only while expanded; opening one
+# reruns just that fragment, so the results above stay on the page
+@profiled_fragment("fragment_hpp_detail")
+def render_hpp_details(results_hpp):
+    details = st.expander("Více detailů pro HPP", key="hpp_details", on_change="rerun")
+    if details.open:
+        with details:
+            st.write(f"Roční ZP (zaměstnanec): {results_hpp.get('zamestnanec_rocni_zdravotni_pojisteni', 0):,.0f} CZK")
+            st.write(f"Roční SP (zaměstnanec): {results_hpp.get('zamestnanec_rocni_socialni_pojisteni', 0):,.0f} CZK")
+            st.write(f"Roční daň z příjmů: {results_hpp.get('zamestnanec_konecna_rocni_dan_z_prijmu', 0):,.0f} CZK")
+            st.markdown("---")
+            st.write(f"**Celkové měsíční náklady zaměstnavatele:** {results_hpp.get('zamestnavatel_celkove_mesicni_naklady_na_zamestnance', 0):,.0f} CZK")
+            st.write(f"**Celkové roční náklady zaměstnavatele:** {results_hpp.get('zamestnavatel_celkove_rocni_naklady_na_zamestnance', 0):,.0f} CZK")
+
+
+@profiled_fragment("fragment_ico_detail")
+def render_ico_details(results_ico_adjusted, ico_calculation_mode):
+    details = st.expander(f"Více detailů pro IČO ({ico_calculation_mode} - po úpravě obratu)", key="ico_details", on_change="rerun")
+    if details.open:
+        with details:
+            if ico_calculation_mode == "Paušální výdaje":
+                st.write(f"Roční SP: {results_ico_adjusted.get('rocni_socialni_pojisteni', 0):,.0f} CZK")
+                st.write(f"Roční ZP: {results_ico_adjusted.get('rocni_zdravotni_pojisteni', 0):,.0f} CZK")
+                st.write(f"Roční NP: {results_ico_adjusted.get('rocni_nemocenske_pojisteni', 0):,.0f} CZK")
+                st.write(f"Roční daň: {results_ico_adjusted.get('konecna_rocni_dan_z_prijmu', 0):,.0f} CZK")
+                st.write(f"Zisk pro daň. účely: {results_ico_adjusted.get('zisk_pro_danove_ucely', 0):,.0f} CZK")
+                st.write(f"Reálné roční náklady: {results_ico_adjusted.get('info_k_realnym_nakladum', {}).get('vstup_realne_rocni_provozni_naklady', 0):,.0f} CZK")
+            elif ico_calculation_mode == "Paušální daň":
+                st.write(f"Zvolené pásmo: {results_ico_adjusted.get('zvolene_pasmo_pausalni_dane', 'N/A')}")
+                st.write(f"Měsíční platba paušální daně: {results_ico_adjusted.get('mesicni_platba_pausalni_dane', 0):,.0f} CZK")
+            st.write(f"Efektivní pracovní dny: {results_ico_adjusted.get('info_k_efektivite_dnu', {}).get('uvazovane_pracovni_dny_pro_denni_sazbu', 'N/A')}")
+
+
+# --- Tlačítko pro výpočet a zobrazení výsledků ---
+# A permalink shows its results right away
+if st.button("📊 Spočítat a porovnat", type="primary", use_container_width=True) or st.session_state.pop("permalink_autorun", False):
+    # A known scenario is a lookup in the scenario store, a new one is computed and stored
+    scenario_results, scenario_from_store = get_scenario_store().get_or_calculate(current_scenario)
+    results_hpp = scenario_results["hpp"]
+    results_ico_adjusted = scenario_results["ico"]
+
+    rerun_timer.checkpoint("vypocet")
+
+    # --- Zobrazení výsledků ---
+    st.divider()
+    st.header("📈 Výsledky porovnání")
+
+    col_hpp_res, col_ico_res = st.columns(2)
+
+    with col_hpp_res:
+        st.subheader("HPP (Zaměstnanec)")
+        if results_hpp and "error" not in results_hpp:
+            st.metric("Čistý měsíční příjem (HPP)", f"{results_hpp.get('cisty_mesicni_prijem_zamestnanec', 0):,.0f} CZK")
+            # ... (ostatní HPP detaily jako dříve) ...
+            st.markdown(f"**Hrubá měsíční mzda:** {results_hpp.get('hruby_mesicni_prijem', 0):,.0f} CZK")
+            st.markdown(f"**Roční čistý příjem:** {results_hpp.get('cisty_rocni_prijem_zamestnanec', 0):,.0f} CZK")
+            st.markdown(f"**Denní čistý příjem (průměr):** {results_hpp.get('cisty_denni_prijem_zamestnanec', 0):,.0f} CZK ({work_days_per_year_input} prac. dní)")
+            render_hpp_details(results_hpp)
+
+        elif results_hpp and "error" in results_hpp : 
+            st.error(f"Chyba HPP: {results_hpp['error']}")
+        elif hpp_gross_monthly_income <= 0 and st.session_state.get("calculate_button_clicked", False):
+             st.info("Zadejte kladnou hrubou mzdu pro HPP.")
+        
+            
+    with col_ico_res:
+        st.subheader(f"IČO (OSVČ) - {ico_calculation_mode}")
+        # Display results based on revenue_adjusted_for_unpaid_days
+        if results_ico_adjusted and "error" not in results_ico_adjusted:
+            main_ico_metric_label = "Skutečný čistý měsíční příjem (IČO)"
+            main_ico_metric_value = 0
+            daily_ico_metric_label = "Skutečný čistý denní příjem (IČO - efektivní)"
+            daily_ico_metric_value = 0
+            
+            if ico_calculation_mode == "Paušální výdaje":
+                main_ico_metric_value = results_ico_adjusted.get('info_k_realnym_nakladum', {}).get('cisty_mesicni_prijem_disponibilni_po_realnych_nakladech', 0)
+                daily_ico_metric_value = results_ico_adjusted.get('info_k_realnym_nakladum', {}).get('cisty_denni_prijem_disponibilni_efektivni', 0)
+            elif ico_calculation_mode == "Paušální daň":
+                main_ico_metric_value = results_ico_adjusted.get('cisty_mesicni_prijem', 0)
+                daily_ico_metric_value = results_ico_adjusted.get('cisty_denni_prijem_efektivni', 0)
+
+            st.metric(main_ico_metric_label, f"{main_ico_metric_value:,.0f} CZK", help="Čistý příjem po zaplacení odvodů, vypočítaný z obratu sníženého o neplacené volno.")
+            st.markdown(f"**Cílový roční obrat (před úpravou):** {ico_potential_gross_annual_revenue:,.0f} CZK")
+            st.markdown(f"**Skutečný roční obrat (po úpravě o neplac. volno):** {results_ico_adjusted.get('hruby_rocni_prijem_obrat',0):,.0f} CZK")
+            st.markdown(f"**{daily_ico_metric_label}:** {daily_ico_metric_value:,.0f} CZK ({results_ico_adjusted.get('info_k_efektivite_dnu', {}).get('uvazovane_pracovni_dny_pro_denni_sazbu', 'N/A')} prac. dní)")
+            
+            render_ico_details(results_ico_adjusted, ico_calculation_mode)
+
+        elif results_ico_adjusted and "error" in results_ico_adjusted: 
+            st.error(f"Chyba IČO: {results_ico_adjusted['error']}")
+        elif ico_potential_gross_annual_revenue <= 0 and st.session_state.get("calculate_button_clicked", False):
+            st.info("Zadejte kladný cílový obrat pro IČO.")
+
+
+    rerun_timer.checkpoint("vysledky")
+
+    # --- Grafické srovnání ---
+    if results_hpp and "error" not in results_hpp and results_ico_adjusted and "error" not in results_ico_adjusted:
+        st.divider()
+        st.subheader("📊 Grafické srovnání čistých měsíčních příjmů")
+        
+        hpp_net_monthly = results_hpp.get('cisty_mesicni_prijem_zamestnanec', 0)
+        
+        ico_net_monthly_adjusted = 0
+        if ico_calculation_mode == "Paušální výdaje":
+            info_realne_naklady = results_ico_adjusted.get('info_k_realnym_nakladum', {})
+            if isinstance(info_realne_naklady, dict):
+                 ico_net_monthly_adjusted = info_realne_naklady.get('cisty_mesicni_prijem_disponibilni_po_realnych_nakladech', 0)
+        elif ico_calculation_mode == "Paušální daň":
+            ico_net_monthly_adjusted = results_ico_adjusted.get('cisty_mesicni_prijem', 0)
+            
+        chart_data_list = [
+            {"Typ příjmu": "HPP", "Čistý měsíční příjem (CZK)": hpp_net_monthly},
+            # For the graph, we show the "true clear income" after unpaid days adjustment
+            {"Typ příjmu": f"IČO ({ico_calculation_mode}) - Skutečný", "Čistý měsíční příjem (CZK)": ico_net_monthly_adjusted}
+        ]
+        
+        rerun_timer.checkpoint("graf")
+        try:
+            import pandas as pd
+            rerun_timer.checkpoint("import_pandas")
+            df_chart = pd.DataFrame(chart_data_list)
+            st.bar_chart(df_chart.set_index("Typ příjmu"))
+        except ImportError: 
+            st.bar_chart(chart_data_list, x="Typ příjmu", y="Čistý měsíční příjem (CZK)")
+        rerun_timer.checkpoint("graf")
+
+
+    elif (results_hpp and "error" in results_hpp) or (results_ico_adjusted and "error" in results_ico_adjusted):
+        st.warning("Opravte prosím chyby ve vstupech pro zobrazení grafu.")
+
+    rerun_timer.checkpoint("graf")
+
+    # --- Bod zvratu ---
+    if results_hpp and "error" not in results_hpp and results_hpp.get('cisty_mesicni_prijem_zamestnanec', 0) > 0:
+        st.divider()
+        st.subheader("🎯 Jaký obrat IČO vyrovná čistý příjem z HPP?")
+        # Sickness insurance and real costs are only entered in the paušální výdaje mode
+        break_even_rows = break_even_table(
+            target_net_monthly_income=results_hpp['cisty_mesicni_prijem_zamestnanec'],
+            realne_rocni_provozni_naklady=ico_realne_rocni_naklady if ico_calculation_mode == "Paušální výdaje" else 0.0,
+            other_annual_tax_credits=other_annual_tax_credits_input,
+            participate_sickness_insurance=ico_participate_sickness if ico_calculation_mode == "Paušální výdaje" else False,
+            sickness_insurance_assessment_base_monthly=ico_sickness_base if ico_calculation_mode == "Paušální výdaje" and ico_participate_sickness else None,
+            actual_unpaid_vacation_days_taken=ico_unpaid_vacation,
+            actual_unpaid_sick_days_taken=ico_unpaid_sick,
+            work_days_per_year_input=work_days_per_year_input,
+            mandays_per_year=ico_mandays_per_year if ico_input_period == "Denní sazba (man-day rate)" else DEFAULT_MANDAYS_PER_YEAR_ICO,
+            tax_year=tax_year,
+        )
+        st.dataframe(
+            [{
+                "Režim": row["rezim"],
+                "Denní sazba (CZK)": f"{row['denni_sazba']:,.0f}" if row["denni_sazba"] is not None else "nedosažitelné",
+                "Měsíční fakturace (CZK)": f"{row['mesicni_fakturace']:,.0f}" if row["mesicni_fakturace"] is not None else "-",
+                "Cílový roční obrat (CZK)": f"{row['cilovy_rocni_obrat']:,.0f}" if row["cilovy_rocni_obrat"] is not None else "-",
+            } for row in break_even_rows],
+            hide_index=True, use_container_width=True,
+        )
+        st.caption("Obrat potřebný pro stejný čistý měsíční příjem jako u HPP, po zohlednění neplaceného volna a reálných nákladů. Denní sazba je rozpočítána na plánované fakturované dny.")
+
+    rerun_timer.checkpoint("bod_zvratu")
+
+    # --- Doporučený režim IČO ---
+    if ico_revenue_adjusted_for_unpaid_days > 0:
+        st.divider()
+        st.subheader("🏆 Doporučený režim IČO")
+        ranked_regimes = rank_regimes(
+            gross_annual_revenue=ico_revenue_adjusted_for_unpaid_days,
+            realne_rocni_provozni_naklady=ico_realne_rocni_naklady if ico_calculation_mode == "Paušální výdaje" else 0.0,
+            other_annual_tax_credits=other_annual_tax_credits_input,
+            # The selected percentage stands for the activity type, which also decides band eligibility
+            activity_expense_percentage=ico_expense_percentage if ico_calculation_mode == "Paušální výdaje" else None,
+            sickness_insurance_assessment_base_monthly=ico_sickness_base if ico_calculation_mode == "Paušální výdaje" and ico_participate_sickness else None,
+            actual_unpaid_vacation_days_taken=ico_unpaid_vacation,
+            actual_unpaid_sick_days_taken=ico_unpaid_sick,
+            work_days_per_year_input=work_days_per_year_input,
+            tax_year=tax_year,
+        )
+        if ranked_regimes:
+            best_regime = ranked_regimes[0]
+            st.success(f"Nejvýhodnější: **{best_regime['rezim']}**, čistý měsíční příjem {best_regime['cisty_mesicni_prijem_disponibilni']:,.0f} CZK (po reálných nákladech).")
+            st.dataframe(
+                [{
+                    "": "🏆" if row["nejlepsi"] else "",
+                    "Režim": row["rezim"],
+                    "Čistý měsíční příjem (CZK)": f"{row['cisty_mesicni_prijem_disponibilni']:,.0f}",
+                    "Rozdíl oproti nejlepšímu (CZK/měs.)": f"{row['rozdil_oproti_nejlepsimu']:,.0f}",
+                    "Roční odvody a daň (CZK)": f"{row['rocni_odvody_a_dan']:,.0f}",
+                } for row in ranked_regimes],
+                hide_index=True, use_container_width=True,
+            )
+            st.caption("Zahrnuty jsou jen varianty, na které máte při tomto obratu nárok. V režimu paušálních výdajů se vychází ze zvoleného procenta (typu činnosti); v režimu paušální daně se porovnávají všechna procenta.")
+    
+    st.session_state.calculate_button_clicked = True
+    rerun_timer.checkpoint("doporuceni")
+
+
+# --- Citlivostní analýza ---
+st.divider()
+
+
+# The optional sections below are fragments: changing a widget inside one reruns
+# only that section with the inputs of the last full run, not the whole page.
+@profiled_fragment("fragment_citlivost")
+def render_sensitivity_analysis():
+    # The curves are computed once per parameter set; the slider below only slices them
+    sweep = build_sweep(
+        other_annual_tax_credits=float(other_annual_tax_credits_input),
+        realne_rocni_provozni_naklady=float(ico_realne_rocni_naklady) if ico_calculation_mode == "Paušální výdaje" else 0.0,
+        sickness_insurance_assessment_base_monthly=float(ico_sickness_base) if ico_calculation_mode == "Paušální výdaje" and ico_participate_sickness else None,
+        actual_unpaid_vacation_days_taken=int(ico_unpaid_vacation),
+        actual_unpaid_sick_days_taken=int(ico_unpaid_sick),
+        work_days_per_year_input=int(work_days_per_year_input),
+        tax_year=tax_year,
+    )
+    all_curves = list(sweep["krivky"])
+    selected_curves = st.multiselect("Zobrazené křivky", all_curves, default=[c for c in all_curves if "nemocenské" not in c], key="sweep_curves")
+    gross_from, gross_to = st.slider("Rozsah hrubého měsíčního příjmu (CZK)", min_value=0, max_value=int(DEFAULT_MAX_GROSS_MONTHLY), value=(20000, 150000), step=5000, key="sweep_range")
+    visible = slice_sweep(sweep, gross_from, gross_to)
+
+    import altair as alt
+    import pandas as pd
+    df_curves = pd.DataFrame({"Hrubý měsíční příjem (CZK)": visible["hruby_mesicni_prijem"], **{name: visible["krivky"][name] for name in selected_curves}})
+    df_curves = df_curves.melt("Hrubý měsíční příjem (CZK)", var_name="Varianta", value_name="Čistý měsíční příjem (CZK)").dropna()
+    crossings = [
+        {"Varianta": name, "Hrubý měsíční příjem (CZK)": x}
+        for name in selected_curves if name in visible["pruseciky"] for x in visible["pruseciky"][name]
+    ]
+    chart = alt.Chart(df_curves).mark_line().encode(
+        x="Hrubý měsíční příjem (CZK):Q", y="Čistý měsíční příjem (CZK):Q", color="Varianta:N"
+    )
+    if crossings:
+        df_crossings = pd.DataFrame(crossings)
+        chart += alt.Chart(df_crossings).mark_rule(strokeDash=[4, 4]).encode(
+            x="Hrubý měsíční příjem (CZK):Q", color="Varianta:N", tooltip=["Varianta", alt.Tooltip("Hrubý měsíční příjem (CZK):Q", format=",.0f")]
+        )
+    st.altair_chart(chart, use_container_width=True)
+    if crossings:
+        st.caption("Svislé čáry označují hrubý příjem, od kterého se daná varianta IČO vyrovná HPP (průsečík křivek).")
+        st.dataframe(
+            [{"Varianta": c["Varianta"], "Průsečík s HPP (CZK/měs.)": f"{c['Hrubý měsíční příjem (CZK)']:,.0f}"} for c in crossings],
+            hide_index=True, use_container_width=True,
+        )
+
+
+if st.toggle("📉 Citlivostní analýza: čistý příjem v závislosti na hrubém příjmu", key="sweep_mode", help="Porovná HPP se všemi variantami IČO přes celý rozsah hrubých příjmů. Osa X je hrubá měsíční mzda (HPP) a zároveň plánovaná měsíční fakturace (IČO)."):
+    render_sensitivity_analysis()
+
+rerun_timer.checkpoint("citlivost")
+
+# --- Měsíční cash-flow ---
+@profiled_fragment("fragment_cashflow")
+def render_cash_flow():
+    max_timeline_years = max(tax_years) - tax_year + 1
+    timeline_years = st.number_input("Počet let", min_value=1, max_value=max_timeline_years, value=min(2, max_timeline_years), step=1, key="cashflow_years")
+    timeline_inputs = dict(
+        expense_percentage=ico_expense_percentage if ico_calculation_mode == "Paušální výdaje" else None,
+        pausalni_dan_band=ico_pausalni_dan_band if ico_calculation_mode == "Paušální daň" else None,
+        monthly_real_costs=ico_realne_rocni_naklady / 12 if ico_calculation_mode == "Paušální výdaje" else 0.0,
+        other_annual_tax_credits=other_annual_tax_credits_input,
+        participate_sickness_insurance=ico_calculation_mode == "Paušální výdaje" and ico_participate_sickness,
+        sickness_insurance_assessment_base_monthly=ico_sickness_base if ico_calculation_mode == "Paušální výdaje" and ico_participate_sickness else None,
+        monthly_unpaid_vacation_days=ico_unpaid_vacation / 12,
+        monthly_unpaid_sick_days=ico_unpaid_sick / 12,
+        work_days_per_year_input=work_days_per_year_input,
+        first_tax_year=tax_year,
+    )
+    # The planned invoicing and the unpaid days start spread evenly; each month's
+    # invoicing drops by the unpaid days entered for it
+    planned_invoicing = [ico_potential_gross_annual_revenue / 12] * (12 * timeline_years)
+    timeline_key = repr((sorted(timeline_inputs.items()), planned_invoicing))
+    # The timeline survives reruns; edits below only recompute the affected months and years
+    if st.session_state.get("cashflow_timeline_key") != timeline_key:
+        try:
+            st.session_state.cashflow_timeline = CashFlowTimeline(planned_invoicing, **timeline_inputs)
+        except ValueError as e:
+            st.error(f"Chyba cash-flow: {e}")
+            return
+        st.session_state.cashflow_timeline_key = timeline_key
+        st.session_state.cashflow_editor_generation = st.session_state.get("cashflow_editor_generation", 0) + 1
+    timeline = st.session_state.cashflow_timeline
+
+    import pandas as pd
+    month_labels = timeline.month_labels()
+    days_column = st.column_config.NumberColumn(min_value=0.0, step=1.0, format="%.1f")
+    edited_months = st.data_editor(
+        pd.DataFrame({
+            "Měsíc": month_labels,
+            "Plánovaná fakturace (CZK)": planned_invoicing,
+            "Neplacená dovolená (dny)": [ico_unpaid_vacation / 12] * len(month_labels),
+            "Nemoc (dny)": [ico_unpaid_sick / 12] * len(month_labels),
+        }),
+        column_config={
+            "Měsíc": st.column_config.TextColumn(disabled=True),
+            "Plánovaná fakturace (CZK)": st.column_config.NumberColumn(min_value=0.0, step=1000.0, format="%.0f"),
+            "Neplacená dovolená (dny)": days_column,
+            "Nemoc (dny)": days_column,
+        },
+        hide_index=True, use_container_width=True, key=f"cashflow_editor_{st.session_state.cashflow_editor_generation}",
+    )
+    edited_months = edited_months.fillna(0.0)
+    for month, (amount, vacation_days, sick_days) in enumerate(zip(
+        edited_months["Plánovaná fakturace (CZK)"], edited_months["Neplacená dovolená (dny)"], edited_months["Nemoc (dny)"],
+    )):
+        if (amount, vacation_days, sick_days) != (timeline.planned_invoicing[month], timeline.unpaid_vacation_days[month], timeline.unpaid_sick_days[month]):
+            try:
+                timeline.set_month(month, invoicing=float(amount), unpaid_vacation_days=float(vacation_days), unpaid_sick_days=float(sick_days))
+            except ValueError as e:
+                # The timeline keeps the previous values of the month; the edit is retried on the next rerun
+                st.error(f"Chyba cash-flow ({month_labels[month]}): {e}")
+
+    cash_flow = timeline.as_arrays()
+    st.line_chart(pd.DataFrame({"Čistý měsíční tok (CZK)": cash_flow["cisty_tok"], "Kumulovaný tok (CZK)": cash_flow["kumulovany_tok"]}, index=month_labels))
+    st.dataframe(
+        pd.DataFrame({
+            "Fakturace": cash_flow["fakturace"],  # after the month's unpaid days
+            "Reálné náklady": cash_flow["realne_naklady"],
+            "Záloha SP": cash_flow["zaloha_socialni"],
+            "Záloha ZP": cash_flow["zaloha_zdravotni"],
+            "Nemocenské": cash_flow["nemocenske"],
+            "Paušální daň": cash_flow["pausalni_dan"],
+            "Doplatek SP": cash_flow["doplatek_socialni"],
+            "Doplatek ZP": cash_flow["doplatek_zdravotni"],
+            "Daň z příjmů": cash_flow["dan_z_prijmu"],
+            "Čistý tok": cash_flow["cisty_tok"],
+            "Kumulovaně": cash_flow["kumulovany_tok"],
+        }, index=month_labels).style.format("{:,.0f}"),
+        use_container_width=True,
+    )
+    if ico_calculation_mode == "Paušální výdaje":
+        after = timeline.settlement_after_timeline
+        st.caption(f"Vyúčtování posledního roku (splatné po konci období): SP {after['socialni']:,.0f} CZK, ZP {after['zdravotni']:,.0f} CZK, daň z příjmů {after['dan_z_prijmu']:,.0f} CZK. Záporná částka znamená přeplatek.")
+    st.caption("Zjednodušený model: fakturace měsíce se snižuje o neplacené dny zadané v tom měsíci; zálohy na SP a ZP v prvním roce ve výši minima, od května dalšího roku podle ročního vyúčtování; daň z příjmů a doplatky pojistného se platí v květnu následujícího roku.")
+
+
+if st.toggle("📅 Měsíční cash-flow IČO (zálohy, doplatky, paušální daň)", key="cashflow_mode", help="Rozpočítá rok (nebo více let) po měsících včetně záloh na pojištění a doplatků z ročního vyúčtování. Fakturaci a neplacené dny jednotlivých měsíců lze upravit v tabulce."):
+    render_cash_flow()
+
+rerun_timer.checkpoint("cashflow")
+
+# --- Obrácený výpočet ---
+@profiled_fragment("fragment_obraceny_vypocet")
+def render_inverse_calculator():
+    inverse_inputs = dict(
+        realne_rocni_provozni_naklady=ico_realne_rocni_naklady if ico_calculation_mode == "Paušální výdaje" else 0.0,
+        other_annual_tax_credits=other_annual_tax_credits_input,
+        participate_sickness_insurance=ico_participate_sickness if ico_calculation_mode == "Paušální výdaje" else False,
+        sickness_insurance_assessment_base_monthly=ico_sickness_base if ico_calculation_mode == "Paušální výdaje" and ico_participate_sickness else None,
+        actual_unpaid_vacation_days_taken=ico_unpaid_vacation,
+        actual_unpaid_sick_days_taken=ico_unpaid_sick,
+        work_days_per_year_input=work_days_per_year_input,
+        mandays_per_year=ico_mandays_per_year if ico_input_period == "Denní sazba (man-day rate)" else DEFAULT_MANDAYS_PER_YEAR_ICO,
+        tax_year=tax_year,
+    )
+    target_net_monthly = st.number_input("Cílový čistý měsíční příjem (CZK)", value=80000.0, min_value=0.0, step=1000.0, format="%.0f", key="inverse_target")
+    required_gross_hpp = break_even_gross_monthly_hpp(target_net_monthly, other_annual_tax_credits_input, work_days_per_year_input, tax_year=tax_year)
+    st.metric("Potřebná hrubá měsíční mzda (HPP)", f"{required_gross_hpp:,.0f} CZK")
+    st.dataframe(
+        [{
+            "Režim": row["rezim"],
+            "Denní sazba (CZK)": f"{row['denni_sazba']:,.0f}" if row["denni_sazba"] is not None else "nedosažitelné",
+            "Měsíční fakturace (CZK)": f"{row['mesicni_fakturace']:,.0f}" if row["mesicni_fakturace"] is not None else "-",
+            "Cílový roční obrat (CZK)": f"{row['cilovy_rocni_obrat']:,.0f}" if row["cilovy_rocni_obrat"] is not None else "-",
+        } for row in break_even_table(target_net_monthly_income=target_net_monthly, **inverse_inputs)],
+        hide_index=True, use_container_width=True,
+    )
+
+    if st.checkbox("Zobrazit tabulku pro rozsah cílových příjmů", key="inverse_range_mode"):
+        target_from, target_to = st.slider("Rozsah cílového čistého měsíčního příjmu (CZK)", min_value=0, max_value=300000, value=(30000, 150000), step=5000, key="inverse_range")
+        target_step = st.number_input("Krok (CZK)", min_value=1000, max_value=50000, value=10000, step=1000, key="inverse_step")
+        import numpy as np
+        import pandas as pd
+        # One vectorized solve per regime for the whole column of targets
+        inverse_table = break_even_table_batch(np.arange(target_from, target_to + 1, target_step, dtype=float), **inverse_inputs)
+        st.dataframe(
+            pd.DataFrame({
+                "Čistý měsíčně (CZK)": inverse_table["cisty_mesicni_prijem"],
+                "Hrubá mzda HPP (CZK)": inverse_table["hruba_mesicni_mzda_hpp"],
+                **{f"{mode} – fakturace/měs. (CZK)": columns["mesicni_fakturace"] for mode, columns in inverse_table["rezimy"].items()},
+            }).style.format("{:,.0f}", na_rep="nedosažitelné"),
+            hide_index=True, use_container_width=True,
+        )
+    st.caption("Hrubá mzda HPP je nejnižší mzda (zaokrouhlená nahoru na haléře), při které čistý příjem dosáhne cíle. U IČO je fakturace navýšena o neplacené volno.")
+
+
+if st.toggle("🔁 Obrácený výpočet: kolik hrubého potřebuji na cílový čistý příjem", key="inverse_mode", help="Spočítá hrubou mzdu HPP a obrat IČO, které vedou na zadaný čistý měsíční příjem. Použije nastavení neplaceného volna, reálných nákladů a nemocenského z formuláře výše."):
+    render_inverse_calculator()
+
+rerun_timer.checkpoint("obraceny_vypocet")
+
+# --- Simulace rizika ---
+@profiled_fragment("fragment_simulace")
+def render_risk_simulation():
+    col_mc1, col_mc2, col_mc3 = st.columns(3)
+    with col_mc1:
+        mc_mean_sick = st.number_input("Průměrný počet dní nemoci", value=float(ico_unpaid_sick), min_value=0.0, max_value=float(work_days_per_year_input), step=1.0, key="mc_mean_sick")
+        mc_mean_unbilled = st.number_input("Průměrný počet dní bez zakázky", value=10.0, min_value=0.0, max_value=float(work_days_per_year_input), step=1.0, key="mc_mean_unbilled", help="Dny mezi projekty, kdy není co fakturovat (navíc k plánované dovolené).")
+    with col_mc2:
+        mc_volatility = st.number_input("Kolísání sazby (%)", value=10.0, min_value=0.0, max_value=100.0, step=1.0, key="mc_volatility", help="Směrodatná odchylka roční změny sazby (log-normální rozdělení se střední hodnotou beze změny).")
+        mc_simulations = st.selectbox("Počet simulací", (10_000, 100_000, 1_000_000), index=1, format_func=lambda n: f"{n:,}", key="mc_simulations")
+    with col_mc3:
+        mc_seed = st.number_input("Seed (pro opakovatelnost)", value=42, min_value=0, step=1, key="mc_seed")
+
+    mc_hpp = cached_calculate_hpp_income_record(hpp_gross_monthly_income, other_annual_tax_credits_input, work_days_per_year_input, tax_year)
+    simulation_inputs = dict(
+        planned_annual_revenue=ico_potential_gross_annual_revenue,
+        expense_percentage=ico_expense_percentage if ico_calculation_mode == "Paušální výdaje" else None,
+        pausalni_dan_band=ico_pausalni_dan_band if ico_calculation_mode == "Paušální daň" else None,
+        realne_rocni_provozni_naklady=ico_realne_rocni_naklady if ico_calculation_mode == "Paušální výdaje" else 0.0,
+        other_annual_tax_credits=other_annual_tax_credits_input,
+        participate_sickness_insurance=ico_calculation_mode == "Paušální výdaje" and ico_participate_sickness,
+        sickness_insurance_assessment_base_monthly=ico_sickness_base if ico_calculation_mode == "Paušální výdaje" and ico_participate_sickness else None,
+        unpaid_vacation_days=ico_unpaid_vacation,
+        mean_unpaid_sick_days=mc_mean_sick,
+        mean_unbilled_days=mc_mean_unbilled,
+        day_rate_volatility=mc_volatility / 100,
+        hpp_net_monthly_income=mc_hpp["cisty_mesicni_prijem_zamestnanec"] if "error" not in mc_hpp else None,
+        work_days_per_year_input=work_days_per_year_input,
+        tax_year=tax_year,
+        simulations=mc_simulations,
+        seed=int(mc_seed),
+        return_samples=True,
+    )
+    # Reruns that change nothing here (other sections, the results button) reuse the last simulation
+    simulation_key = repr(sorted(simulation_inputs.items()))
+    if st.session_state.get("montecarlo_key") != simulation_key:
+        st.session_state.montecarlo_simulation = simulate_ico_income(**simulation_inputs)
+        st.session_state.montecarlo_key = simulation_key
+    simulation = st.session_state.montecarlo_simulation
+    if simulation["prumer"] is None:
+        st.warning("Žádný ze simulovaných roků nesplňuje podmínky zvoleného režimu.")
+    else:
+        col_mc_res1, col_mc_res2, col_mc_res3 = st.columns(3)
+        deterministic = simulation["deterministicky_cisty_mesicni_prijem"]
+        col_mc_res1.metric("Medián čistého měsíčního příjmu", f"{simulation['percentily'][50]:,.0f} CZK",
+                           delta=None if deterministic is None else f"{simulation['percentily'][50] - deterministic:,.0f} CZK oproti pevným dnům")
+        col_mc_res2.metric("5% nejhorších let pod", f"{simulation['percentily'][5]:,.0f} CZK")
+        if "pravdepodobnost_lepsi_nez_hpp" in simulation:
+            col_mc_res3.metric("Pravděpodobnost, že IČO vydělá víc než HPP", f"{simulation['pravdepodobnost_lepsi_nez_hpp']:.1%}",
+                               help=f"Čistý měsíční příjem HPP: {simulation['hpp_cisty_mesicni_prijem']:,.0f} CZK")
+
+        import numpy as np
+        import pandas as pd
+        samples = simulation["vzorky"][~np.isnan(simulation["vzorky"])]
+        counts, edges = np.histogram(samples, bins=60)
+        st.bar_chart(pd.DataFrame({"Počet let": counts}, index=pd.Index(np.round((edges[:-1] + edges[1:]) / 2, -2), name="Čistý měsíční příjem (CZK)")))
+        st.dataframe(
+            [{"Percentil": f"{p}.", "Čistý měsíční příjem (CZK)": f"{value:,.0f}"} for p, value in simulation["percentily"].items()],
+            hide_index=True, use_container_width=True,
+        )
+        if simulation["podil_neplatnych"] > 0:
+            st.caption(f"{simulation['podil_neplatnych']:.1%} simulovaných let překročilo limit paušální daně a do výsledků nejsou zahrnuty.")
+    caption = "Nemoc a dny bez zakázky mají Poissonovo rozdělení, změna sazby log-normální."
+    if simulation["deterministicky_cisty_mesicni_prijem"] is not None:
+        caption += f" Deterministický výpočet s průměrnými hodnotami: {simulation['deterministicky_cisty_mesicni_prijem']:,.0f} CZK."
+    else:
+        caption += " Rok s průměrnými hodnotami překračuje limit paušální daně, deterministický výpočet proto chybí."
+    st.caption(caption)
+
+
+if st.toggle("🎲 Simulace rizika IČO (Monte Carlo)", key="montecarlo_mode", help="Místo pevného počtu dní nemoci nasimuluje tisíce možných let s náhodnou nemocí, obdobími bez zakázky a změnou sazby a porovná rozdělení čistého příjmu s HPP."):
+    render_risk_simulation()
+
+rerun_timer.checkpoint("simulace")
+
+# --- Uložené scénáře ---
+with st.sidebar.expander("💾 Uložené scénáře", expanded=False):
+    st.caption("Odkaz v adresním řádku vždy obsahuje aktuální zadání; stačí ho zkopírovat a sdílet.")
+    scenario_name = st.text_input("Název scénáře", key="scenario_name", placeholder="např. Nabídka 6 500 Kč/MD")
+    if st.button("Uložit aktuální scénář", key="scenario_save", use_container_width=True):
+        try:
+            get_scenario_store().save(current_scenario, scenario_name)
+            st.success(f"Scénář „{scenario_name.strip()}“ uložen.")
+        except ValueError as e:
+            st.error(str(e))
+
+if st.toggle("🗂️ Porovnání uložených scénářů", key="scenario_compare_mode", help="Vedle sebe zobrazí uložené scénáře. Výsledky se načtou z úložiště, nic se nepřepočítává."):
+    saved_scenarios = get_scenario_store().saved_scenarios()
+    if not saved_scenarios:
+        st.info("Zatím nemáte uložené žádné scénáře. Uložte je v postranním panelu (💾 Uložené scénáře).")
+    else:
+        from urllib.parse import urlencode
+        def ico_net_monthly(record):
+            if "error" in record:
+                return None
+            if record.TYP == "IČO (Paušální výdaje)":
+                return record.cisty_mesicni_prijem_disponibilni_po_realnych_nakladech
+            return record.cisty_mesicni_prijem
+        comparison_rows = []
+        for saved in saved_scenarios:
+            hpp_record, ico_record = saved["vysledky"]["hpp"], saved["vysledky"]["ico"]
+            hpp_net = None if "error" in hpp_record else hpp_record.cisty_mesicni_prijem_zamestnanec
+            ico_net = ico_net_monthly(ico_record)
+            comparison_rows.append({
+                "Scénář": saved["nazev"],
+                "Rok": hpp_record.tax_year,
+                "HPP hrubá mzda (CZK)": None if "error" in hpp_record else hpp_record.hruby_mesicni_prijem,
+                "HPP čistý měsíčně (CZK)": hpp_net,
+                "IČO režim": ico_record.get("typ", "-"),
+                "IČO roční obrat (CZK)": None if "error" in ico_record else ico_record.hruby_rocni_prijem_obrat,
+                "IČO čistý měsíčně (CZK)": ico_net,
+                "IČO − HPP (CZK/měs.)": ico_net - hpp_net if ico_net is not None and hpp_net is not None else None,
+                "Odkaz": "?" + urlencode(saved["params"]),
+            })
+        number_format = st.column_config.NumberColumn(format="%.0f")
+        st.dataframe(
+            comparison_rows,
+            column_config={
+                "HPP hrubá mzda (CZK)": number_format,
+                "HPP čistý měsíčně (CZK)": number_format,
+                "IČO roční obrat (CZK)": number_format,
+                "IČO čistý měsíčně (CZK)": number_format,
+                "IČO − HPP (CZK/měs.)": number_format,
+                "Odkaz": st.column_config.LinkColumn(display_text="otevřít"),
+            },
+            hide_index=True, use_container_width=True,
+        )
+        col_forget, col_forget_button = st.columns([3, 1])
+        with col_forget:
+            forget_hash = st.selectbox("Odebrat scénář ze srovnání", [saved["hash"] for saved in saved_scenarios],
+                                       format_func={saved["hash"]: saved["nazev"] for saved in saved_scenarios}.get, key="scenario_forget")
+        with col_forget_button:
+            if st.button("Odebrat", key="scenario_forget_button", use_container_width=True):
+                get_scenario_store().forget(forget_hash)
+                st.rerun()
+
+# --- Srovnání více konfigurací ---
+MAX_COMPARED_CONFIGURATIONS = 50
+@profiled_fragment("fragment_scenare")
+def render_configuration_comparison():
+    regime_choices = {f"Paušální výdaje {int(percentage * 100)}%": ("Paušální výdaje", percentage, None) for percentage in sorted(tax_params.expense_caps, reverse=True)}
+    regime_choices.update({f"Paušální daň {band}. pásmo": ("Paušální daň", None, band) for band in sorted(tax_params.pausalni_dan_bands_monthly)})
+    if ico_calculation_mode == "Paušální výdaje":
+        current_regime = f"Paušální výdaje {int(ico_expense_percentage * 100)}%"
+    else:
+        current_regime = f"Paušální daň {ico_pausalni_dan_band}. pásmo"
+    current_mandays = ico_mandays_per_year if ico_input_period == "Denní sazba (man-day rate)" else DEFAULT_MANDAYS_PER_YEAR_ICO
+    import pandas as pd
+    configurations = st.data_editor(
+        pd.DataFrame([{
+            "Název": "Aktuální zadání",
+            "Hrubá mzda HPP": float(hpp_gross_monthly_income),
+            "Slevy na dani": float(other_annual_tax_credits_input),
+            "Denní sazba IČO": ico_potential_gross_annual_revenue / current_mandays if current_mandays else 0.0,
+            "Fakturované dny": int(current_mandays),
+            "Režim IČO": current_regime,
+            "Reálné náklady": float(ico_realne_rocni_naklady) if ico_calculation_mode == "Paušální výdaje" else 0.0,
+            "Nemocenské": bool(ico_calculation_mode == "Paušální výdaje" and ico_participate_sickness),
+            "Neplacená dovolená": int(ico_unpaid_vacation),
+            "Nemoc (dny)": int(ico_unpaid_sick),
+        }]),
+        column_config={
+            "Hrubá mzda HPP": st.column_config.NumberColumn(min_value=0.0, step=1000.0, format="%.0f"),
+            "Slevy na dani": st.column_config.NumberColumn(min_value=0.0, step=100.0, format="%.0f"),
+            "Denní sazba IČO": st.column_config.NumberColumn(min_value=0.0, step=100.0, format="%.0f"),
+            "Fakturované dny": st.column_config.NumberColumn(min_value=0, max_value=work_days_per_year_input, step=1),
+            "Režim IČO": st.column_config.SelectboxColumn(options=list(regime_choices), required=True),
+            "Reálné náklady": st.column_config.NumberColumn(min_value=0.0, step=1000.0, format="%.0f", help="Jen pro paušální výdaje."),
+            "Nemocenské": st.column_config.CheckboxColumn(help="Dobrovolné nemocenské v minimální výši; jen pro paušální výdaje."),
+            "Neplacená dovolená": st.column_config.NumberColumn(min_value=0, max_value=work_days_per_year_input, step=1),
+            "Nemoc (dny)": st.column_config.NumberColumn(min_value=0, max_value=work_days_per_year_input, step=1),
+        },
+        num_rows="dynamic", hide_index=True, use_container_width=True, key="multi_compare_editor",
+    )
+    configurations = configurations.dropna(subset=["Režim IČO"]).head(MAX_COMPARED_CONFIGURATIONS)
+    compared_scenarios = []
+    for row in configurations.fillna({"Hrubá mzda HPP": 0.0, "Slevy na dani": 0.0, "Denní sazba IČO": 0.0, "Fakturované dny": 0,
+                                      "Reálné náklady": 0.0, "Nemocenské": False, "Neplacená dovolená": 0, "Nemoc (dny)": 0}).itertuples(index=False):
+        mode, percentage, band = regime_choices[row[5]]
+        compared_scenarios.append({
+            "tax_year": tax_year,
+            "work_days_per_year_input": work_days_per_year_input,
+            "other_annual_tax_credits": row[2],
+            "hpp_gross_monthly_income": row[1],
+            "ico_input_period": "Denní sazba (man-day rate)",
+            "ico_daily_rate": row[3],
+            "ico_mandays_per_year": int(row[4]),
+            "ico_unpaid_vacation": int(row[8]),
+            "ico_unpaid_sick": int(row[9]),
+            "ico_mode": mode,
+            "expense_percentage": percentage if percentage is not None else 0.6,
+            "realne_rocni_provozni_naklady": row[6],
+            "participate_sickness_insurance": bool(row[7]),
+            "pausalni_dan_band": band if band is not None else 1,
+        })
+    if compared_scenarios:
+        # One store query, one batched evaluation of the configurations not stored yet
+        compared_results, compared_from_store = get_scenario_store().get_or_calculate_many(compared_scenarios)
+        comparison = []
+        for name, results in zip(configurations["Název"].fillna(""), compared_results):
+            hpp_record, ico_record = results["hpp"], results["ico"]
+            hpp_net = None if "error" in hpp_record else hpp_record.cisty_mesicni_prijem_zamestnanec
+            if "error" in ico_record:
+                ico_net = None
+            elif ico_record.TYP == "IČO (Paušální výdaje)":
+                ico_net = ico_record.cisty_mesicni_prijem_disponibilni_po_realnych_nakladech
+            else:
+                ico_net = ico_record.cisty_mesicni_prijem
+            comparison.append({
+                "Konfigurace": name or f"#{len(comparison) + 1}",
+                "HPP čistý měsíčně (CZK)": hpp_net,
+                "IČO čistý měsíčně (CZK)": ico_net,
+                "IČO − HPP (CZK/měs.)": ico_net - hpp_net if ico_net is not None and hpp_net is not None else None,
+                "Zaměstnavatel ročně (CZK)": None if "error" in hpp_record else hpp_record.zamestnavatel_celkove_rocni_naklady_na_zamestnance,
+                "IČO roční obrat (CZK)": None if "error" in ico_record else ico_record.hruby_rocni_prijem_obrat,
+                "Chyba": hpp_record.get("error") or ico_record.get("error") or "",
+            })
+        df_comparison = pd.DataFrame(comparison)
+        st.dataframe(df_comparison.style.format("{:,.0f}", subset=[c for c in df_comparison.columns if c.endswith("(CZK)") or c.endswith("(CZK/měs.)")], na_rep="-"),
+                     hide_index=True, use_container_width=True)
+
+        import altair as alt
+        df_bars = df_comparison.melt("Konfigurace", value_vars=["HPP čistý měsíčně (CZK)", "IČO čistý měsíčně (CZK)"],
+                                     var_name="Varianta", value_name="Čistý měsíční příjem (CZK)").dropna()
+        st.altair_chart(alt.Chart(df_bars).mark_bar().encode(
+            x=alt.X("Konfigurace:N", sort=None, title=None),
+            xOffset="Varianta:N",
+            y="Čistý měsíční příjem (CZK):Q",
+            color="Varianta:N",
+            tooltip=["Konfigurace", "Varianta", alt.Tooltip("Čistý měsíční příjem (CZK):Q", format=",.0f")],
+        ), use_container_width=True)
+        st.caption(f"{len(compared_scenarios)} konfigurací, z toho {compared_from_store} načteno z úložiště. Pracovní dny a daňový rok se berou z globálního nastavení.")
+
+
+if st.toggle(f"🧮 Srovnání více konfigurací (až {MAX_COMPARED_CONFIGURATIONS})", key="multi_compare_mode", help="Porovná v jedné tabulce a grafu až 50 kombinací mzdy, sazby, režimu IČO, slev a nemocenského. Všechny konfigurace se spočítají najednou a známé se jen načtou z úložiště."):
+    render_configuration_comparison()
+
+rerun_timer.checkpoint("scenare")
+
+if "calculate_button_clicked" not in st.session_state:
+    st.session_state.calculate_button_clicked = False
+
+with st.sidebar.expander("🗄️ Cache výpočtů", expanded=False):
+    stats = cache_stats()
+    st.caption(f"Z cache: {stats['hits']:,} · Přepočteno: {stats['misses']:,} · Úspěšnost: {stats['hit_rate']:.0%}")
+    st.caption(f"Položky: {stats['entries']:,} / {stats['max_entries']:,}")
+    store = get_scenario_store()
+    st.caption(f"Úložiště scénářů: {store.hits:,} načteno · {store.misses:,} spočteno")
+
+st.markdown("---")
+st.caption(f"Data a výpočty jsou platné pro rok {tax_year} a mají pouze orientační charakter. Pro přesné finanční plánování a daňové poradenství se vždy obraťte na kvalifikovaného daňového poradce.")
+
+# --- Footer ---
+st.markdown("---")
+st.markdown("Vytvořeno pro šišku ❤️")
+rerun_timer.checkpoint("zapati")
+
+# The form above needs no pandas, pyarrow or altair; every table and chart does.
+# Import them while the user fills in the form, not on the first click.
+preload_in_background()
+
+# The panel shows the reruns finished so far; its own rendering is not timed
+if PROFILER.enabled:
+    with st.sidebar.expander("🐞 Profilování běhů", expanded=False):
+        profiler_stats = PROFILER.stats()
+        st.caption(f"Běhy této relace: {PROFILER.reruns(st.session_state.profiling_session_id):,} · Relace: {profiler_stats['relace']:,} · Běhy celkem: {profiler_stats['behy']:,} · Běhy fragmentů: {profiler_stats['behy_fragmentu']:,} · Přerušené: {profiler_stats['prerusene_behy']:,}")
+        last_rerun = PROFILER.last_rerun(st.session_state.profiling_session_id)
+        if last_rerun:
+            st.caption("Poslední běh: " + " · ".join(f"{phase} {ms:.1f} ms" for phase, ms in last_rerun.items()))
+        st.dataframe(PROFILER.summary(), hide_index=True, use_container_width=True)
+        preloaded = preload_status()
+        if preloaded:
+            st.caption("Načteno na pozadí: " + " · ".join(f"{module} {seconds * 1000:.0f} ms" if seconds is not None else f"{module} chybí" for module, seconds in preloaded.items()))
+        if PROFILER.metrics_file is not None:
+            st.caption(f"Metriky se zapisují do {PROFILER.metrics_file}")
+    rerun_timer.finish()
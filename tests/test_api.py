@@ -0,0 +1,145 @@
+"""HTTP API: input validation, micro-batch coalescing and results equal to the scalar engine."""
+
+import asyncio
+import json
+
+import pytest
+
+from cisko.api import CiskoAPI, MicroBatcher, RequestError, parse_scenario
+from cisko.cache import MODE_HPP, MODE_PAUSALNI_DAN, MODE_PAUSALNI_VYDAJE
+from cisko.engine import calculate_hpp_income, calculate_ico_pausalni_dan_income, calculate_ico_pausalni_vydaje_income
+
+
+@pytest.mark.parametrize("mode, scenario", [
+    (MODE_HPP, {"gross_monthly_income": True}),
+    (MODE_HPP, {"gross_monthly_income": 50000, "tax_year": False}),
+    (MODE_PAUSALNI_VYDAJE, {"gross_annual_revenue": 1e6, "expense_percentage": True}),
+    (MODE_PAUSALNI_DAN, {"gross_annual_revenue": 1e6, "pausalni_dan_band": True}),
+    (MODE_HPP, {"gross_monthly_income": "50000"}),
+    (MODE_HPP, {"gross_monthly_income": None}),
+    (MODE_HPP, {"gross_monthly_income": float("nan")}),
+    (MODE_HPP, {"gross_monthly_income": 50000, "tax_year": 2024.5}),
+    (MODE_HPP, {"gross_monthly_income": 50000, "tax_year": 1999}),
+    (MODE_HPP, {"gross_monthly_income": 50000, "unknown": 1}),
+    (MODE_HPP, {}),
+    (MODE_HPP, [50000]),
+])
+def test_invalid_scenarios_are_rejected(mode, scenario):
+    with pytest.raises(RequestError):
+        parse_scenario(mode, scenario)
+
+
+def test_sickness_flag_accepts_booleans_and_defaults_are_filled_in():
+    arguments = parse_scenario(MODE_PAUSALNI_VYDAJE, {
+        "gross_annual_revenue": 1000000, "expense_percentage": 0.6, "participate_sickness_insurance": True,
+        "actual_unpaid_vacation_days_taken": 20.5, "tax_year": 2024.0,
+    })
+    assert arguments["participate_sickness_insurance"] is True
+    assert arguments["sickness_insurance_assessment_base_monthly"] is None
+    # Fractional days are accepted as by the calculate_* functions
+    assert arguments["actual_unpaid_vacation_days_taken"] == 20.5
+    assert arguments["tax_year"] == 2024 and isinstance(arguments["tax_year"], int)
+    assert arguments["paid_sick_days_by_client"] == 0
+
+
+@pytest.mark.parametrize("path, payload, expected", [
+    ("/hpp", {"gross_monthly_income": 50000, "work_days_per_year_input": 251.5},
+     calculate_hpp_income(50000, work_days_per_year_input=251.5)),
+    ("/ico/pausalni-dan", {"gross_annual_revenue": 1000000, "pausalni_dan_band": 1, "actual_unpaid_sick_days_taken": 2.5},
+     calculate_ico_pausalni_dan_income(1000000, 1, actual_unpaid_sick_days_taken=2.5)),
+    # A band the year lacks is the functions' error result, not a rejected request
+    ("/ico/pausalni-dan", {"gross_annual_revenue": 1000000, "pausalni_dan_band": 1.5}, {"error": "Neplatné pásmo paušální daně."}),
+    ("/ico/pausalni-dan", {"gross_annual_revenue": 1000000, "pausalni_dan_band": 7}, {"error": "Neplatné pásmo paušální daně."}),
+])
+def test_fractional_days_and_unknown_bands_are_computed(path, payload, expected):
+    async def scenario():
+        api = CiskoAPI(MicroBatcher(max_delay=0.01))
+        return await _request(api, path, payload), await _request(api, "/bulk" + path, [payload, payload])
+
+    single, bulk = asyncio.run(scenario())
+    assert single == (200, expected)
+    assert bulk == (200, [expected, expected])
+
+
+def _request(api: CiskoAPI, path: str, payload) -> tuple:
+    return api.dispatch("POST", path, json.dumps(payload).encode())
+
+
+def test_concurrent_bulk_requests_share_one_batch_per_mode():
+    async def scenario():
+        api = CiskoAPI(MicroBatcher(max_delay=0.05))
+        hpp = [[{"gross_monthly_income": 30000 + 1000 * i}, {"gross_monthly_income": 0}] for i in range(10)]
+        dan = [[{"gross_annual_revenue": 500000 + 10000 * i, "pausalni_dan_band": 1 + i % 3}] for i in range(5)]
+        responses = await asyncio.gather(
+            *(_request(api, "/bulk/hpp", body) for body in hpp),
+            *(_request(api, "/bulk/ico/pausalni-dan", body) for body in dan),
+        )
+        return api.batcher.stats(), hpp + dan, responses
+
+    stats, bodies, responses = asyncio.run(scenario())
+    assert stats == {"davky": 2, "pozadavky": 15, "scenare": 25, "prumerna_velikost_davky": 12.5}
+    for body, (status, results) in zip(bodies, responses):
+        assert status == 200 and len(results) == len(body)
+        for scenario, result in zip(body, results):
+            if "gross_monthly_income" in scenario:
+                assert result == calculate_hpp_income(**scenario)
+            else:
+                assert result == calculate_ico_pausalni_dan_income(**scenario)
+
+
+def test_full_batch_is_computed_without_waiting_for_the_delay():
+    async def scenario():
+        api = CiskoAPI(MicroBatcher(max_batch_rows=4, max_delay=60.0))
+        body = [{"gross_annual_revenue": 400000 * (i + 1), "expense_percentage": 0.6} for i in range(4)]
+        return body, await asyncio.wait_for(_request(api, "/bulk/ico/pausalni-vydaje", body), timeout=10)
+
+    body, (status, results) = asyncio.run(scenario())
+    assert status == 200
+    assert results == [calculate_ico_pausalni_vydaje_income(**scenario) for scenario in body]
+
+
+def test_one_invalid_scenario_rejects_the_whole_bulk_request():
+    async def scenario():
+        api = CiskoAPI()
+        with pytest.raises(RequestError):
+            await _request(api, "/bulk/hpp", [{"gross_monthly_income": 50000}, {"gross_monthly_income": True}])
+        return api.batcher.stats()
+
+    assert asyncio.run(scenario())["scenare"] == 0
+
+
+def test_http_status_codes_over_a_socket():
+    async def scenario():
+        server = await asyncio.start_server(CiskoAPI().handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def send(method: str, path: str, body: bytes = b"") -> tuple:
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            return status, json.loads(await reader.readexactly(int(headers["content-length"])))
+
+        try:
+            # One keep-alive connection serves every request
+            return [
+                await send("POST", "/hpp", b'{"gross_monthly_income": 60000}'),
+                await send("POST", "/hpp", b'{"gross_monthly_income": true}'),
+                await send("POST", "/hpp", b"not json"),
+                await send("GET", "/hpp"),
+                await send("GET", "/nope"),
+                await send("GET", "/tax-years"),
+            ]
+        finally:
+            writer.close()
+            server.close()
+            await server.wait_closed()
+
+    responses = asyncio.run(scenario())
+    assert responses[0] == (200, calculate_hpp_income(60000))
+    assert [status for status, _ in responses[1:]] == [400, 400, 405, 404, 200]
+    assert all("error" in payload for _, payload in responses[1:5])
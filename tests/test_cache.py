@@ -0,0 +1,48 @@
+"""The cached calculate_* functions accept and reject exactly what the engine does."""
+
+import pytest
+
+from cisko.cache import (
+    cached_calculate_hpp_income,
+    cached_calculate_ico_pausalni_dan_income,
+    cached_calculate_ico_pausalni_vydaje_income,
+    clear_cache,
+    ico_pausalni_dan_key,
+)
+from cisko.engine import (
+    calculate_hpp_income,
+    calculate_ico_pausalni_dan_income,
+    calculate_ico_pausalni_vydaje_income,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+@pytest.mark.parametrize("band", [1, 1.0, 1.5, 4])
+def test_pausalni_dan_band_matches_engine(band):
+    assert cached_calculate_ico_pausalni_dan_income(900000, band) == calculate_ico_pausalni_dan_income(900000, band)
+
+
+def test_fractional_band_is_rejected():
+    assert cached_calculate_ico_pausalni_dan_income(900000, 1.5)["error"] == "Neplatné pásmo paušální daně."
+
+
+@pytest.mark.parametrize("days", [0, 2, 2.5, 20.25])
+def test_fractional_unpaid_days_are_not_truncated(days):
+    kwargs = dict(actual_unpaid_vacation_days_taken=days, actual_unpaid_sick_days_taken=days)
+    assert cached_calculate_ico_pausalni_vydaje_income(900000, 0.6, **kwargs) == calculate_ico_pausalni_vydaje_income(900000, 0.6, **kwargs)
+    assert cached_calculate_ico_pausalni_dan_income(900000, 1, **kwargs) == calculate_ico_pausalni_dan_income(900000, 1, **kwargs)
+
+
+def test_fractional_work_days_match_engine():
+    assert cached_calculate_hpp_income(50000, work_days_per_year_input=250.5) == calculate_hpp_income(50000, work_days_per_year_input=250.5)
+
+
+def test_equivalent_inputs_share_an_entry():
+    assert ico_pausalni_dan_key(900000, 1, 2.0) == ico_pausalni_dan_key(900000.0, 1.0, 2)
+    assert ico_pausalni_dan_key(900000, 1, 2.5) != ico_pausalni_dan_key(900000, 1, 2)
@@ -0,0 +1,154 @@
+"""Bulk CLI: CSV and Parquet, any chunk size and worker count give the scalar engine's results."""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cisko.cli import main, run
+from cisko.engine import (
+    DEFAULT_WORK_DAYS_PER_YEAR,
+    calculate_hpp_income,
+    calculate_ico_pausalni_dan_income,
+    calculate_ico_pausalni_vydaje_income,
+)
+from cisko.params import available_tax_years, get_tax_params
+
+pytest.importorskip("pyarrow")
+
+SCENARIOS = pd.DataFrame({
+    "gross_monthly_income": [50000.0, 0.0, -1.0, np.nan, 120000.0, 35000.0, 80000.0, 64000.5, np.nan, 250000.0, 42000.0, 60000.0, 60000.0],
+    "gross_annual_revenue": [900000.0, 1500000.0, 2100000.0, 600000.0, np.nan, -5.0, 0.0, 1200000.0, 1800000.0, 3000000.0, 400000.0,
+                             1000000.0, 800000.0],
+    "expense_percentage": [0.6, 0.8, 0.4, 0.3, 0.6, 0.6, 0.6, 0.5, 0.8, 0.6, 0.4, 0.6, 0.6],
+    "pausalni_dan_band": [1, 2, 3, 1, 1, 1, 1, 4, 3, 3, 1, 1, 1],
+    "other_annual_tax_credits": [0.0, 15204.0, np.nan, 0.0, 0.0, 30408.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+    "participate_sickness_insurance": [False, True, False, True, False, False, True, False, False, True, False, True, False],
+    # Fractional days count as in the engine
+    "actual_unpaid_vacation_days_taken": [0, 20, 25, 0, 0, 10, 0, 0, 300, 0, 5, 2.5, 0],
+    "work_days_per_year_input": [np.nan] * 11 + [251, np.nan],
+    # No tax parameters for 2031: that row fails, the others are computed
+    "tax_year": [2024, 2024, 2025, 2023, 2026, 2024, 2025, 2024, 2024, 2026, 2023, 2024, 2031],
+})
+
+
+def _write(df: pd.DataFrame, path):
+    if path.suffix == ".csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path, index=False)
+
+
+def _read(path) -> pd.DataFrame:
+    df = pd.read_csv(path) if path.suffix == ".csv" else pd.read_parquet(path)
+    # Missing errors read back as NaN from CSV and <NA> from Parquet
+    return df.astype({column: object for column in df if column.endswith("_error")}).replace({np.nan: None, pd.NA: None})
+
+
+def _run(tmp_path, input_suffix: str, output_suffix: str, **kwargs) -> pd.DataFrame:
+    input_path = tmp_path / f"in{input_suffix}"
+    output_path = tmp_path / f"out_{input_suffix[1:]}_{kwargs.get('workers', 1)}{output_suffix}"
+    _write(SCENARIOS, input_path)
+    assert run(input_path, output_path, **kwargs) == len(SCENARIOS)
+    return _read(output_path)
+
+
+def _assert_same(expected: pd.DataFrame, actual: pd.DataFrame) -> None:
+    assert list(expected.columns) == list(actual.columns)
+    for column in expected:
+        for a, b in zip(expected[column], actual[column]):
+            if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+                continue
+            assert a == b, (column, a, b)
+
+
+@pytest.mark.parametrize("input_suffix, output_suffix", [(".csv", ".parquet"), (".parquet", ".csv"), (".parquet", ".parquet")])
+def test_formats_give_the_same_results(tmp_path, input_suffix, output_suffix):
+    _assert_same(_run(tmp_path, ".csv", ".csv", chunk_size=4), _run(tmp_path, input_suffix, output_suffix, chunk_size=4))
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_two_workers_give_the_same_rows_in_order(tmp_path, suffix):
+    single = _run(tmp_path, suffix, suffix, chunk_size=3, workers=1)
+    parallel = _run(tmp_path, suffix, suffix, chunk_size=3, workers=2)
+    _assert_same(single, parallel)
+
+
+def test_chunk_size_does_not_change_results(tmp_path):
+    _assert_same(_run(tmp_path, ".csv", ".csv", chunk_size=1), _run(tmp_path, ".csv", ".csv", chunk_size=1000))
+
+
+def test_results_match_scalar_engine(tmp_path):
+    out = _run(tmp_path, ".parquet", ".parquet", chunk_size=5)
+    for row in out.to_dict("records"):
+        work_days = DEFAULT_WORK_DAYS_PER_YEAR if pd.isna(row["work_days_per_year_input"]) else row["work_days_per_year_input"]
+        days = dict(actual_unpaid_vacation_days_taken=row["actual_unpaid_vacation_days_taken"],
+                    work_days_per_year_input=work_days, tax_year=row["tax_year"])
+        credits = 0.0 if pd.isna(row["other_annual_tax_credits"]) else row["other_annual_tax_credits"]
+        if row["tax_year"] not in available_tax_years():
+            continue
+        if pd.isna(row["gross_monthly_income"]):
+            assert pd.isna(row["hpp_cisty_mesicni_prijem_zamestnanec"])
+        else:
+            hpp = calculate_hpp_income(row["gross_monthly_income"], credits, work_days, tax_year=row["tax_year"])
+            assert row["hpp_error"] == hpp.get("error")
+            if "error" not in hpp:
+                assert row["hpp_cisty_mesicni_prijem_zamestnanec"] == hpp["cisty_mesicni_prijem_zamestnanec"]
+        if pd.isna(row["gross_annual_revenue"]):
+            continue
+        vydaje = calculate_ico_pausalni_vydaje_income(
+            row["gross_annual_revenue"], row["expense_percentage"], other_annual_tax_credits=credits,
+            participate_sickness_insurance=row["participate_sickness_insurance"], **days,
+        )
+        assert row["vydaje_error"] == vydaje.get("error")
+        if "error" not in vydaje:
+            assert row["vydaje_cisty_mesicni_prijem_dle_pausalu"] == vydaje["cisty_mesicni_prijem_dle_pausalu"]
+        dan = calculate_ico_pausalni_dan_income(row["gross_annual_revenue"], row["pausalni_dan_band"], **days)
+        assert row["dan_error"] == dan.get("error")
+        if "error" not in dan:
+            assert row["dan_cisty_mesicni_prijem"] == dan["cisty_mesicni_prijem"]
+
+
+def test_fractional_days_are_not_truncated(tmp_path):
+    row = _run(tmp_path, ".csv", ".csv").iloc[11]
+    assert row["actual_unpaid_vacation_days_taken"] == 2.5
+    exact = calculate_ico_pausalni_vydaje_income(1000000.0, 0.6, participate_sickness_insurance=True,
+                                                 actual_unpaid_vacation_days_taken=2.5, work_days_per_year_input=251)
+    assert exact["info_k_efektivite_dnu"]["uvazovane_pracovni_dny_pro_denni_sazbu"] == 248.5
+    assert row["vydaje_cisty_denni_prijem_dle_pausalu_efektivni"] == exact["cisty_denni_prijem_dle_pausalu_efektivni"]
+    assert row["dan_cisty_denni_prijem_efektivni"] == calculate_ico_pausalni_dan_income(
+        1000000.0, 1, actual_unpaid_vacation_days_taken=2.5, work_days_per_year_input=251)["cisty_denni_prijem_efektivni"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_unsupported_tax_year_fails_only_its_row(tmp_path, workers):
+    out = _run(tmp_path, ".parquet", ".parquet", chunk_size=5, workers=workers)
+    assert len(out) == len(SCENARIOS)
+    with pytest.raises(ValueError) as raised:
+        get_tax_params(2031)
+    failed = out.iloc[12]
+    assert failed["hpp_error"] == failed["vydaje_error"] == failed["dan_error"] == str(raised.value)
+    assert pd.isna(failed["hpp_cisty_mesicni_prijem_zamestnanec"]) and pd.isna(failed["dan_cisty_mesicni_prijem"])
+    # The other rows of its chunk are computed
+    assert out.iloc[11]["vydaje_error"] is None and not pd.isna(out.iloc[11]["vydaje_cisty_mesicni_prijem_dle_pausalu"])
+
+
+def test_fractional_tax_year_is_reported(tmp_path):
+    input_path, output_path = tmp_path / "in.csv", tmp_path / "out.csv"
+    _write(pd.DataFrame({"gross_monthly_income": [50000.0, 50000.0], "tax_year": [2024.5, 2024.0]}), input_path)
+    run(input_path, output_path)
+    out = _read(output_path)
+    assert out["hpp_error"][0].startswith("Pro rok 2024.5 ")
+    assert out["hpp_error"][1] is None
+    assert out["hpp_cisty_mesicni_prijem_zamestnanec"][1] == calculate_hpp_income(50000.0, tax_year=2024)["cisty_mesicni_prijem_zamestnanec"]
+
+
+def test_main_rejects_unknown_format_and_bad_options(tmp_path):
+    input_path = tmp_path / "in.csv"
+    _write(SCENARIOS, input_path)
+    with pytest.raises(SystemExit):
+        main([str(input_path), str(tmp_path / "out.xlsx")])
+    with pytest.raises(SystemExit):
+        main([str(input_path), str(tmp_path / "out.csv"), "--workers", "0"])
+    assert main([str(input_path), str(tmp_path / "out.txt"), "--output-format", "csv"]) == 0
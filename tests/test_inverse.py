@@ -0,0 +1,63 @@
+"""Inverse calculator: gross HPP salary and IČO billing for a target net monthly income."""
+
+import math
+
+import numpy as np
+import pytest
+
+from cisko.engine import calculate_hpp_income
+from cisko.params import available_tax_years
+from cisko.solver import break_even_gross_monthly_hpp, break_even_gross_monthly_hpp_batch, break_even_table, break_even_table_batch
+
+TARGET_NET_MONTHLY_INCOMES = [0.001, 0.01, 1.0, 999.99, 15000.0, 20833.33, 31234.57, 50000.0, 80000.0, 123456.78, 300000.0]
+
+
+def _net_annual(gross_monthly, other_annual_tax_credits, tax_year):
+    return calculate_hpp_income(gross_monthly, other_annual_tax_credits, tax_year=tax_year)["cisty_rocni_prijem_zamestnanec"]
+
+
+@pytest.mark.parametrize("tax_year", available_tax_years())
+@pytest.mark.parametrize("other_annual_tax_credits", [0.0, 15204.0, 60000.0])
+def test_hpp_gross_is_smallest_salary_reaching_target(tax_year, other_annual_tax_credits):
+    for target in TARGET_NET_MONTHLY_INCOMES:
+        gross = break_even_gross_monthly_hpp(target, other_annual_tax_credits, tax_year=tax_year)
+        assert _net_annual(gross, other_annual_tax_credits, tax_year) >= target * 12
+        assert _net_annual(round(gross - 0.01, 2), other_annual_tax_credits, tax_year) < target * 12
+
+
+def test_random_targets_reach_target_to_the_haler():
+    rng = np.random.default_rng(5)
+    for target in np.round(rng.uniform(1, 300000, 300), 2):
+        gross = break_even_gross_monthly_hpp(float(target))
+        assert _net_annual(gross, 0.0, 2024) >= target * 12
+        assert _net_annual(round(gross - 0.01, 2), 0.0, 2024) < target * 12
+
+
+@pytest.mark.parametrize("target", [0.0, -5.0])
+def test_non_positive_target_needs_no_salary(target):
+    assert break_even_gross_monthly_hpp(target) == 0.0
+
+
+def test_tiny_target_gives_lowest_salary():
+    assert break_even_gross_monthly_hpp(0.001) == 0.01
+    assert break_even_gross_monthly_hpp_batch([0.001])[0] == 0.01
+
+
+def test_batch_matches_scalar():
+    targets = TARGET_NET_MONTHLY_INCOMES + [0.0]
+    assert list(break_even_gross_monthly_hpp_batch(targets, 15204.0, tax_year=2025)) == [
+        break_even_gross_monthly_hpp(t, 15204.0, tax_year=2025) for t in targets
+    ]
+
+
+def test_table_batch_matches_table():
+    inputs = dict(realne_rocni_provozni_naklady=30000.0, actual_unpaid_vacation_days_taken=20, mandays_per_year=200)
+    targets = [0.001, 30000.0, 80000.0, 150000.0, 400000.0]
+    table = break_even_table_batch(targets, **inputs)
+    for i, target in enumerate(targets):
+        assert table["hruba_mesicni_mzda_hpp"][i] == break_even_gross_monthly_hpp(target)
+        for row in break_even_table(target, **inputs):
+            columns = table["rezimy"][row["rezim"]]
+            for key in ("skutecny_rocni_obrat", "cilovy_rocni_obrat", "mesicni_fakturace", "denni_sazba"):
+                value = columns[key][i]
+                assert (math.isnan(value) if row[key] is None else value == pytest.approx(row[key], abs=1e-9)), (target, row["rezim"], key)
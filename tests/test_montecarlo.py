@@ -0,0 +1,95 @@
+"""Monte Carlo: a seed gives the same years for any worker count, and each year matches the engine."""
+
+import math
+
+import numpy as np
+import pytest
+
+from cisko.engine import calculate_ico_pausalni_dan_income, calculate_ico_pausalni_vydaje_income
+from cisko.montecarlo import sample_years, simulate_ico_income
+
+SIMULATION = dict(
+    planned_annual_revenue=1200000.0,
+    expense_percentage=0.6,
+    participate_sickness_insurance=True,
+    unpaid_vacation_days=20,
+    mean_unpaid_sick_days=6.0,
+    mean_unbilled_days=10.0,
+    day_rate_volatility=0.15,
+    hpp_net_monthly_income=60000.0,
+    simulations=5000,
+    chunk_size=1200,
+    return_samples=True,
+)
+
+
+def _without_samples(result: dict) -> dict:
+    return {key: value for key, value in result.items() if key != "vzorky"}
+
+
+def test_seed_gives_the_same_result_for_any_worker_count():
+    single = simulate_ico_income(seed=123, workers=1, **SIMULATION)
+    parallel = simulate_ico_income(seed=123, workers=3, **SIMULATION)
+    np.testing.assert_array_equal(single["vzorky"], parallel["vzorky"])
+    assert _without_samples(single) == _without_samples(parallel)
+
+
+def test_different_seeds_give_different_years():
+    first = simulate_ico_income(seed=1, **SIMULATION)
+    second = simulate_ico_income(seed=2, **SIMULATION)
+    assert not np.array_equal(first["vzorky"], second["vzorky"])
+
+
+def test_result_reports_the_drawn_seed_for_repeating_the_run():
+    first = simulate_ico_income(**SIMULATION)
+    repeated = simulate_ico_income(seed=first["seed"], **SIMULATION)
+    np.testing.assert_array_equal(first["vzorky"], repeated["vzorky"])
+
+
+def test_sampled_years_match_the_scalar_engine():
+    samples = simulate_ico_income(1500000.0, pausalni_dan_band=2, unpaid_vacation_days=25, mean_unpaid_sick_days=8.0,
+                                  mean_unbilled_days=15.0, day_rate_volatility=0.2, simulations=200, seed=11,
+                                  return_samples=True)["vzorky"]
+    # The same draws as one chunk of the simulation: its first child seed
+    years = sample_years(np.random.default_rng(np.random.SeedSequence(11).spawn(1)[0]), 200, 1500000.0,
+                         unpaid_vacation_days=25, mean_unpaid_sick_days=8.0, mean_unbilled_days=15.0,
+                         day_rate_volatility=0.2)
+    assert np.all(years["actual_unpaid_vacation_days_taken"] + years["actual_unpaid_sick_days_taken"] <= 252)
+    for i in range(200):
+        result = calculate_ico_pausalni_dan_income(
+            years["gross_annual_revenue"][i], 2,
+            actual_unpaid_vacation_days_taken=years["actual_unpaid_vacation_days_taken"][i],
+            actual_unpaid_sick_days_taken=years["actual_unpaid_sick_days_taken"][i],
+        )
+        if "error" in result:
+            assert math.isnan(samples[i])
+        else:
+            assert samples[i] == pytest.approx(result["cisty_mesicni_prijem"], abs=0.005)
+
+
+def test_without_randomness_every_year_is_the_deterministic_one():
+    result = simulate_ico_income(900000.0, expense_percentage=0.6, unpaid_vacation_days=20, simulations=100, seed=5,
+                                 return_samples=True)
+    expected = calculate_ico_pausalni_vydaje_income(900000.0 * 232 / 252, 0.6, actual_unpaid_vacation_days_taken=20)
+    net = expected["info_k_realnym_nakladum"]["cisty_mesicni_prijem_disponibilni_po_realnych_nakladech"]
+    assert result["deterministicky_cisty_mesicni_prijem"] == pytest.approx(net, abs=0.005)
+    assert np.allclose(result["vzorky"], result["deterministicky_cisty_mesicni_prijem"], atol=0.005)
+    assert result["smerodatna_odchylka"] == 0.0
+
+
+def test_mean_year_over_the_pausalni_dan_limit_has_no_deterministic_figure():
+    result = simulate_ico_income(2300000.0, pausalni_dan_band=3, day_rate_volatility=0.3, simulations=2000, seed=1)
+    assert result["deterministicky_cisty_mesicni_prijem"] is None
+    assert 0 < result["podil_neplatnych"] < 1
+    assert result["prumer"] is not None
+
+
+@pytest.mark.parametrize("arguments", [
+    dict(expense_percentage=0.6, pausalni_dan_band=1),
+    dict(),
+    dict(expense_percentage=0.6, simulations=0),
+    dict(expense_percentage=0.6, workers=0),
+])
+def test_invalid_arguments_are_rejected(arguments):
+    with pytest.raises(ValueError):
+        simulate_ico_income(1000000.0, **arguments)
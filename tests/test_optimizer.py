@@ -0,0 +1,90 @@
+"""Regime ranking: the same variants, values and order as a brute force over the scalar engine."""
+
+import random
+
+import pytest
+
+from cisko.engine import calculate_ico_pausalni_dan_income, calculate_ico_pausalni_vydaje_income
+from cisko.optimizer import band_is_eligible, rank_regimes
+from cisko.params import available_tax_years, get_tax_params
+
+REVENUES = [0.0, 0.01, 250000.0, 999999.99, 1000000.0, 1000000.01, 1499999.99, 1500000.0, 1500000.01,
+            1999999.99, 2000000.0, 2000000.01, 3500000.0]
+RANDOM_REVENUES = [round(random.Random(7).lognormvariate(13.8, 0.6) * k, 2) for k in (0.5, 1.0, 1.5, 2.0)]
+ACTIVITY_PERCENTAGES = [None, 0.8, 0.6, 0.4, 0.3]
+INPUTS = [
+    {},
+    {"realne_rocni_provozni_naklady": 150000.0, "other_annual_tax_credits": 15204.0},
+    {"sickness_insurance_assessment_base_monthly": 30000.0, "actual_unpaid_vacation_days_taken": 20},
+]
+
+
+def _band_allowed(band: int, revenue: float, activity_expense_percentage: float | None) -> bool:
+    """The paušální daň band rules for 2023-2026, written out independently of tax_params.json."""
+    if band == 1:
+        return revenue <= 1000000.0 or (revenue <= 1500000.0 and activity_expense_percentage in (0.8, 0.6)) or (
+            revenue <= 2000000.0 and activity_expense_percentage == 0.8)
+    if band == 2:
+        return revenue <= 1500000.0 or (revenue <= 2000000.0 and activity_expense_percentage in (0.8, 0.6))
+    return revenue <= 2000000.0
+
+
+def _brute_force(revenue: float, activity_expense_percentage: float | None, tax_year: int, inputs: dict) -> dict:
+    """Regime name -> disposable annual net income, one scalar engine call per variant."""
+    p = get_tax_params(tax_year)
+    costs = inputs.get("realne_rocni_provozni_naklady", 0.0)
+    days = {key: value for key, value in inputs.items() if key.startswith("actual_")}
+    percentages = p.expense_caps if activity_expense_percentage is None else [activity_expense_percentage]
+    nets = {}
+    for percentage in percentages:
+        for sickness in (False, True):
+            result = calculate_ico_pausalni_vydaje_income(
+                revenue, percentage,
+                realne_rocni_provozni_naklady=costs,
+                other_annual_tax_credits=inputs.get("other_annual_tax_credits", 0.0),
+                participate_sickness_insurance=sickness,
+                sickness_insurance_assessment_base_monthly=inputs.get("sickness_insurance_assessment_base_monthly"),
+                tax_year=tax_year, **days,
+            )
+            name = f"Paušální výdaje {int(percentage * 100)}%" + (" + nemocenské" if sickness else "")
+            nets[name] = result["info_k_realnym_nakladum"]["cisty_rocni_prijem_disponibilni_po_realnych_nakladech"]
+    for band in p.pausalni_dan_bands_monthly:
+        if _band_allowed(band, revenue, activity_expense_percentage):
+            result = calculate_ico_pausalni_dan_income(revenue, band, tax_year=tax_year, **days)
+            nets[f"Paušální daň {band}. pásmo"] = result["cisty_rocni_prijem"] - costs
+    return nets
+
+
+@pytest.mark.parametrize("tax_year", available_tax_years())
+@pytest.mark.parametrize("inputs", INPUTS, ids=["plain", "costs_credits", "sickness_days"])
+def test_ranking_matches_brute_force(tax_year, inputs):
+    for revenue in REVENUES + RANDOM_REVENUES:
+        for activity_expense_percentage in ACTIVITY_PERCENTAGES:
+            rows = rank_regimes(revenue, activity_expense_percentage=activity_expense_percentage, tax_year=tax_year, **inputs)
+            expected = _brute_force(revenue, activity_expense_percentage, tax_year, inputs)
+            case = (revenue, activity_expense_percentage)
+            assert {row["rezim"] for row in rows} == set(expected), case
+            for row in rows:
+                # The optimizer subtracts the unrounded premium, the engine rounds each result: at most a haléř apart
+                assert row["cisty_rocni_prijem_disponibilni"] == pytest.approx(expected[row["rezim"]], abs=0.011), (case, row["rezim"])
+            nets = [row["cisty_rocni_prijem_disponibilni"] for row in rows]
+            assert nets == sorted(nets, reverse=True), case
+            assert rows[0]["nejlepsi"] and not any(row["nejlepsi"] for row in rows[1:])
+            assert rows[0]["cisty_rocni_prijem_disponibilni"] == pytest.approx(max(expected.values()), abs=0.011), case
+            assert rows[0]["rozdil_oproti_nejlepsimu"] == 0.0
+            assert all(row["rozdil_oproti_nejlepsimu"] <= 0.0 for row in rows)
+
+
+@pytest.mark.parametrize("tax_year", available_tax_years())
+def test_band_limits_from_tax_params_match_the_rules(tax_year):
+    p = get_tax_params(tax_year)
+    for band in p.pausalni_dan_bands_monthly:
+        for revenue in REVENUES:
+            for activity_expense_percentage in ACTIVITY_PERCENTAGES:
+                assert band_is_eligible(p, band, revenue, activity_expense_percentage) == _band_allowed(
+                    band, revenue, activity_expense_percentage), (band, revenue, activity_expense_percentage)
+
+
+def test_negative_revenue_is_rejected():
+    with pytest.raises(ValueError):
+        rank_regimes(-1.0)
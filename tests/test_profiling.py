@@ -0,0 +1,97 @@
+"""Rerun profiler: bounded per-session state, interrupted and fragment reruns, metrics file summary."""
+
+import json
+
+import pytest
+
+from cisko import profiling
+from cisko.profiling import Profiler, summarize_metrics_file
+
+
+def _rerun(profiler: Profiler, session_id: str, *phases: str, finish: bool = True):
+    rerun = profiler.start_rerun(session_id)
+    for phase in phases:
+        rerun.checkpoint(phase)
+    if finish:
+        rerun.finish()
+    return rerun
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler(enabled=False)
+    _rerun(profiler, "a", "vstupy")
+    with profiler.start_fragment_rerun("a", "fragment_x"):
+        pass
+    assert profiler.summary() == []
+    assert profiler.stats() == {"relace": 0, "behy": 0, "behy_fragmentu": 0, "prerusene_behy": 0}
+
+
+def test_finished_reruns_are_summed_per_phase():
+    profiler = Profiler(enabled=True)
+    _rerun(profiler, "a", "vstupy", "vypocet", "vstupy")
+    _rerun(profiler, "b", "vstupy")
+    rows = {row["faze"]: row for row in profiler.summary()}
+    assert list(rows) == ["vstupy", "vypocet", "celkem"]
+    assert rows["vstupy"]["pocet"] == 2 and rows["celkem"]["pocet"] == 2
+    last = profiler.last_rerun("a")
+    assert last["celkem"] == pytest.approx(last["vstupy"] + last["vypocet"])
+    assert profiler.reruns("a") == 1 and profiler.reruns("unknown") == 0
+
+
+def test_rerun_ending_early_is_recorded_as_interrupted_when_the_next_one_starts():
+    profiler = Profiler(enabled=True)
+    _rerun(profiler, "a", "vstupy", finish=False)  # e.g. st.stop() after the inputs
+    assert profiler.stats()["behy"] == 0
+    _rerun(profiler, "a", "vstupy", "vypocet")
+    assert profiler.stats() == {"relace": 1, "behy": 2, "behy_fragmentu": 0, "prerusene_behy": 1}
+    rows = {row["faze"]: row for row in profiler.summary()}
+    # The interrupted rerun counts for the phases it reached, not for the total
+    assert rows["vstupy"]["pocet"] == 2 and rows["celkem"]["pocet"] == 1
+    assert "vypocet" in profiler.last_rerun("a")
+
+
+def test_fragment_rerun_is_its_own_rerun_without_a_total():
+    profiler = Profiler(enabled=True)
+    with profiler.start_fragment_rerun("a", "fragment_cashflow"):
+        pass
+    with pytest.raises(RuntimeError):
+        with profiler.start_fragment_rerun("a", "fragment_cashflow"):
+            raise RuntimeError
+    assert profiler.stats() == {"relace": 1, "behy": 0, "behy_fragmentu": 2, "prerusene_behy": 1}
+    assert [row["faze"] for row in profiler.summary()] == ["fragment_cashflow"]
+    assert profiler.last_rerun("a") is None
+
+
+def test_only_the_most_recently_active_sessions_are_kept(monkeypatch):
+    monkeypatch.setattr(profiling, "MAX_SESSIONS", 3)
+    profiler = Profiler(enabled=True)
+    for session_id in "abcd":
+        _rerun(profiler, session_id, "vstupy")
+    _rerun(profiler, "b", "vstupy")
+    _rerun(profiler, "e", "vstupy")
+    assert profiler.stats()["relace"] == 3
+    assert profiler.reruns("a") == 0 and profiler.reruns("c") == 0
+    assert profiler.reruns("b") == 2
+    # The aggregates still cover every rerun
+    assert profiler.stats()["behy"] == 6
+    assert {row["faze"]: row["pocet"] for row in profiler.summary()}["vstupy"] == 6
+
+
+def test_metrics_file_rebuilds_the_same_summary(tmp_path):
+    metrics_file = tmp_path / "metrics.jsonl"
+    profiler = Profiler(enabled=True, metrics_file=metrics_file)
+    _rerun(profiler, "a", "vstupy", "vypocet")
+    _rerun(profiler, "a", "vstupy", finish=False)
+    _rerun(profiler, "b", "vstupy")
+    with profiler.start_fragment_rerun("b", "fragment_simulace"):
+        pass
+    _rerun(profiler, "a", "vstupy")
+    lines = [json.loads(line) for line in metrics_file.read_text(encoding="utf-8").splitlines()]
+    assert [(line["session"], line["rerun"]) for line in lines] == [("a", 1), ("b", 1), ("b", 2), ("a", 2), ("a", 3)]
+    assert lines[2]["fragment"] == "fragment_simulace"
+    assert lines[3]["preruseno"] and "celkem" not in lines[3]["faze_ms"]
+    # The file keeps durations to a microsecond
+    rebuilt, summary = summarize_metrics_file(metrics_file), profiler.summary()
+    assert [row["faze"] for row in rebuilt] == [row["faze"] for row in summary]
+    for a, b in zip(rebuilt, summary):
+        assert a == pytest.approx(b, abs=0.002)
@@ -0,0 +1,126 @@
+"""Result records: the legacy dict view, unrounded attributes, error records and pickling."""
+
+import pickle
+
+import pytest
+
+from cisko.engine import (
+    calculate_hpp_income,
+    calculate_hpp_income_record,
+    calculate_ico_pausalni_dan_income,
+    calculate_ico_pausalni_dan_income_record,
+    calculate_ico_pausalni_vydaje_income,
+    calculate_ico_pausalni_vydaje_income_record,
+)
+from cisko.records import HppResult, IcoPausalniDanResult, IcoPausalniVydajeResult
+
+CALCULATIONS = [
+    (calculate_hpp_income_record, calculate_hpp_income, (64321.123, 15204.0)),
+    (calculate_ico_pausalni_vydaje_income_record, calculate_ico_pausalni_vydaje_income, (1234567.891, 0.6)),
+    (calculate_ico_pausalni_dan_income_record, calculate_ico_pausalni_dan_income, (987654.321, 2)),
+    # Without revenue the band is reported as "-"
+    (calculate_ico_pausalni_dan_income_record, calculate_ico_pausalni_dan_income, (0.0, 1)),
+]
+
+
+@pytest.mark.parametrize("record_function, dict_function, args", CALCULATIONS)
+def test_as_dict_is_the_calculate_result(record_function, dict_function, args):
+    record, expected = record_function(*args), dict_function(*args)
+    assert record.as_dict() == expected
+    # Same keys in the same order, nested dicts included
+    assert list(record.as_dict()) == list(expected)
+    assert [list(value) for value in record.as_dict().values() if isinstance(value, dict)] == \
+        [list(value) for value in expected.values() if isinstance(value, dict)]
+
+
+@pytest.mark.parametrize("record_function, dict_function, args", CALCULATIONS)
+def test_mapping_protocol_shows_the_legacy_dict(record_function, dict_function, args):
+    record, expected = record_function(*args), dict_function(*args)
+    assert list(record) == list(expected) and list(record.keys()) == list(expected)
+    assert len(record) == len(expected)
+    assert {key: record[key] for key in record} == expected
+    assert dict(record.items()) == expected
+    assert record == expected
+    assert "typ" in record and "error" not in record
+    assert record.get("error") is None and record.get("nope", 1) == 1
+    with pytest.raises(KeyError):
+        record["nope"]
+
+
+def test_items_are_rounded_and_attributes_are_not():
+    record = calculate_ico_pausalni_vydaje_income_record(1234567.891, 0.6, realne_rocni_provozni_naklady=12345.678,
+                                                        actual_unpaid_vacation_days_taken=2.5)
+    assert record.hruby_rocni_prijem_obrat == 1234567.891
+    assert record["hruby_rocni_prijem_obrat"] == 1234567.89
+    assert record.vstup_realne_rocni_provozni_naklady == 12345.678
+    assert record["info_k_realnym_nakladum"]["vstup_realne_rocni_provozni_naklady"] == 12345.68
+    # Fields reported as they are
+    assert record["procento_pausalnich_vydaju"] == 0.6
+    assert record["info_k_efektivite_dnu"]["uvazovane_pracovni_dny_pro_denni_sazbu"] == 249.5
+    # Nested keys are not top-level keys or items
+    assert "vstup_realne_rocni_provozni_naklady" not in record
+    with pytest.raises(AttributeError):
+        record.info_k_realnym_nakladum
+
+
+def test_nested_views_are_fresh_dicts():
+    record = calculate_ico_pausalni_vydaje_income_record(1000000.0, 0.6)
+    view = record["info_k_realnym_nakladum"]
+    view["vstup_realne_rocni_provozni_naklady"] = -1
+    record.as_dict()["info_k_efektivite_dnu"].clear()
+    assert record["info_k_realnym_nakladum"]["vstup_realne_rocni_provozni_naklady"] == 0
+    assert record.as_dict() == calculate_ico_pausalni_vydaje_income(1000000.0, 0.6)
+
+
+@pytest.mark.parametrize("record", [
+    calculate_hpp_income_record(-1.0),
+    calculate_ico_pausalni_vydaje_income_record(1000000.0, 0.5),
+    calculate_ico_pausalni_dan_income_record(1000000.0, 9),
+    IcoPausalniDanResult.failed(2025, "Chyba."),
+])
+def test_error_records_show_only_the_error(record):
+    assert record.error
+    assert record.as_dict() == {"error": record.error}
+    assert list(record) == ["error"] and len(record) == 1
+    assert record["error"] == record.error and "error" in record
+    assert "typ" not in record
+    with pytest.raises(KeyError):
+        record["typ"]
+    with pytest.raises(AttributeError):
+        record.hruby_rocni_prijem_obrat
+
+
+def test_records_are_read_only_and_have_no_dict():
+    record = calculate_hpp_income_record(50000.0)
+    with pytest.raises(AttributeError):
+        record.error = "x"
+    with pytest.raises(AttributeError):
+        record.cisty_mesicni_prijem_zamestnanec = 1.0
+    with pytest.raises(AttributeError):
+        del record.tax_year
+    with pytest.raises(TypeError):
+        record["typ"] = "x"
+    assert not hasattr(record, "__dict__")
+    assert record.as_dict() == calculate_hpp_income(50000.0)
+
+
+@pytest.mark.parametrize("record", [
+    calculate_hpp_income_record(50000.0, tax_year=2023),
+    calculate_ico_pausalni_vydaje_income_record(1000000.0, 0.6, participate_sickness_insurance=True),
+    calculate_ico_pausalni_dan_income_record(0.0, 1),
+    HppResult.failed(2024, "Chyba."),
+])
+def test_pickling_keeps_type_year_values_and_error(record):
+    # Process pools pickle whatever crosses to a worker process
+    copy = pickle.loads(pickle.dumps(record))
+    assert type(copy) is type(record)
+    assert (copy.tax_year, copy.values, copy.error) == (record.tax_year, record.values, record.error)
+    assert copy.as_dict() == record.as_dict()
+
+
+def test_record_types_and_repr():
+    record = calculate_ico_pausalni_vydaje_income_record(600000.0, 0.6, tax_year=2025)
+    assert type(record) is IcoPausalniVydajeResult
+    assert record.tax_year == 2025 and record["rok_kalkulace"] == 2025
+    assert record["typ"] == IcoPausalniVydajeResult.TYP
+    assert repr(record) == f"IcoPausalniVydajeResult({record.as_dict()!r})"
@@ -0,0 +1,286 @@
+"""Scenarios: permalink round trip, invalid query parameters, hash normalization, the SQLite store and batched calculation."""
+
+import numpy as np
+import pytest
+
+from cisko import scenarios
+from cisko.params import available_tax_years
+from cisko.scenarios import (
+    ICO_INPUT_PERIODS,
+    ICO_MODES,
+    SCENARIO_FIELDS,
+    ScenarioStore,
+    calculate_scenario,
+    calculate_scenarios,
+    decode_scenario,
+    default_scenario,
+    encode_scenario,
+    scenario_hash,
+)
+
+SCENARIO = {
+    **default_scenario(),
+    "tax_year": 2025,
+    "work_days_per_year_input": 250,
+    "other_annual_tax_credits": 15204.0,
+    "hpp_gross_monthly_income": 80000.0,
+    "ico_input_period": "Denní sazba (man-day rate)",
+    "ico_daily_rate": 6500.5,
+    "ico_mandays_per_year": 210,
+    "ico_unpaid_vacation": 25,
+    "ico_unpaid_sick": 3,
+    "ico_mode": "Paušální výdaje",
+    "expense_percentage": 0.4,
+    "realne_rocni_provozni_naklady": 0.1,
+    "participate_sickness_insurance": True,
+    "sickness_insurance_assessment_base_monthly": 12345.67,
+}
+
+
+def _as_dicts(results: dict) -> dict:
+    return {key: record.as_dict() for key, record in results.items()}
+
+
+def test_permalink_round_trip():
+    params = encode_scenario(SCENARIO)
+    assert all(isinstance(value, str) for value in params.values())
+    scenario, invalid = decode_scenario(params)
+    assert invalid == []
+    assert {**default_scenario(), **scenario} == SCENARIO
+
+
+def test_defaults_are_left_out_of_the_permalink():
+    assert encode_scenario(default_scenario()) == {}
+    assert encode_scenario({}) == {}
+    params = encode_scenario({**default_scenario(), "hpp_gross_monthly_income": 80000.0, "ico_mode": "Paušální daň"})
+    assert params == {"h": "80000", "m": "1"}
+    assert decode_scenario(params) == ({"hpp_gross_monthly_income": 80000.0, "ico_mode": "Paušální daň"}, [])
+
+
+@pytest.mark.parametrize("key, text", [
+    ("p", "3"),
+    ("p", "-1"),
+    ("m", "x"),
+    ("np", "2"),
+    ("np", "true"),
+    ("h", "nan"),
+    ("h", "inf"),
+    ("h", "abc"),
+    ("d", "251.5"),
+    ("r", "1999"),
+    ("r", "2025.0"),
+])
+def test_invalid_parameters_are_skipped_and_reported(key, text):
+    scenario, invalid = decode_scenario({key: text, "o": "900000"})
+    assert invalid == [key]
+    assert scenario == {"ico_annual_revenue": 900000.0}
+
+
+@pytest.mark.parametrize("params, invalid", [
+    ({"h": "-5"}, ["h"]),
+    ({"s": "-1", "n": "-0.5", "o": "-1", "f": "-1", "ds": "-1"}, ["s", "o", "f", "ds", "n"]),
+    ({"d": "1000"}, ["d"]),
+    ({"d": "199"}, ["d"]),
+    ({"uv": "500"}, ["uv"]),
+    ({"us": "-1"}, ["us"]),
+    # The day counts are limited by the work days of the link, or the default ones
+    ({"d": "210", "md": "220", "uv": "210"}, ["md"]),
+    ({"d": "1000", "us": "280"}, ["d", "us"]),
+    ({"b": "7", "m": "1"}, ["b"]),
+    ({"b": "0"}, ["b"]),
+    ({"e": "0.5"}, ["e"]),
+    # Limits of the link's tax year
+    ({"r": "2025", "np": "1", "nz": "8000"}, ["nz"]),
+    # Without a valid year the default year's limits apply
+    ({"r": "1999", "np": "1", "nz": "7500"}, ["r", "nz"]),
+])
+def test_values_outside_the_widget_limits_are_skipped_and_reported(params, invalid):
+    scenario, skipped = decode_scenario(params)
+    assert skipped == invalid
+    assert set(scenario) == {name for name, (key, _, _) in SCENARIO_FIELDS.items() if key in params and key not in invalid}
+
+
+@pytest.mark.parametrize("params", [
+    {"d": "200", "uv": "200", "us": "0", "md": "200"},
+    {"d": "300", "md": "300"},
+    {"h": "0", "o": "0", "n": "0"},
+    {"e": "0.3"},
+    {"e": "0.8", "b": "3"},
+    {"r": "2023", "np": "1", "nz": "8000"},
+])
+def test_values_at_the_widget_limits_are_accepted(params):
+    scenario, invalid = decode_scenario(params)
+    assert invalid == []
+    assert encode_scenario({**default_scenario(), **scenario}) == params
+
+
+def test_unknown_parameters_are_ignored():
+    assert decode_scenario({"utm_source": "x", "b": "2"}) == ({"pausalni_dan_band": 2}, [])
+
+
+@pytest.mark.parametrize("change", [
+    # Other input periods than the monthly billing
+    {"ico_annual_revenue": 2000000.0},
+    {"ico_daily_rate": 9000.0, "ico_mandays_per_year": 180},
+    # The band of the paušální daň mode
+    {"pausalni_dan_band": 3},
+    # The assessment base without the sickness insurance
+    {"sickness_insurance_assessment_base_monthly": 20000.0},
+])
+def test_inputs_the_modes_ignore_do_not_change_the_hash(change):
+    assert scenario_hash({**default_scenario(), **change}) == scenario_hash(default_scenario())
+
+
+def test_pausalni_dan_ignores_the_expense_inputs():
+    dan = {"ico_mode": "Paušální daň", "pausalni_dan_band": 2}
+    assert scenario_hash({**dan, "expense_percentage": 0.8, "realne_rocni_provozni_naklady": 1.0,
+                          "participate_sickness_insurance": True}) == scenario_hash(dan)
+
+
+@pytest.mark.parametrize("change", [
+    {"ico_monthly_billing": 120000.0},
+    {"hpp_gross_monthly_income": 50000.01},
+    {"tax_year": 2023},
+    {"ico_unpaid_sick": 6},
+    {"participate_sickness_insurance": True},
+    {"ico_mode": "Paušální daň"},
+])
+def test_inputs_the_modes_use_change_the_hash(change):
+    assert scenario_hash({**default_scenario(), **change}) != scenario_hash(default_scenario())
+
+
+def test_hash_does_not_depend_on_int_or_float_values_or_missing_defaults():
+    assert scenario_hash({"hpp_gross_monthly_income": 80000}) == scenario_hash(
+        {**default_scenario(), "hpp_gross_monthly_income": 80000.0}
+    )
+    assert scenario_hash({"work_days_per_year_input": 250.0}) == scenario_hash({"work_days_per_year_input": 250})
+
+
+def test_results_version_is_part_of_the_hash(monkeypatch):
+    before = scenario_hash(SCENARIO)
+    monkeypatch.setattr(scenarios, "RESULTS_VERSION", scenarios.RESULTS_VERSION + 1)
+    assert scenario_hash(SCENARIO) != before
+
+
+def test_store_computes_once_and_returns_equal_records(tmp_path):
+    store = ScenarioStore(tmp_path / "store.sqlite3")
+    assert store.get(SCENARIO) is None
+    results, from_store = store.get_or_calculate(SCENARIO)
+    assert not from_store
+    # An equivalent scenario written differently is the same entry
+    stored, from_store = store.get_or_calculate({**SCENARIO, "ico_annual_revenue": 1.0, "tax_year": 2025.0})
+    assert from_store
+    assert (store.hits, store.misses) == (1, 1)
+    expected = _as_dicts(calculate_scenario(SCENARIO))
+    assert _as_dicts(results) == expected
+    assert _as_dicts(stored) == expected
+    assert type(stored["ico"]) is type(results["ico"])
+    # The store is a file shared by processes
+    assert _as_dicts(ScenarioStore(tmp_path / "store.sqlite3").get(SCENARIO)) == expected
+
+
+def test_store_many_computes_each_new_scenario_once(tmp_path):
+    store = ScenarioStore(tmp_path / "store.sqlite3")
+    store.get_or_calculate(default_scenario())
+    batch = [
+        default_scenario(),
+        SCENARIO,
+        {**SCENARIO, "pausalni_dan_band": 3},  # the same as SCENARIO
+        {"ico_mode": "Paušální daň", "pausalni_dan_band": 2},
+    ]
+    results, from_store = store.get_or_calculate_many(batch)
+    assert from_store == 1
+    assert (store.hits, store.misses) == (1, 4)
+    for scenario, result in zip(batch, results):
+        assert _as_dicts(result) == _as_dicts(calculate_scenario(scenario))
+    assert results[1] is results[2]
+    _, from_store = store.get_or_calculate_many(batch)
+    assert from_store == len(batch)
+
+
+def test_saved_scenarios_are_listed_until_forgotten(tmp_path):
+    store = ScenarioStore(tmp_path / "store.sqlite3")
+    with pytest.raises(ValueError):
+        store.save(SCENARIO, "  ")
+    first = store.save(SCENARIO, " Denní sazba ")
+    second = store.save({"ico_mode": "Paušální daň"}, "Paušální daň")
+    saved = store.saved_scenarios()
+    assert [(row["hash"], row["nazev"]) for row in saved] == [(first, "Denní sazba"), (second, "Paušální daň")]
+    assert saved[0]["params"] == encode_scenario(SCENARIO)
+    assert _as_dicts(saved[0]["vysledky"]) == _as_dicts(calculate_scenario(SCENARIO))
+    store.forget(first)
+    assert [row["hash"] for row in store.saved_scenarios()] == [second]
+    # Forgetting keeps the results stored
+    assert store.get(SCENARIO) is not None
+
+
+def test_saved_scenarios_are_recomputed_after_a_version_change(tmp_path, monkeypatch):
+    store = ScenarioStore(tmp_path / "store.sqlite3")
+    old = store.save(SCENARIO, "Denní sazba")
+    monkeypatch.setattr(scenarios, "RESULTS_VERSION", scenarios.RESULTS_VERSION + 1)
+    saved = store.saved_scenarios()
+    assert [row["nazev"] for row in saved] == ["Denní sazba"]
+    assert saved[0]["hash"] == scenario_hash(SCENARIO) != old
+    assert store.saved_scenarios()[0]["hash"] == saved[0]["hash"]
+
+
+def _varied_scenarios() -> list:
+    rng = np.random.default_rng(18)
+    varied = []
+    for i in range(120):
+        varied.append({
+            "tax_year": int(rng.choice(available_tax_years())),
+            "work_days_per_year_input": int(rng.integers(200, 260)),
+            "other_annual_tax_credits": float(rng.choice([0.0, 15204.0, 30408.0])),
+            "hpp_gross_monthly_income": float(rng.choice([0.0, 18900.0, 50000.0, 80000.0, 250000.0])),
+            "ico_input_period": ICO_INPUT_PERIODS[i % 3],
+            "ico_annual_revenue": float(rng.integers(0, 2500000)),
+            "ico_monthly_billing": float(rng.integers(0, 250000)),
+            "ico_daily_rate": float(rng.integers(1000, 12000)),
+            "ico_mandays_per_year": int(rng.integers(150, 240)),
+            "ico_unpaid_vacation": int(rng.integers(0, 40)),
+            "ico_unpaid_sick": int(rng.integers(0, 20)),
+            "ico_mode": ICO_MODES[i // 3 % 2],
+            "expense_percentage": float(rng.choice([0.3, 0.4, 0.6, 0.8])),
+            "realne_rocni_provozni_naklady": float(rng.integers(0, 200000)),
+            "participate_sickness_insurance": bool(rng.integers(2)),
+            "sickness_insurance_assessment_base_monthly": None if rng.integers(2) else float(rng.integers(0, 30000)),
+            "pausalni_dan_band": int(rng.integers(1, 4)),
+        })
+    return varied
+
+
+def test_batched_scenarios_match_one_by_one():
+    varied = _varied_scenarios()
+    batched = calculate_scenarios(varied)
+    assert len(batched) == len(varied)
+    errors = 0
+    for scenario, results in zip(varied, batched):
+        expected = calculate_scenario(scenario)
+        assert results.keys() == expected.keys()
+        for key in results:
+            assert type(results[key]) is type(expected[key])
+            assert results[key].tax_year == expected[key].tax_year
+            assert results[key].error == expected[key].error
+            assert results[key].as_dict() == expected[key].as_dict()
+            errors += results[key].error is not None
+    # The scenarios cover the failing calculations (over the paušální daň limit) too
+    assert 0 < errors < len(varied)
+
+
+def test_identical_calculations_share_one_record():
+    hpp_only_differs_in_ico = [
+        {"ico_mode": "Paušální daň", "pausalni_dan_band": 1},
+        {"ico_mode": "Paušální výdaje", "expense_percentage": 0.4},
+        {"ico_mode": "Paušální daň", "pausalni_dan_band": 1, "expense_percentage": 0.8},
+        {"tax_year": 2023},
+    ]
+    results = calculate_scenarios(hpp_only_differs_in_ico)
+    assert results[0]["hpp"] is results[1]["hpp"] is results[2]["hpp"]
+    assert results[0]["ico"] is results[2]["ico"]
+    assert results[0]["ico"] is not results[1]["ico"]
+    assert results[3]["hpp"] is not results[0]["hpp"] and results[3]["hpp"].tax_year == 2023
+
+
+def test_no_scenarios():
+    assert calculate_scenarios([]) == []
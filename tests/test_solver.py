@@ -0,0 +1,89 @@
+"""Break-even revenue: the smallest haléř amount whose reported net income reaches the target."""
+
+import math
+
+import pytest
+
+from cisko.engine import calculate_ico_pausalni_dan_income, calculate_ico_pausalni_vydaje_income
+from cisko.params import available_tax_years, get_tax_params
+from cisko.solver import break_even_revenue_pausalni_dan, break_even_revenue_pausalni_dan_batch, break_even_revenue_pausalni_vydaje, break_even_revenue_pausalni_vydaje_batch
+
+TAX_YEARS = available_tax_years()
+TARGET_NET_ANNUAL_INCOMES = [0.01, 12.0, 11999.88, 180000.0, 400000.04, 600000.0, 960000.0, 1481481.48, 2400000.0, 4800000.0]
+VYDAJE_INPUTS = [
+    {},
+    {"realne_rocni_provozni_naklady": 60000.0, "participate_sickness_insurance": True},
+    {"other_annual_tax_credits": 15204.0, "actual_unpaid_vacation_days_taken": 20, "actual_unpaid_sick_days_taken": 2.5},
+]
+
+
+def _net_pausalni_vydaje(revenue, expense_percentage, tax_year, inputs):
+    result = calculate_ico_pausalni_vydaje_income(revenue, expense_percentage, tax_year=tax_year, **inputs)
+    return result["info_k_realnym_nakladum"]["cisty_rocni_prijem_disponibilni_po_realnych_nakladech"]
+
+
+def _net_pausalni_dan(revenue, band, tax_year):
+    return calculate_ico_pausalni_dan_income(revenue, band, tax_year=tax_year)["cisty_rocni_prijem"]
+
+
+@pytest.mark.parametrize("tax_year", TAX_YEARS)
+@pytest.mark.parametrize("inputs", VYDAJE_INPUTS, ids=["plain", "costs_sickness", "credits_days"])
+def test_pausalni_vydaje_is_smallest_revenue_reaching_target(tax_year, inputs):
+    for expense_percentage in get_tax_params(tax_year).expense_caps:
+        for target in TARGET_NET_ANNUAL_INCOMES:
+            revenue = break_even_revenue_pausalni_vydaje(target, expense_percentage, tax_year=tax_year, **inputs)
+            assert _net_pausalni_vydaje(revenue, expense_percentage, tax_year, inputs) >= target
+            assert _net_pausalni_vydaje(round(revenue - 0.01, 2), expense_percentage, tax_year, inputs) < target
+
+
+@pytest.mark.parametrize("tax_year", TAX_YEARS)
+def test_pausalni_dan_is_smallest_revenue_reaching_target(tax_year):
+    p = get_tax_params(tax_year)
+    for band in p.pausalni_dan_bands_monthly:
+        for target in TARGET_NET_ANNUAL_INCOMES:
+            revenue = break_even_revenue_pausalni_dan(target, band, tax_year=tax_year)
+            if revenue is None:
+                # Unreachable: even the largest allowed revenue falls short
+                assert _net_pausalni_dan(p.pausalni_dan_max_revenue, band, tax_year) < target
+                continue
+            assert revenue <= p.pausalni_dan_max_revenue
+            assert _net_pausalni_dan(revenue, band, tax_year) >= target
+            assert _net_pausalni_dan(round(revenue - 0.01, 2), band, tax_year) < target
+
+
+@pytest.mark.parametrize("target", [0.0, -1000.0])
+def test_non_positive_target_needs_no_revenue(target):
+    assert break_even_revenue_pausalni_vydaje(target, 0.6) == 0.0
+    assert break_even_revenue_pausalni_dan(target, 1) == 0.0
+
+
+def test_tiny_target_needs_revenue_covering_the_fixed_payments():
+    revenue = break_even_revenue_pausalni_dan(0.001, 1)
+    assert revenue > 0
+    assert _net_pausalni_dan(revenue, 1, 2024) >= 0.001
+    assert _net_pausalni_dan(round(revenue - 0.01, 2), 1, 2024) < 0.001
+
+
+def test_target_above_pausalni_dan_limit_is_unreachable():
+    p = get_tax_params(2024)
+    target = _net_pausalni_dan(p.pausalni_dan_max_revenue, 3, 2024) + 1
+    assert break_even_revenue_pausalni_dan(target, 3) is None
+    assert math.isnan(break_even_revenue_pausalni_dan_batch([target], 3)[0])
+    # Paušální výdaje has no revenue limit
+    assert break_even_revenue_pausalni_vydaje(target, 0.6) is not None
+
+
+def test_invalid_regime_is_unreachable():
+    assert break_even_revenue_pausalni_vydaje(100000.0, 0.5) is None
+    assert break_even_revenue_pausalni_dan(100000.0, 4) is None
+
+
+def test_batch_matches_scalar():
+    targets = TARGET_NET_ANNUAL_INCOMES + [0.0]
+    for expense_percentage in (0.8, 0.4):
+        batch = break_even_revenue_pausalni_vydaje_batch(targets, expense_percentage, realne_rocni_provozni_naklady=60000.0)
+        assert list(batch) == [break_even_revenue_pausalni_vydaje(t, expense_percentage, realne_rocni_provozni_naklady=60000.0) for t in targets]
+    for band in (1, 3):
+        batch = break_even_revenue_pausalni_dan_batch(targets, band)
+        scalar = [break_even_revenue_pausalni_dan(t, band) for t in targets]
+        assert [None if math.isnan(v) else v for v in batch] == scalar
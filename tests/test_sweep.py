@@ -0,0 +1,117 @@
+"""Sensitivity sweep: curves equal the scalar engine and crossovers bracket a sign change."""
+
+import math
+
+import numpy as np
+import pytest
+
+from cisko.engine import calculate_hpp_income, calculate_ico_pausalni_dan_income, calculate_ico_pausalni_vydaje_income
+from cisko.params import available_tax_years, get_tax_params
+from cisko.sweep import HPP_CURVE, build_sweep, find_crossovers, slice_sweep
+
+SWEEP_INPUTS = [
+    {},
+    {"other_annual_tax_credits": 15204.0, "realne_rocni_provozni_naklady": 120000.0},
+    {"actual_unpaid_vacation_days_taken": 20, "actual_unpaid_sick_days_taken": 5},
+]
+
+
+def _net_monthly(curve: str, gross_monthly: float, inputs: dict, tax_year: int) -> float:
+    """Scalar engine value of one sweep curve, NaN where the mode does not apply."""
+    work_days = inputs.get("work_days_per_year_input", 252)
+    vacation = inputs.get("actual_unpaid_vacation_days_taken", 0)
+    sick = inputs.get("actual_unpaid_sick_days_taken", 0)
+    revenue = gross_monthly * 12 * max(0, work_days - vacation - sick) / work_days
+    days = dict(actual_unpaid_vacation_days_taken=vacation, actual_unpaid_sick_days_taken=sick, tax_year=tax_year)
+    credits = inputs.get("other_annual_tax_credits", 0.0)
+    if curve == HPP_CURVE:
+        return calculate_hpp_income(gross_monthly, credits, tax_year=tax_year)["cisty_mesicni_prijem_zamestnanec"]
+    if curve.startswith("Paušální daň"):
+        result = calculate_ico_pausalni_dan_income(revenue, int(curve.split()[2].rstrip(".")), **days)
+        return result.get("cisty_mesicni_prijem", math.nan)
+    percentage = int(curve.split()[2].rstrip("%")) / 100
+    result = calculate_ico_pausalni_vydaje_income(
+        revenue, percentage,
+        realne_rocni_provozni_naklady=inputs.get("realne_rocni_provozni_naklady", 0.0),
+        other_annual_tax_credits=credits,
+        participate_sickness_insurance=curve.endswith("nemocenské"),
+        **days,
+    )
+    return result["info_k_realnym_nakladum"]["cisty_mesicni_prijem_disponibilni_po_realnych_nakladech"]
+
+
+def test_find_crossovers_interpolates_between_grid_points():
+    x = np.arange(6.0)
+    assert find_crossovers(x, x, 5.0 - x) == [2.5]
+    assert find_crossovers(x, x, np.full(6, 10.0)) == []
+
+
+def test_find_crossovers_skips_nan_segments():
+    x = np.arange(5.0)
+    # -1 -> nan and nan -> 1 are not crossings
+    assert find_crossovers(x, np.array([-1.0, np.nan, 1.0, 2.0, 3.0]), np.zeros(5)) == []
+
+
+def test_find_crossovers_reports_a_grid_point_on_the_curve_once():
+    x = np.arange(5.0)
+    assert find_crossovers(x, np.array([-1.0, 0.0, 1.0, 1.0, 1.0]), np.zeros(5)) == [1.0]
+
+
+@pytest.mark.parametrize("tax_year", available_tax_years())
+@pytest.mark.parametrize("inputs", SWEEP_INPUTS, ids=["plain", "credits_costs", "unpaid_days"])
+def test_curves_match_scalar_engine(tax_year, inputs):
+    sweep = build_sweep(max_gross_monthly=250000.0, grid_points=51, tax_year=tax_year, **inputs)
+    x = sweep["hruby_mesicni_prijem"]
+    for curve, values in sweep["krivky"].items():
+        for i in range(0, len(x), 5):
+            expected = _net_monthly(curve, float(x[i]), inputs, tax_year)
+            if math.isnan(expected):
+                assert math.isnan(values[i]), (curve, x[i])
+            else:
+                assert values[i] == pytest.approx(expected, abs=0.005), (curve, x[i])
+
+
+@pytest.mark.parametrize("tax_year", available_tax_years())
+@pytest.mark.parametrize("inputs", SWEEP_INPUTS, ids=["plain", "credits_costs", "unpaid_days"])
+def test_crossovers_bracket_a_sign_change_of_the_difference(tax_year, inputs):
+    sweep = build_sweep(tax_year=tax_year, **inputs)
+    x = sweep["hruby_mesicni_prijem"]
+    step = float(x[1] - x[0])
+    found = 0
+    for curve, crossings in sweep["pruseciky"].items():
+        for crossing in crossings:
+            assert x[0] <= crossing <= x[-1]
+            grid_left = step * math.floor(crossing / step)
+            before = _net_monthly(curve, grid_left, inputs, tax_year) - _net_monthly(HPP_CURVE, grid_left, inputs, tax_year)
+            after = _net_monthly(curve, grid_left + step, inputs, tax_year) - _net_monthly(HPP_CURVE, grid_left + step, inputs, tax_year)
+            assert before * after < 0 or before == 0, (curve, crossing, before, after)
+            found += 1
+    # IČO beats HPP somewhere in 0-250k for every year, so some curve crosses it
+    assert found > 0
+
+
+def test_pausalni_dan_curves_end_at_the_revenue_limit():
+    sweep = build_sweep()
+    limit_monthly = get_tax_params().pausalni_dan_max_revenue / 12
+    x = sweep["hruby_mesicni_prijem"]
+    for curve, values in sweep["krivky"].items():
+        if curve.startswith("Paušální daň"):
+            assert not np.isnan(values[x <= limit_monthly]).any()
+            assert np.isnan(values[x > limit_monthly]).all()
+
+
+def test_sweep_arrays_are_read_only_and_cached():
+    sweep = build_sweep()
+    assert build_sweep() is sweep
+    with pytest.raises(ValueError):
+        sweep["krivky"][HPP_CURVE][0] = 0.0
+
+
+def test_slice_keeps_views_and_crossovers_in_range():
+    sweep = build_sweep()
+    sliced = slice_sweep(sweep, 40000.0, 120000.0)
+    x = sliced["hruby_mesicni_prijem"]
+    assert x[0] >= 40000.0 and x[-1] <= 120000.0
+    assert np.shares_memory(x, sweep["hruby_mesicni_prijem"])
+    for curve, crossings in sliced["pruseciky"].items():
+        assert crossings == [c for c in sweep["pruseciky"][curve] if 40000.0 <= c <= 120000.0]
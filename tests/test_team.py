@@ -0,0 +1,134 @@
+"""Team cost model: incremental what-if edits equal a full recompute, failed edits change nothing."""
+
+import numpy as np
+import pytest
+
+from cisko.engine import calculate_hpp_income, calculate_ico_pausalni_dan_income, calculate_ico_pausalni_vydaje_income
+from cisko.team import TeamCostModel
+
+ROSTER = {
+    "team": ["Backend", "Backend", "Backend", "Frontend", "Frontend", "Data", "Data"],
+    "role": ["Senior", "Junior", "Contractor", "Senior", "Junior", "Senior", "Contractor"],
+    "count": [4, 6, 2, 3, 5, 2, 1],
+    "gross_monthly_income": [95000.0, 48000.0, np.nan, 90000.0, 45000.0, 105000.0, np.nan],
+    "day_rate": [np.nan, np.nan, 7000.0, np.nan, np.nan, np.nan, 8500.0],
+    "pausalni_dan_band": [np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, 2],
+    "other_annual_tax_credits": [0.0, 15204.0, 0.0, 0.0, 0.0, 30408.0, 0.0],
+}
+
+
+def _rebuilt(model: TeamCostModel) -> TeamCostModel:
+    """A model computed from scratch from the edited model's current positions."""
+    return TeamCostModel({
+        "team": list(model.team),
+        "role": list(model.role),
+        "count": model.count,
+        "gross_monthly_income": model.gross_monthly_income,
+        "day_rate": model.day_rate,
+        "mandays_per_year": model.mandays_per_year,
+        "expense_percentage": model.expense_percentage,
+        "pausalni_dan_band": model.pausalni_dan_band,
+        "other_annual_tax_credits": model.other_annual_tax_credits,
+    }, tax_year=model.tax_year)
+
+
+def _assert_same_summary(actual: list, expected: list) -> None:
+    assert [row["tym"] for row in actual] == [row["tym"] for row in expected]
+    for a, b in zip(actual, expected):
+        # Incremental sums add differences, so they may round a haléř apart
+        assert a == pytest.approx(b, abs=0.011)
+
+
+def _state(model: TeamCostModel) -> tuple:
+    return {name: values.copy() for name, values in model.as_arrays().items()}, model.team_summary(), model.totals()
+
+
+def _assert_state_unchanged(model: TeamCostModel, state: tuple) -> None:
+    arrays, summary, totals = state
+    assert model.as_arrays().keys() == arrays.keys()
+    for name, values in model.as_arrays().items():
+        np.testing.assert_array_equal(values, arrays[name])
+    assert model.team_summary() == summary
+    assert model.totals() == totals
+
+
+def test_per_person_values_match_scalar_engine():
+    model = TeamCostModel(ROSTER)
+    for i in range(len(ROSTER["team"])):
+        if np.isnan(ROSTER["day_rate"][i]):
+            result = calculate_hpp_income(ROSTER["gross_monthly_income"][i], ROSTER["other_annual_tax_credits"][i])
+            assert model.employer_cost[i] == pytest.approx(result["zamestnavatel_celkove_rocni_naklady_na_zamestnance"], abs=0.005)
+            assert model.net_income[i] == pytest.approx(result["cisty_rocni_prijem_zamestnanec"], abs=0.005)
+            continue
+        revenue = ROSTER["day_rate"][i] * 220
+        assert model.invoice_cost[i] == revenue
+        if np.isnan(ROSTER["pausalni_dan_band"][i]):
+            net = calculate_ico_pausalni_vydaje_income(revenue, 0.6)["info_k_realnym_nakladum"]["cisty_rocni_prijem_disponibilni_po_realnych_nakladech"]
+        else:
+            net = calculate_ico_pausalni_dan_income(revenue, int(ROSTER["pausalni_dan_band"][i]))["cisty_rocni_prijem"]
+        assert model.net_income[i] == pytest.approx(net, abs=0.005)
+
+
+def test_sequence_of_edits_matches_full_recompute():
+    model = TeamCostModel(ROSTER)
+    model.raise_salary("Senior", 10)
+    assert model.last_recomputed_positions == [0, 3, 5]
+    model.set_salary("Junior", 52000.0, team="Frontend")
+    assert model.last_recomputed_positions == [4]
+    # Three of four Backend seniors: the position is split into 1 HPP + 3 IČO
+    model.convert_to_ico("Senior", 3, team="Backend", day_rate=9000.0)
+    assert model.last_recomputed_positions == [0, 7]
+    assert model.count[0] == 1 and model.count[7] == 3 and model.is_ico[7]
+    model.convert_to_ico("Junior", 7, pausalni_dan_band=1)
+    model.raise_salary("Junior", -5)
+
+    _assert_same_summary(model.team_summary(), _rebuilt(model).team_summary())
+    _assert_same_summary([model.totals()], [_rebuilt(model).totals()])
+    totals = model.totals()
+    assert (totals["pocet_hpp"], totals["pocet_ico"]) == (20 - 3 - 7, 3 + 3 + 7)
+
+
+def test_conversion_without_day_rate_invoices_the_employer_cost():
+    model = TeamCostModel(ROSTER)
+    employer_cost = model.employer_cost[3]
+    model.convert_to_ico("Senior", 1, team="Frontend")
+    new = model.last_recomputed_positions[-1]
+    assert model.invoice_cost[new] == pytest.approx(employer_cost)
+    _assert_same_summary(model.team_summary(), _rebuilt(model).team_summary())
+
+
+def test_invalid_salary_rolls_back():
+    model = TeamCostModel(ROSTER)
+    state = _state(model)
+    with pytest.raises(ValueError):
+        model.set_salary("Junior", -1.0)
+    _assert_state_unchanged(model, state)
+    with pytest.raises(ValueError):
+        model.raise_salary("Nobody", 10)
+    _assert_state_unchanged(model, state)
+
+
+def test_failed_conversion_removes_the_new_positions():
+    model = TeamCostModel(ROSTER)
+    state = _state(model)
+    # 10 000 CZK a day over 220 days exceeds the paušální daň limit
+    with pytest.raises(ValueError):
+        model.convert_to_ico("Senior", 2, day_rate=10000.0, pausalni_dan_band=3)
+    _assert_state_unchanged(model, state)
+    with pytest.raises(ValueError):
+        model.convert_to_ico("Senior", 100)
+    _assert_state_unchanged(model, state)
+    # The model still works after the failures
+    model.convert_to_ico("Senior", 2, day_rate=8000.0, pausalni_dan_band=3)
+    _assert_same_summary(model.team_summary(), _rebuilt(model).team_summary())
+
+
+@pytest.mark.parametrize("roster_change, message", [
+    ({"team": None}, "team"),
+    ({"day_rate": [5000.0] + [np.nan] * 6}, "Řádek 1"),
+    ({"count": [1.5, 6, 2, 3, 5, 2, 1]}, "celé číslo"),
+])
+def test_invalid_roster_is_rejected(roster_change, message):
+    roster = {key: value for key, value in {**ROSTER, **roster_change}.items() if value is not None}
+    with pytest.raises(ValueError, match=message):
+        TeamCostModel(roster)
@@ -0,0 +1,163 @@
+"""Cash-flow timeline: incremental month edits equal a full rebuild, rejected edits change nothing."""
+
+import numpy as np
+import pytest
+
+from cisko.params import get_tax_params
+from cisko.timeline import MONTH_INPUTS, SETTLEMENT_MONTH, CashFlowTimeline
+
+TIMELINE = dict(
+    monthly_invoicing=[100000.0] * 36,
+    expense_percentage=0.6,
+    monthly_real_costs=5000.0,
+    other_annual_tax_credits=30840.0,
+    participate_sickness_insurance=True,
+    monthly_unpaid_vacation_days=[0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 10.0, 5.0, 0.0, 0.0, 0.0, 5.0] * 3,
+    monthly_unpaid_sick_days=1.0,
+    first_tax_year=2023,
+)
+
+
+def _rebuilt(timeline: CashFlowTimeline) -> CashFlowTimeline:
+    """A timeline computed from scratch from the edited timeline's current inputs."""
+    return CashFlowTimeline(
+        timeline.planned_invoicing.copy(),
+        expense_percentage=timeline.expense_percentage,
+        pausalni_dan_band=timeline.pausalni_dan_band,
+        monthly_real_costs=timeline.real_costs.copy(),
+        other_annual_tax_credits=timeline.other_annual_tax_credits,
+        participate_sickness_insurance=timeline.participate_sickness_insurance,
+        sickness_insurance_assessment_base_monthly=timeline.sickness_insurance_assessment_base_monthly,
+        monthly_unpaid_vacation_days=timeline.unpaid_vacation_days.copy(),
+        monthly_unpaid_sick_days=timeline.unpaid_sick_days.copy(),
+        work_days_per_year_input=timeline.work_days_per_year_input,
+        first_tax_year=timeline.tax_years[0],
+    )
+
+
+def _assert_same_timeline(actual: CashFlowTimeline, expected: CashFlowTimeline) -> None:
+    expected_arrays = expected.as_arrays()
+    for name, values in actual.as_arrays().items():
+        # The incremental cumulative sum restarts from the edited month, so it may differ in the last bits
+        np.testing.assert_allclose(values, expected_arrays[name], rtol=0, atol=1e-6, err_msg=name)
+    assert actual.annual_results == expected.annual_results
+    assert actual.settlement_after_timeline == pytest.approx(expected.settlement_after_timeline)
+
+
+def _state(timeline: CashFlowTimeline) -> tuple:
+    return ({name: values.copy() for name, values in timeline.as_arrays().items()},
+            {name: getattr(timeline, name).copy() for name in MONTH_INPUTS},
+            list(timeline.annual_results), dict(timeline.settlement_after_timeline))
+
+
+def _assert_state_unchanged(timeline: CashFlowTimeline, state: tuple) -> None:
+    arrays, inputs, annual_results, settlement = state
+    for name, values in timeline.as_arrays().items():
+        if name == "kumulovany_tok":
+            # Summed again from the edited month
+            np.testing.assert_allclose(values, arrays[name], rtol=0, atol=1e-6)
+        else:
+            np.testing.assert_array_equal(values, arrays[name], err_msg=name)
+    for name in MONTH_INPUTS:
+        np.testing.assert_array_equal(getattr(timeline, name), inputs[name], err_msg=name)
+    assert timeline.annual_results == annual_results
+    assert timeline.settlement_after_timeline == settlement
+
+
+def test_sequence_of_edits_matches_full_rebuild():
+    timeline = CashFlowTimeline(**TIMELINE)
+    timeline.set_month(2, invoicing=180000.0)
+    timeline.set_month(14, real_costs=40000.0, unpaid_sick_days=4.5)
+    timeline.set_month(0, unpaid_vacation_days=3.0)
+    _assert_same_timeline(timeline, _rebuilt(timeline))
+    # An edit of the last year changes only the settlement after the timeline
+    before = dict(timeline.settlement_after_timeline)
+    timeline.set_month(35, invoicing=400000.0)
+    assert timeline.last_recomputed_years == [2025]
+    assert timeline.settlement_after_timeline["dan_z_prijmu"] > before["dan_z_prijmu"]
+    _assert_same_timeline(timeline, _rebuilt(timeline))
+
+
+def test_unpaid_days_reduce_the_month_they_fall_in():
+    timeline = CashFlowTimeline(**TIMELINE)
+    work_days_per_month = timeline.work_days_per_year_input / 12
+    assert timeline.invoicing[0] == pytest.approx(100000.0 * (1 - 1 / work_days_per_month))
+    assert timeline.invoicing[6] == pytest.approx(100000.0 * (1 - 11 / work_days_per_month))
+    timeline.set_month(6, unpaid_vacation_days=100.0)
+    assert timeline.invoicing[6] == 0.0 and timeline.planned_invoicing[6] == 100000.0
+
+
+def test_settlement_is_paid_in_the_next_year():
+    timeline = CashFlowTimeline(**TIMELINE)
+    first = timeline.annual_results[0]
+    month = 12 + SETTLEMENT_MONTH
+    assert timeline.income_tax_payment[month] == first["konecna_rocni_dan_z_prijmu"]
+    assert timeline.social_settlement[month] == pytest.approx(first["rocni_socialni_pojisteni"] - timeline.social_advance[:12].sum())
+    assert np.count_nonzero(timeline.income_tax_payment) == 2
+    # After the settlement the advances follow the previous year's insurance
+    assert timeline.social_advance[month] == pytest.approx(max(first["rocni_socialni_pojisteni"] / 12,
+                                                             get_tax_params(2024).ico_min_social_monthly_main_activity))
+
+
+def test_recomputation_stops_when_the_advances_do_not_change():
+    # Low invoicing: every year pays the minimum insurance, so its advances do not depend on the edit
+    timeline = CashFlowTimeline([45000.0] * 36, expense_percentage=0.6, first_tax_year=2023)
+    settlement_month = 12 + SETTLEMENT_MONTH
+    tax_before = timeline.income_tax_payment[settlement_month]
+    timeline.set_month(3, invoicing=50000.0)
+    assert timeline.last_recomputed_years == [2023]
+    assert timeline.income_tax_payment[settlement_month] > tax_before
+    _assert_same_timeline(timeline, _rebuilt(timeline))
+    # High invoicing raises the insurance, so the next year's advances change too
+    timeline.set_month(3, invoicing=1500000.0)
+    assert timeline.last_recomputed_years[:2] == [2023, 2024]
+    _assert_same_timeline(timeline, _rebuilt(timeline))
+
+
+def test_rejected_edit_restores_inputs_and_results():
+    timeline = CashFlowTimeline(**TIMELINE)
+    state = _state(timeline)
+    # The year's revenue turns negative, which the calculation rejects
+    with pytest.raises(ValueError, match="^2024: "):
+        timeline.set_month(13, invoicing=-5000000.0, real_costs=1.0, unpaid_sick_days=2.0)
+    _assert_state_unchanged(timeline, state)
+    with pytest.raises(IndexError):
+        timeline.set_month(36, invoicing=1.0)
+    _assert_state_unchanged(timeline, state)
+    # The timeline still works after the failure
+    timeline.set_month(13, invoicing=120000.0)
+    _assert_same_timeline(timeline, _rebuilt(timeline))
+
+
+def test_pausalni_dan_pays_the_band_every_month_without_settlements():
+    timeline = CashFlowTimeline([80000.0] * 24, pausalni_dan_band=2, first_tax_year=2024)
+    for i, year in enumerate((2024, 2025)):
+        assert np.all(timeline.pausalni_dan_payment[12 * i:12 * (i + 1)] == get_tax_params(year).pausalni_dan_bands_monthly[2])
+    assert not timeline.social_advance.any() and not timeline.income_tax_payment.any()
+    assert timeline.settlement_after_timeline == {"socialni": 0.0, "zdravotni": 0.0, "dan_z_prijmu": 0.0}
+    timeline.set_month(5, invoicing=90000.0)
+    # Without advances a paušální daň year never changes the next one
+    assert timeline.last_recomputed_years == [2024]
+    _assert_same_timeline(timeline, _rebuilt(timeline))
+
+
+def test_pausalni_dan_over_the_limit_is_rejected():
+    timeline = CashFlowTimeline([80000.0] * 12, pausalni_dan_band=1, first_tax_year=2025)
+    state = _state(timeline)
+    with pytest.raises(ValueError, match="^2025: "):
+        timeline.set_month(0, invoicing=5000000.0)
+    _assert_state_unchanged(timeline, state)
+
+
+@pytest.mark.parametrize("arguments", [
+    dict(pausalni_dan_band=7),
+    dict(pausalni_dan_band=1.5),
+    dict(pausalni_dan_band=0),
+    dict(pausalni_dan_band=1, expense_percentage=0.6),
+    dict(),
+    dict(expense_percentage=0.6, monthly_invoicing=[50000.0] * 13),
+    dict(expense_percentage=0.6, first_tax_year=2031),
+])
+def test_invalid_timelines_are_rejected(arguments):
+    with pytest.raises(ValueError):
+        CashFlowTimeline(**{"monthly_invoicing": [50000.0] * 12, **arguments})